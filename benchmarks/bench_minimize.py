@@ -0,0 +1,45 @@
+"""
+Scaling benchmark for Hopcroft minimization (`minimize_dfa`).
+
+Times two families over growing n and prints t / (n·k·log2 n), which
+stays roughly flat for an O(n·k·log n) implementation:
+- "random": uniformly random total DFAs (mostly already minimal)
+- "cycle":  one n-cycle over {a, b} with a single accepting state, the
+            classic case needing ~log n rounds of splitting
+
+Usage:
+    python benchmarks/bench_minimize.py [--max-exp 5]
+"""
+from __future__ import annotations
+import argparse
+import math
+import time
+
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.utils import cycle_dfa, random_dfa
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--max-exp", type=int, default=5, help="largest size is 10**max_exp states")
+    ap.add_argument("--k", type=int, default=4, help="alphabet size of the random family")
+    args = ap.parse_args()
+
+    print(f"{'family':<8} {'n':>8} {'states':>8} {'seconds':>9} {'us/(n·k·log n)':>15}")
+    for e in range(2, args.max_exp + 1):
+        for n in (10 ** e, 3 * 10 ** e):
+            if n > 10 ** args.max_exp:
+                continue
+            for family, dfa, k in (
+                ("random", random_dfa(n, args.k), args.k),
+                ("cycle", cycle_dfa(n), 2),
+            ):
+                t0 = time.perf_counter()
+                m = minimize_dfa(dfa)
+                dt = time.perf_counter() - t0
+                norm = dt * 1e6 / (n * k * math.log2(n))
+                print(f"{family:<8} {n:>8} {len(m.states):>8} {dt:>9.3f} {norm:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
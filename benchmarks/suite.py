@@ -0,0 +1,173 @@
+"""
+Benchmark suite: time and peak memory of the core algorithms across sizes.
+
+Every case runs on seeded automata from `langmachines.utils`, so results
+are comparable between commits. Time is the best of `--repeat` runs;
+memory is the tracemalloc peak of one extra run (allocations made by the
+benchmarked call only, inputs excluded).
+
+Usage:
+    python benchmarks/suite.py                         # print a table
+    python benchmarks/suite.py -o before.json          # save results
+    python benchmarks/suite.py -o after.json --compare before.json
+    python benchmarks/suite.py --sizes 100,1000 -k minimize
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.compiled import compile_dfa, simulate_many
+from langmachines.dfa import prune_unreachable, simulate
+from langmachines.io import jsonio
+from langmachines.io.dot import dfa_to_dot
+from langmachines.nfa import to_dfa
+from langmachines.utils import cycle_dfa, nth_from_end_nfa, random_dfa, random_nfa, random_words
+
+# A case is (name, params, setup); setup() builds the inputs and returns the
+# zero-argument callable to measure.
+Case = Tuple[str, Dict[str, Any], Callable[[], Callable[[], Any]]]
+
+K = 4  # alphabet size of the random families
+
+
+def cases(sizes: List[int]) -> Iterator[Case]:
+    for n in sizes:
+        def simulate_setup(n: int = n) -> Callable[[], Any]:
+            d = random_dfa(n, K, seed=n)
+            words = random_words(sorted(d.alphabet), 1000, max_len=64, seed=n)
+            return lambda: [simulate(d, w) for w in words]
+
+        def compiled_setup(n: int = n) -> Callable[[], Any]:
+            c = compile_dfa(random_dfa(n, K, seed=n))
+            words = ["".join(w) for w in random_words(sorted(c.symbols), 1000, max_len=64, seed=n)]
+            return lambda: [c.simulate(w) for w in words]
+
+        def many_setup(n: int = n) -> Callable[[], Any]:
+            c = compile_dfa(random_dfa(n, K, seed=n))
+            words = ["".join(w) for w in random_words(sorted(c.symbols), 1000, max_len=64, seed=n)]
+            return lambda: simulate_many(c, words)
+
+        yield "simulate", {"n": n, "k": K, "words": 1000}, simulate_setup
+        yield "compiled.simulate", {"n": n, "k": K, "words": 1000}, compiled_setup
+        yield "simulate_many", {"n": n, "k": K, "words": 1000}, many_setup
+
+        yield "minimize/random", {"n": n, "k": K}, lambda n=n: _bind(minimize_dfa, random_dfa(n, K, seed=n))
+        yield "minimize/cycle", {"n": n, "k": 2}, lambda n=n: _bind(minimize_dfa, cycle_dfa(n))
+        yield "prune_unreachable", {"n": n, "k": K, "density": 0.3}, (
+            lambda n=n: _bind(prune_unreachable, random_dfa(n, K, density=0.3, seed=n))
+        )
+        yield "json.write", {"n": n, "k": K}, lambda n=n: _bind(_write_json, random_dfa(n, K, seed=n))
+        yield "json.read", {"n": n, "k": K}, lambda n=n: _bind(_read_json, _json_text(random_dfa(n, K, seed=n)))
+        yield "dot", {"n": n, "k": K}, lambda n=n: _bind(dfa_to_dot, random_dfa(n, K, seed=n))
+
+    # Subset construction is exponential in the NFA size, so it gets its own
+    # small sizes: m NFA states, one step per entry of `sizes`.
+    for i in range(len(sizes)):
+        m = 16 << i
+        yield "to_dfa/random", {"m": m, "k": 2, "density": 1.5, "epsilon_ratio": 0.1}, (
+            lambda m=m: _bind(to_dfa, random_nfa(m, 2, density=1.5, epsilon_ratio=0.1, seed=m))
+        )
+        m = 4 + 4 * i
+        yield "to_dfa/nth_from_end", {"m": m}, lambda m=m: _bind(to_dfa, nth_from_end_nfa(m))
+
+
+def _bind(fn: Callable[[Any], Any], arg: Any) -> Callable[[], Any]:
+    return lambda: fn(arg)
+
+
+def _write_json(d: Any) -> None:
+    jsonio.write_dfa(d, io.StringIO())
+
+
+def _json_text(d: Any) -> str:
+    buf = io.StringIO()
+    jsonio.write_dfa(d, buf)
+    return buf.getvalue()
+
+
+def _read_json(text: str) -> Any:
+    return jsonio.read_dfa(io.StringIO(text))
+
+
+def measure(setup: Callable[[], Callable[[], Any]], repeat: int) -> Dict[str, float]:
+    fn = setup()
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _key(r: Dict[str, Any]) -> str:
+    return r["name"] + " " + json.dumps(r["params"], sort_keys=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="100,1000,10000", help="comma-separated state counts")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    ap.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    ap.add_argument("-o", "--output", help="write results as JSON")
+    ap.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = ap.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",")]
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {_key(r): r for r in json.load(f)["results"]}
+
+    results = []
+    header = f"{'case':<22} {'params':<44} {'seconds':>9} {'peak KiB':>10}"
+    print(header + ("   time x  mem x" if baseline else ""))
+    for name, params, setup in cases(sizes):
+        if args.filter not in name:
+            continue
+        r = {"name": name, "params": params, **measure(setup, args.repeat)}
+        results.append(r)
+        line = f"{name:<22} {json.dumps(params):<44} {r['seconds']:>9.4f} {r['peak_bytes'] / 1024:>10.1f}"
+        old = baseline.get(_key(r))
+        if old:
+            line += f"  {r['seconds'] / max(old['seconds'], 1e-9):>7.2f} {r['peak_bytes'] / max(old['peak_bytes'], 1):>6.2f}"
+        print(line, flush=True)
+
+    if args.output:
+        meta = {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "sizes": sizes,
+            "repeat": args.repeat,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
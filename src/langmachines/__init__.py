@@ -1,6 +1,13 @@
 from .algorithms.minimize import minimize_dfa, MinDFA
 from .dfa import DFA, simulate, prune_unreachable, totalize
-from .nfa import NFA, to_dfa
+from .compiled import CompiledDFA, compile_dfa, simulate_many
+from .nfa import NFA, simulate_nfa, to_dfa
+from .budgets import Budget, BudgetExceeded, CancellationToken
+from .builders import DFABuilder, NFABuilder
+from .stream import DFAMatcher, match_file
+from .lazy import LazyDFA
+from .search import Searcher, search
+from .parallel import ParallelMatcher
 from .io.dot import dfa_to_dot, render_dfa 
 
 __all__ = [
@@ -8,10 +15,25 @@ __all__ = [
     "simulate",
     "prune_unreachable",
     "totalize",
+    "CompiledDFA",
+    "compile_dfa",
+    "simulate_many",
     "minimize_dfa",
     "MinDFA",
     "NFA",
+    "simulate_nfa",
     "to_dfa",
+    "Budget",
+    "BudgetExceeded",
+    "CancellationToken",
+    "DFABuilder",
+    "NFABuilder",
+    "DFAMatcher",
+    "match_file",
+    "LazyDFA",
+    "Searcher",
+    "search",
+    "ParallelMatcher",
     "dfa_to_dot",
     "render_dfa",
 ]
@@ -0,0 +1,261 @@
+from __future__ import annotations
+import random
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..dfa import DFA, State, Symbol
+
+Word = Tuple[Symbol, ...]
+
+
+class _Live:
+    """
+    The trim part of a DFA (states reachable from the start that can
+    still reach an accepting state), numbered 0..m-1 with the start at 0.
+    - `moves[q]`: [(symbol, target)] in `repr` order of symbols
+    - `accept[q]`: whether q is accepting
+    `m == 0` iff the language is empty.
+    """
+
+    def __init__(self, dfa: DFA):
+        if dfa.start not in dfa.states:
+            raise ValueError("Start state is not in DFA states.")
+        symbols = sorted(dfa.alphabet, key=repr)
+        order: List[State] = [dfa.start]
+        seen: Set[State] = {dfa.start}
+        out: Dict[State, List[Tuple[Symbol, State]]] = {}
+        preds: Dict[State, Set[State]] = {}
+        head = 0
+        while head < len(order):
+            s = order[head]
+            head += 1
+            row = out[s] = []
+            for a in symbols:
+                t = dfa.delta.get((s, a))
+                if t is None:
+                    continue
+                row.append((a, t))
+                preds.setdefault(t, set()).add(s)
+                if t not in seen:
+                    seen.add(t)
+                    order.append(t)
+        live = {s for s in order if s in dfa.accept}
+        stack = list(live)
+        while stack:
+            for p in preds.get(stack.pop(), ()):
+                if p not in live:
+                    live.add(p)
+                    stack.append(p)
+        labels = [s for s in order if s in live]
+        index = {s: i for i, s in enumerate(labels)}
+        self.m = len(labels)
+        self.labels = labels
+        self.moves: List[List[Tuple[Symbol, int]]] = [
+            [(a, index[t]) for a, t in out[s] if t in index] for s in labels
+        ]
+        self.accept = [s in dfa.accept for s in labels]
+
+    def matrix(self) -> List[List[int]]:
+        """M[q][r] = number of symbols leading from q to r."""
+        M = [[0] * self.m for _ in range(self.m)]
+        for q, row in enumerate(self.moves):
+            for _, r in row:
+                M[q][r] += 1
+        return M
+
+    def counts(self, length: int) -> List[List[int]]:
+        """f[i][q] = number of accepted words of length exactly i read from q, for i = 0..length."""
+        f = [[int(a) for a in self.accept]]
+        for _ in range(length):
+            prev = f[-1]
+            f.append([sum(prev[r] for _, r in row) for row in self.moves])
+        return f
+
+
+def _matmul(A: List[List[int]], B: List[List[int]]) -> List[List[int]]:
+    cols = list(zip(*B))
+    return [[sum(x * y for x, y in zip(row, col) if x and y) for col in cols] for row in A]
+
+
+def _matpow_row(M: List[List[int]], n: int, row: int) -> List[int]:
+    """Row `row` of M**n by repeated squaring (exact big ints)."""
+    v = [[int(j == row) for j in range(len(M))]]
+    P = M
+    while n:
+        if n & 1:
+            v = _matmul(v, P)
+        n >>= 1
+        if n:
+            P = _matmul(P, P)
+    return v[0]
+
+
+def _use_matrix(live: _Live, length: int) -> bool:
+    """
+    Both routes are dominated by big-int arithmetic on counts of ~n bits:
+    the DP does n·edges additions, the matrix route ~m³ multiplications
+    per squaring. Measured, the matrix route wins when m³ < ~100·edges
+    (small, dense DFAs), by ~10x for a 5-state DFA over 3 symbols.
+    """
+    edges = sum(len(row) for row in live.moves)
+    return length >= 64 and live.m ** 3 < 100 * edges
+
+
+def count_words(dfa: DFA, length: int) -> int:
+    """
+    Number of accepted words of exactly `length` symbols (exact big int).
+    Dynamic programming over the trim DFA, or transition-matrix
+    exponentiation for long lengths on small, dense DFAs (where it is
+    cheaper; see `_use_matrix`).
+    """
+    if length < 0:
+        raise ValueError("length must be non-negative.")
+    live = _Live(dfa)
+    if live.m == 0:
+        return 0
+    if _use_matrix(live, length):
+        row = _matpow_row(live.matrix(), length, 0)
+        return sum(c for c, acc in zip(row, live.accept) if acc)
+    f = [int(a) for a in live.accept]
+    for _ in range(length):
+        f = [sum(f[r] for _, r in row) for row in live.moves]
+    return f[0]
+
+
+def count_words_up_to(dfa: DFA, length: int) -> int:
+    """
+    Number of accepted words of at most `length` symbols.
+    The matrix route adds a state z (one edge from every accepting state,
+    one loop): words of length <= n map one-to-one to paths of length
+    n + 1 from the start to z.
+    """
+    if length < 0:
+        raise ValueError("length must be non-negative.")
+    live = _Live(dfa)
+    if live.m == 0:
+        return 0
+    if _use_matrix(live, length):
+        M = live.matrix()
+        for q, row in enumerate(M):
+            row.append(int(live.accept[q]))
+        M.append([0] * live.m + [1])
+        return _matpow_row(M, length + 1, 0)[live.m]
+    total = 0
+    f = [int(a) for a in live.accept]
+    for i in range(length + 1):
+        total += f[0]
+        if i < length:
+            f = [sum(f[r] for _, r in row) for row in live.moves]
+    return total
+
+
+def sample_words(
+    dfa: DFA,
+    length: int,
+    count: int = 1,
+    *,
+    seed: Optional[int] = None,
+) -> List[Word]:
+    """
+    `count` accepted words of exactly `length` symbols, each drawn
+    uniformly at random (independently) among all such words. Returns []
+    if there are none. Every step picks a symbol with probability
+    proportional to the number of accepted completions behind it.
+    """
+    if length < 0:
+        raise ValueError("length must be non-negative.")
+    live = _Live(dfa)
+    if live.m == 0:
+        return []
+    f = live.counts(length)
+    if not f[length][0]:
+        return []
+    rng = random.Random(seed)
+    words: List[Word] = []
+    for _ in range(count):
+        q = 0
+        word: List[Symbol] = []
+        for remaining in range(length, 0, -1):
+            x = rng.randrange(f[remaining][q])
+            for a, r in live.moves[q]:
+                x -= f[remaining - 1][r]
+                if x < 0:
+                    word.append(a)
+                    q = r
+                    break
+        words.append(tuple(word))
+    return words
+
+
+def enumerate_words(dfa: DFA, max_length: Optional[int] = None) -> Iterator[Word]:
+    """
+    Accepted words, lazily, in shortlex order (by length, then
+    lexicographically with symbols in `repr` order), up to `max_length`
+    symbols if given. Finite languages end by themselves (every word is
+    shorter than the number of trim states). Each word costs O(length·k):
+    branches that cannot complete to an accepted word of the current
+    length are never entered.
+    """
+    live = _Live(dfa)
+    if live.m == 0:
+        return
+    infinite = _has_cycle(live)
+    # ok[r]: trim states that accept some word of exactly r more symbols
+    ok: List[Set[int]] = [{q for q in range(live.m) if live.accept[q]}]
+    length = 0
+    while max_length is None or length <= max_length:
+        if not infinite and length >= live.m:
+            return
+        while len(ok) <= length:
+            prev = ok[-1]
+            ok.append({q for q, row in enumerate(live.moves) if any(r in prev for _, r in row)})
+        if 0 in ok[length]:
+            yield from _words_of_length(live, ok, length)
+        length += 1
+
+
+def _words_of_length(live: _Live, ok: List[Set[int]], length: int) -> Iterator[Word]:
+    word: List[Symbol] = []
+    # Stack of iterators over the moves still to try at each depth
+    stack = [iter(live.moves[0])]
+    if length == 0:
+        yield ()
+        return
+    while stack:
+        depth = len(stack)
+        for a, r in stack[-1]:
+            if r in ok[length - depth]:
+                word.append(a)
+                if depth == length:
+                    yield tuple(word)
+                    word.pop()
+                    continue
+                stack.append(iter(live.moves[r]))
+                break
+        else:
+            stack.pop()
+            if word:
+                word.pop()
+
+
+def _has_cycle(live: _Live) -> bool:
+    """Whether the trim DFA has a cycle (iff its language is infinite)."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = [WHITE] * live.m
+    for root in range(live.m):
+        if color[root] != WHITE:
+            continue
+        color[root] = GREY
+        stack = [(root, iter(live.moves[root]))]
+        while stack:
+            q, it = stack[-1]
+            for _, r in it:
+                if color[r] == GREY:
+                    return True
+                if color[r] == WHITE:
+                    color[r] = GREY
+                    stack.append((r, iter(live.moves[r])))
+                    break
+            else:
+                color[q] = BLACK
+                stack.pop()
+    return False
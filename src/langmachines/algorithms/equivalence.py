@@ -0,0 +1,120 @@
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from ..dfa import DFA, State, Symbol
+
+# Both automata share one dead state (the target of a missing transition).
+_DEAD: Hashable = object()
+
+
+def _check(dfa: DFA) -> None:
+    if dfa.start not in dfa.states:
+        raise ValueError("Start state is not in DFA states.")
+
+
+def equivalent(a: DFA, b: DFA) -> bool:
+    """
+    Hopcroft–Karp language equivalence check with union-find.
+    - Explores only pairs reachable from (a.start, b.start), in BFS order
+    - Pairs already known equivalent (same union-find class) are skipped,
+      so at most |Qa| + |Qb| unions happen: near-linear time
+    - Stops at the first pair that disagrees on acceptance
+    Missing transitions (and symbols outside one automaton's alphabet)
+    go to a shared dead state. Use `counterexample` for a witness word.
+    """
+    _check(a)
+    _check(b)
+    if a is b:
+        return True
+    symbols = sorted(a.alphabet | b.alphabet, key=repr)
+    da, db = a.delta, b.delta
+    acc_a, acc_b = a.accept, b.accept
+
+    # Union-find over tagged states (0, q) / (1, q), plus the shared dead state.
+    parent: Dict[Hashable, Hashable] = {}
+    size: Dict[Hashable, int] = {}
+
+    def find(x: Hashable) -> Hashable:
+        root = parent.get(x, x)
+        if root == x:
+            return x
+        while True:
+            up = parent.get(root, root)
+            if up == root:
+                break
+            root = up
+        while x != root:  # path compression
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x: Hashable, y: Hashable) -> None:
+        sx, sy = size.get(x, 1), size.get(y, 1)
+        if sx < sy:
+            x, y = y, x
+        parent[y] = x
+        size[x] = sx + sy
+
+    def node(side: int, q: Optional[State]) -> Hashable:
+        return _DEAD if q is None else (side, q)
+
+    if (a.start in acc_a) != (b.start in acc_b):
+        return False
+    union(node(0, a.start), node(1, b.start))
+    Q = deque([(a.start, b.start)])
+    while Q:
+        p, q = Q.popleft()
+        for c in symbols:
+            p2 = None if p is None else da.get((p, c))
+            q2 = None if q is None else db.get((q, c))
+            r1, r2 = find(node(0, p2)), find(node(1, q2))
+            if r1 == r2:
+                continue
+            if (p2 is not None and p2 in acc_a) != (q2 is not None and q2 in acc_b):
+                return False
+            union(r1, r2)
+            Q.append((p2, q2))
+    return True
+
+
+def counterexample(a: DFA, b: DFA) -> Optional[Tuple[Symbol, ...]]:
+    """
+    A shortest word accepted by exactly one of `a`, `b` (None if the
+    languages are equal). Runs the union-find check first, so equal
+    automata cost no more than `equivalent`; otherwise a BFS over the
+    reachable pairs returns at the first (hence shortest) mismatch.
+    """
+    if equivalent(a, b):
+        return None
+    symbols = sorted(a.alphabet | b.alphabet, key=repr)
+    da, db = a.delta, b.delta
+
+    def accepts(p: Optional[State], q: Optional[State]) -> Tuple[bool, bool]:
+        return (p is not None and p in a.accept, q is not None and q in b.accept)
+
+    Pair = Tuple[Optional[State], Optional[State]]
+    start: Pair = (a.start, b.start)
+    if len(set(accepts(*start))) == 2:
+        return ()
+    parent: Dict[Pair, Tuple[Pair, Symbol]] = {}
+    seen: Set[Pair] = {start}
+    Q = deque([start])
+    while Q:
+        pair = Q.popleft()
+        p, q = pair
+        for c in symbols:
+            nxt: Pair = (None if p is None else da.get((p, c)), None if q is None else db.get((q, c)))
+            if nxt in seen:
+                continue
+            seen.add(nxt)
+            parent[nxt] = (pair, c)
+            fa, fb = accepts(*nxt)
+            if fa != fb:
+                word: List[Symbol] = []
+                cur = nxt
+                while cur != start:
+                    cur, sym = parent[cur]
+                    word.append(sym)
+                return tuple(reversed(word))
+            Q.append(nxt)
+    raise AssertionError("unreachable: equivalent() reported a difference")  # pragma: no cover
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..dfa import Symbol
+from ..nfa import EPSILON, NFA, BitsetNFA, iter_bits
+
+# A search node: (state of A, macrostate of B as a BitsetNFA mask).
+_Node = Tuple[int, int]
+
+
+def is_included(a: NFA, b: NFA, *, simulation: bool = False) -> bool:
+    """True iff L(a) ⊆ L(b); see `inclusion_counterexample`."""
+    return inclusion_counterexample(a, b, simulation=simulation) is None
+
+
+def inclusion_counterexample(a: NFA, b: NFA, *, simulation: bool = False) -> Optional[Tuple[Symbol, ...]]:
+    """
+    Antichain-based inclusion check, without determinizing `b`.
+
+    Explores pairs (p, S) of a state of `a` and an ε-closed macrostate of
+    `b` in BFS order. A pair is pruned if an already-kept pair (p, S')
+    has S' ⊆ S: any word that escapes S also escapes S'. With
+    `simulation=True` the maximal direct simulation of `b` is computed
+    first; macrostates keep only simulation-maximal states and S' ⊑ S
+    means every state of S' is simulated by one in S, which prunes more.
+
+    Returns None if L(a) ⊆ L(b), else a word in L(a) \\ L(b) (the first
+    one found by the BFS).
+    """
+    return _search(BitsetNFA(a), BitsetNFA(b), simulation)
+
+
+def is_universal(nfa: NFA, alphabet: Optional[Iterable[Symbol]] = None, *, simulation: bool = False) -> bool:
+    """True iff the NFA accepts every word over `alphabet` (default: its own, without ε)."""
+    return universality_counterexample(nfa, alphabet, simulation=simulation) is None
+
+
+def universality_counterexample(
+    nfa: NFA,
+    alphabet: Optional[Iterable[Symbol]] = None,
+    *,
+    simulation: bool = False,
+) -> Optional[Tuple[Symbol, ...]]:
+    """
+    Antichain universality check: a rejected word over `alphabet`, or None.
+    Same search as `inclusion_counterexample` with a one-state NFA for Σ*.
+    """
+    sigma = {x for x in (nfa.alphabet if alphabet is None else alphabet) if x != EPSILON}
+    everything = NFA(states={0}, alphabet=sigma, start=0, accept={0}, delta={(0, x): {0} for x in sigma})
+    return _search(BitsetNFA(everything), BitsetNFA(nfa), simulation)
+
+
+def simulation_preorder(b: BitsetNFA) -> List[int]:
+    """
+    Maximal direct simulation on a BitsetNFA: result[i] is the mask of
+    states j that simulate i (j accepts if i does, and every a-successor
+    of i is simulated by some a-successor of j). Greatest fixpoint by
+    repeated refinement; L(i) ⊆ L(j) for every such pair.
+    """
+    n = len(b.labels)
+    rows = [(b.succ[a], b.has[a]) for a in b.symbols]
+    full = (1 << n) - 1
+    up: List[int] = []
+    for i in range(n):
+        m = full
+        if b.accept >> i & 1:
+            m &= b.accept
+        for _, has in rows:
+            if has >> i & 1:
+                m &= has
+        up.append(m)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(n):
+            for j in iter_bits(up[i] & ~(1 << i)):
+                for succ, has in rows:
+                    if not has >> i & 1:
+                        continue
+                    sj = succ[j]
+                    if any(not (up[i2] & sj) for i2 in iter_bits(succ[i])):
+                        up[i] &= ~(1 << j)
+                        changed = True
+                        break
+    return up
+
+
+def _search(a: BitsetNFA, b: BitsetNFA, simulation: bool) -> Optional[Tuple[Symbol, ...]]:
+    up: Optional[List[int]] = simulation_preorder(b) if simulation else None
+
+    def reduce(S: int) -> int:
+        if up is None:
+            return S
+        for i in iter_bits(S):
+            if up[i] & S & ~(1 << i):
+                S &= ~(1 << i)
+        return S
+
+    def covers(small: int, big: int) -> bool:
+        """small ⊑ big: every word escaping big also escapes small."""
+        if up is None:
+            return not small & ~big
+        return all(up[s] & big for s in iter_bits(small))
+
+    antichain: Dict[int, List[int]] = {}
+    parent: Dict[_Node, Tuple[_Node, Symbol]] = {}
+    roots: List[_Node] = []
+    Q: deque[_Node] = deque()
+
+    def add(node: _Node) -> bool:
+        p, S = node
+        kept = antichain.setdefault(p, [])
+        if any(covers(S2, S) for S2 in kept):
+            return False
+        kept[:] = [S2 for S2 in kept if not covers(S, S2)]
+        kept.append(S)
+        Q.append(node)
+        return True
+
+    def word(node: _Node) -> Tuple[Symbol, ...]:
+        out: List[Symbol] = []
+        while node in parent:
+            node, sym = parent[node]
+            out.append(sym)
+        return tuple(reversed(out))
+
+    S0 = reduce(b.start)
+    for p in iter_bits(a.start):
+        node = (p, S0)
+        if a.accept >> p & 1 and not S0 & b.accept:
+            return ()
+        if add(node):
+            roots.append(node)
+
+    while Q:
+        node = Q.popleft()
+        p, S = node
+        if S not in antichain[p]:
+            continue  # superseded by a smaller macrostate after it was queued
+        for x in a.symbols:
+            row = a.succ[x]
+            if not a.has[x] >> p & 1:
+                continue
+            T = reduce(b.step(S, x))
+            for p2 in iter_bits(row[p]):
+                nxt = (p2, T)
+                if nxt in parent or nxt in roots:
+                    continue
+                if a.accept >> p2 & 1 and not T & b.accept:
+                    parent[nxt] = (node, x)
+                    return word(nxt)
+                if add(nxt):
+                    parent[nxt] = (node, x)
+    return None
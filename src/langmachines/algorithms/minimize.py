@@ -1,9 +1,12 @@
 from __future__ import annotations
+import time
 from dataclasses import dataclass
-from collections import defaultdict, deque
-from typing import Dict, Set, Tuple, FrozenSet
+from typing import Dict, List, Optional, Set, Tuple
 
-from ..dfa import DFA, State, Symbol, prune_unreachable
+from .. import budgets, instrument
+from ..alphabet import symbol_classes
+from ..budgets import Budget
+from ..dfa import DFA, State, Symbol
 
 
 @dataclass(frozen=True)
@@ -12,158 +15,273 @@ class MinDFA(DFA):
     block_of: Dict[State, State]
 
 
-def minimize_dfa(dfa: DFA) -> MinDFA:
+def minimize_dfa(dfa: DFA, *, budget: Optional[Budget] = None) -> MinDFA:
     """
-    Hopcroft DFA minimization.
+    Hopcroft DFA minimization, O(n·k·log n).
     - Prunes unreachable states
     - Totalizes only if necessary by adding a sink (and only keeps it if reachable)
     - Returns a language-equivalent minimal DFA as MinDFA
+
+    States are numbered 0..n-1 in BFS order from the start (symbols in
+    `repr` order) and refined with a refinable partition: one element
+    array grouped by block, marked elements moved to the front of their
+    block, and a (block, symbol) worklist with a membership flag. Each
+    block is represented by its first state in BFS order.
+
+    Refinement runs on symbol classes (symbols every state treats alike,
+    see `langmachines.alphabet`), one column per class; the quotient is
+    expanded back to every symbol.
+
+    `budget` (or the ambient one, see `langmachines.budgets`) limits the
+    number of reachable states, time and estimated memory.
     """
     if dfa.start not in dfa.states:
         raise ValueError("Start state not in states.")
     if not dfa.accept.issubset(dfa.states):
         raise ValueError("Accepting states must be subset of states.")
 
-    # 1) Restrict to reachable states
-    dfa = prune_unreachable(dfa)
-    if not dfa.states:
-        # Degenerate: no reachable states (shouldn’t normally happen if start exists)
-        return MinDFA(states=set(), alphabet=set(dfa.alphabet), start=None, accept=set(), delta={}, block_of={})
+    budget = budgets.resolve(budget)
+    rec = instrument.current()
+    t0 = time.perf_counter()
 
-    # 2) Totalize only if needed and check if sink becomes reachable
-    needs_sink = any((s, a) not in dfa.delta for s in dfa.states for a in dfa.alphabet)
-    sink = None
-    delta: Dict[Tuple[State, Symbol], State] = {}
+    # 1) Number reachable states in BFS order; a missing transition on a
+    #    reachable state means the sink is reachable.
+    classes = symbol_classes(dfa).classes
+    symbols: List[Symbol] = [group[0] for group in classes]
+    k = len(symbols)
+    index: Dict[State, int] = {dfa.start: 0}
+    labels: List[State] = [dfa.start]
+    succ: List[int] = []  # succ[q * k + a], -1 = missing
+    max_states = budget.state_limit if budget is not None else -1
+    check = budget.check_every if budget is not None else -1
+    head = 0
+    while head < len(labels):
+        s = labels[head]
+        head += 1
+        if head == check:
+            assert budget is not None
+            budget.check("minimize", {"states": len(labels), "numbered": head})
+            check += budget.check_every
+        for a in symbols:
+            t = dfa.delta.get((s, a))
+            if t is None:
+                succ.append(-1)
+                continue
+            j = index.get(t)
+            if j is None:
+                j = len(labels)
+                if j == max_states:
+                    assert budget is not None
+                    raise budget.exceeded("minimize", "states", {"states": j, "numbered": head})
+                index[t] = j
+                labels.append(t)
+            succ.append(j)
+    n_orig = len(labels)
 
-    if needs_sink:
+    # 2) Totalize only if needed
+    sink = None
+    if -1 in succ:
         sink = object()
-        # Provisional transitions
-        for s in dfa.states | {sink}:
-            for a in dfa.alphabet:
-                if s is sink:
-                    delta[(sink, a)] = sink
-                else:
-                    delta[(s, a)] = dfa.delta.get((s, a), sink)
-        # Check if sink is actually reached from the start
-        sink_reached = _reachable_to_sink(dfa.start, dfa.states | {sink}, dfa.alphabet, delta, sink)
-        if sink_reached:
-            states = set(dfa.states) | {sink}
-        else:
-            # drop sink transitions
-            delta = {(s, a): t for (s, a), t in delta.items() if s is not sink}
-            states = set(dfa.states)
-            sink = None
-    else:
-        delta = dict(dfa.delta)
-        states = set(dfa.states)
-
-    accept = set(dfa.accept)
+        sink_id = len(labels)
+        labels.append(sink)
+        succ = [sink_id if t < 0 else t for t in succ]
+        succ.extend([sink_id] * k)
+    n = len(labels)
 
     # 3) Hopcroft
-    nonaccept = states - accept
-    P: Set[FrozenSet[State]] = set()
-    if accept:
-        P.add(frozenset(accept))
-    if nonaccept:
-        P.add(frozenset(nonaccept))
-
-    W: Set[Tuple[FrozenSet[State], Symbol]] = set()
-    if accept and nonaccept:
-        smaller = accept if len(accept) <= len(nonaccept) else nonaccept
-        for a in dfa.alphabet:
-            W.add((frozenset(smaller), a))
-
-    inv: Dict[Tuple[Symbol, State], Set[State]] = defaultdict(set)
-    for (s, a), t in delta.items():
-        inv[(a, t)].add(s)
-
-    while W:
-        A, a = W.pop()
-        pred = set()
-        for q in A:
-            pred |= inv.get((a, q), set())
-
-        newP: Set[FrozenSet[State]] = set()
-        for Y in P:
-            Y1 = Y & pred
-            if not Y1:
-                newP.add(Y)
-                continue
-            Y2 = Y - pred
-            if not Y2:
-                newP.add(Y)
-                continue
-
-            newP.add(frozenset(Y1))
-            newP.add(frozenset(Y2))
-
-            if (Y, a) in W:
-                W.remove((Y, a))
-                W.add((frozenset(Y1), a))
-                W.add((frozenset(Y2), a))
-            else:
-                add_block = frozenset(Y1) if len(Y1) <= len(Y2) else frozenset(Y2)
-                for c in dfa.alphabet:
-                    W.add((add_block, c))
-        P = newP
-
-    # 4) Build quotient
-    def rep(block: FrozenSet[State]) -> State:
-        return sorted(block, key=lambda x: str(x))[0]
+    accept = dfa.accept
+    is_acc = [q < n_orig and labels[q] in accept for q in range(n)]
+    if budget is not None:
+        budget.check("minimize", {"states": n, "symbol_classes": k}, _refine_memory(n, k, 2, 2 * k))
+    t1 = time.perf_counter()
+    block = hopcroft_refine(n, k, succ, is_acc, rec, budget)
+    t2 = time.perf_counter()
 
-    block_by_state: Dict[State, FrozenSet[State]] = {}
-    for B in P:
-        for s in B:
-            block_by_state[s] = B
+    # 4) Build quotient: representative = smallest BFS id in the block
+    rep_id: Dict[int, int] = {}
+    for q in range(n):
+        rep_id.setdefault(block[q], q)
 
     new_states: Set[State] = set()
     new_accept: Set[State] = set()
     new_delta: Dict[Tuple[State, Symbol], State] = {}
-
-    for B in P:
-        r = rep(B)
-        new_states.add(r)
-        if any(s in accept for s in B):
-            new_accept.add(r)
-
-    new_start = rep(block_by_state[dfa.start])
-
-    for B in P:
-        r = rep(B)
-        # Any representative works for transitions
-        sample = next(iter(B))
-        for a in dfa.alphabet:
-            t = delta[(sample, a)]
-            new_delta[(r, a)] = rep(block_by_state[t])
+    for r in rep_id.values():
+        rl = labels[r]
+        new_states.add(rl)
+        if is_acc[r]:
+            new_accept.add(rl)
+        row = r * k
+        for c, group in enumerate(classes):
+            target = labels[rep_id[block[succ[row + c]]]]
+            for a in group:
+                new_delta[(rl, a)] = target
 
     # Map original (reachable) states to representatives; skip synthetic sink
-    original_states = states - ({sink} if sink is not None else set())
-    block_of = {s: rep(block_by_state[s]) for s in original_states}
+    block_of = {labels[q]: labels[rep_id[block[q]]] for q in range(n_orig)}
+
+    if rec is not None:
+        rec.add_time("minimize.number", t1 - t0)
+        rec.add_time("minimize.refine", t2 - t1)
+        rec.add_time("minimize.quotient", time.perf_counter() - t2)
+        rec.count("minimize.symbol_classes", k)
+        rec.count("minimize.states_in", n_orig)
+        rec.count("minimize.states_out", len(new_states))
+        rec.count("minimize.sink_insertions", int(sink is not None))
 
     return MinDFA(
         states=new_states,
         alphabet=set(dfa.alphabet),
-        start=new_start,
+        start=labels[rep_id[block[0]]],
         accept=new_accept,
         delta=new_delta,
         block_of=block_of,
     )
 
 
-def _reachable_to_sink(start: State, states: Set[State], alphabet: Set[Symbol],
-                       delta: Dict[Tuple[State, Symbol], State], sink: State) -> bool:
-    """BFS to check whether the synthetic sink is reachable from start."""
-    Q = deque([start])
-    seen = set()
-    while Q:
-        s = Q.popleft()
-        if s in seen:
-            continue
-        seen.add(s)
-        for a in alphabet:
-            t = delta[(s, a)]
-            if t is sink:
-                return True
-            if t in states and t not in seen:
-                Q.append(t)
-    return False
+def _refine_memory(n: int, k: int, blocks: int, worklist: int) -> int:
+    """
+    Estimated bytes held by `hopcroft_refine`: succ, the inverse transitions
+    and their offsets, per-state arrays, plus what grows while refining
+    (per-block bounds and worklist flags, the worklist itself).
+    """
+    return 3 * 8 * n * k + n * (budgets.STATE_BYTES + 6 * 8) + blocks * (3 * 8 + k) + 8 * worklist
+
+
+def hopcroft_refine(
+    n: int,
+    k: int,
+    succ: List[int],
+    is_acc: List[bool],
+    rec: Optional[instrument.Recorder] = None,
+    budget: Optional[Budget] = None,
+) -> List[int]:
+    """
+    Coarsest partition of states 0..n-1 (total transitions `succ[q*k+a]`)
+    compatible with `is_acc`. Returns the block id of every state.
+
+    The refinement step of `minimize_dfa`, for other automaton encodings
+    that can number their states and columns (e.g. symbolic DFAs over
+    minterms). Every entry of `succ` must be a state in 0..n-1: add a sink
+    state for missing moves. Block ids are 0..m-1 in no particular order.
+    """
+    # Inverse transitions in CSR form: predecessors of t under a are
+    # pred[pred_off[a*n + t] : pred_off[a*n + t + 1]]
+    pred_off = [0] * (n * k + 1)
+    for q in range(n):
+        row = q * k
+        for a in range(k):
+            pred_off[a * n + succ[row + a] + 1] += 1
+    for i in range(n * k):
+        pred_off[i + 1] += pred_off[i]
+    fill = pred_off[:-1]
+    pred = [0] * (n * k)
+    for q in range(n):
+        row = q * k
+        for a in range(k):
+            i = a * n + succ[row + a]
+            pred[fill[i]] = q
+            fill[i] += 1
+
+    # Refinable partition: elems[first[b]:end[b]] are the states of block b,
+    # loc[q] is q's position in elems, the first mark[b] of them are marked.
+    acc = [q for q in range(n) if is_acc[q]]
+    rej = [q for q in range(n) if not is_acc[q]]
+    elems = acc + rej
+    loc = [0] * n
+    for i, q in enumerate(elems):
+        loc[q] = i
+    block = [0] * n
+    first: List[int] = []
+    end: List[int] = []
+    pos = 0
+    for part in (acc, rej):
+        if part:
+            b = len(first)
+            first.append(pos)
+            pos += len(part)
+            end.append(pos)
+            for q in part:
+                block[q] = b
+    mark = [0] * len(first)
+
+    # Worklist of splitters (block, symbol) encoded as b*k + a; in_w avoids duplicates.
+    in_w = bytearray(len(first) * k)
+    W: List[int] = []
+    if len(first) == 2:
+        b0 = 0 if len(acc) <= len(rej) else 1
+        for a in range(k):
+            W.append(b0 * k + a)
+            in_w[b0 * k + a] = 1
+
+    initial_blocks = len(first)
+    pops = 0
+    peak = len(W)
+    tick = rec.next_tick(0) if rec is not None else -1
+    check = budget.check_every if budget is not None else -1
+
+    touched: List[int] = []
+    while W:
+        w = W.pop()
+        in_w[w] = 0
+        pops += 1
+        if pops == tick:
+            assert rec is not None
+            rec.tick("minimize", pops, len(W))
+            tick = rec.next_tick(pops)
+        if pops == check:
+            assert budget is not None
+            budget.check(
+                "minimize",
+                {"states": n, "blocks": len(first), "splitters": pops},
+                _refine_memory(n, k, len(first), len(W)),
+            )
+            check += budget.check_every
+        S, a = divmod(w, k)
+        base = a * n
+
+        # Mark all predecessors of S under a (snapshot S: it may split below)
+        for t in elems[first[S]:end[S]]:
+            for p in pred[pred_off[base + t]:pred_off[base + t + 1]]:
+                b = block[p]
+                i = loc[p]
+                j = first[b] + mark[b]
+                if i >= j:
+                    if i != j:
+                        q = elems[j]
+                        elems[i], elems[j] = q, p
+                        loc[q], loc[p] = i, j
+                    if mark[b] == 0:
+                        touched.append(b)
+                    mark[b] += 1
+
+        # Split every touched block into marked / unmarked parts; the
+        # smaller part becomes the new block and is always a new splitter.
+        for b in touched:
+            m = mark[b]
+            mark[b] = 0
+            size = end[b] - first[b]
+            if m == size:
+                continue
+            nb = len(first)
+            if m <= size - m:
+                first.append(first[b])
+                end.append(first[b] + m)
+                first[b] += m
+            else:
+                first.append(first[b] + m)
+                end.append(end[b])
+                end[b] = first[b] + m
+            mark.append(0)
+            for q in elems[first[nb]:end[nb]]:
+                block[q] = nb
+            in_w.extend(b"\x01" * k)
+            W.extend(range(nb * k, nb * k + k))
+            if len(W) > peak:
+                peak = len(W)
+        touched.clear()
+
+    if rec is not None:
+        rec.count("minimize.splitters", pops)
+        rec.count("minimize.splits", len(first) - initial_blocks)
+        rec.high_water("minimize.worklist_peak", peak)
+    return block
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from .. import budgets
+from ..budgets import Budget
+from ..dfa import DFA, State, Symbol
+
+# Product states are tuples with one component state per input DFA;
+# None marks a component that has taken a missing transition (it can
+# never accept again).
+ProductState = Tuple[Optional[State], ...]
+Flags = Tuple[bool, ...]
+
+
+def product(
+    dfas: Sequence[DFA],
+    accept: Callable[[Flags], bool],
+    *,
+    dead: Optional[Callable[[Flags], bool]] = None,
+    alphabet: Optional[Iterable[Symbol]] = None,
+    budget: Optional[Budget] = None,
+) -> DFA:
+    """
+    Lazy n-ary product construction.
+    - Explores only product states reachable from (start1, ..., startn)
+    - Partial inputs are not totalized: a missing transition (or a symbol
+      outside a component's alphabet) makes that component None
+    - `accept(flags)` decides acceptance from the per-component accepting
+      flags (a None component counts as non-accepting)
+    - `dead(alive)` may declare a product state hopeless from the
+      per-component "still alive" flags; such states are dropped, leaving
+      the result partial. Default: drop only when every component is
+      None and `accept` rejects.
+    - Alphabet: union of the inputs' alphabets unless given
+    - `budget` (or the ambient one, see `langmachines.budgets`) limits
+      product states, time and estimated memory
+    States of the result are ProductState tuples.
+    """
+    if not dfas:
+        raise ValueError("product() needs at least one DFA.")
+    for d in dfas:
+        if d.start not in d.states:
+            raise ValueError("Start state is not in DFA states.")
+    n = len(dfas)
+    if alphabet is None:
+        sigma: Set[Symbol] = set()
+        for d in dfas:
+            sigma |= d.alphabet
+    else:
+        sigma = set(alphabet)
+    symbols = sorted(sigma, key=repr)
+    if dead is None:
+        all_false: Flags = (False,) * n
+        rejects = not accept(all_false)
+
+        def dead(alive: Flags) -> bool:
+            return rejects and not any(alive)
+
+    deltas = [d.delta for d in dfas]
+    accepts = [d.accept for d in dfas]
+
+    def is_dead(p: ProductState) -> bool:
+        return dead(tuple(q is not None for q in p))
+
+    budget = budgets.resolve(budget)
+    max_states = budget.state_limit if budget is not None else -1
+    check = budget.check_every if budget is not None else -1
+    expanded = 0
+
+    def stats() -> budgets.Stats:
+        return {"states": len(states), "expanded": expanded, "transitions": len(new_delta)}
+
+    start: ProductState = tuple(d.start for d in dfas)
+    states: Set[ProductState] = {start}
+    new_delta: Dict[Tuple[State, Symbol], State] = {}
+    new_accept: Set[State] = set()
+    Q = deque([start])
+    while Q:
+        p = Q.popleft()
+        expanded += 1
+        if expanded == check:
+            assert budget is not None
+            memory = len(states) * (budgets.STATE_BYTES + 8 * n) + len(new_delta) * budgets.TRANSITION_BYTES
+            budget.check("product", stats(), memory)
+            check += budget.check_every
+        if accept(tuple(q is not None and q in acc for q, acc in zip(p, accepts))):
+            new_accept.add(p)
+        for a in symbols:
+            t: ProductState = tuple(None if q is None else delta.get((q, a)) for q, delta in zip(p, deltas))
+            if t not in states:
+                if is_dead(t):
+                    continue
+                if len(states) == max_states:
+                    assert budget is not None
+                    raise budget.exceeded("product", "states", stats())
+                states.add(t)
+                Q.append(t)
+            new_delta[(p, a)] = t
+
+    return DFA(states=set(states), alphabet=sigma, start=start, accept=new_accept, delta=new_delta)
+
+
+def intersection(*dfas: DFA, budget: Optional[Budget] = None) -> DFA:
+    """Product accepting words accepted by all DFAs (dead as soon as one component is)."""
+    return product(dfas, all, dead=lambda alive: not all(alive), budget=budget)
+
+
+def union(*dfas: DFA, budget: Optional[Budget] = None) -> DFA:
+    """Product accepting words accepted by any DFA."""
+    return product(dfas, any, budget=budget)
+
+
+def difference(a: DFA, b: DFA, *, budget: Optional[Budget] = None) -> DFA:
+    """Product accepting L(a) minus L(b)."""
+    return product((a, b), lambda f: f[0] and not f[1], dead=lambda alive: not alive[0], budget=budget)
+
+
+def symmetric_difference(a: DFA, b: DFA, *, budget: Optional[Budget] = None) -> DFA:
+    """Product accepting words in exactly one of L(a), L(b)."""
+    return product((a, b), lambda f: f[0] != f[1], budget=budget)
+
+
+def complement(dfa: DFA, alphabet: Optional[Iterable[Symbol]] = None, *, budget: Optional[Budget] = None) -> DFA:
+    """
+    DFA for alphabet* minus L(dfa); missing transitions lead to an accepting
+    sink (the product state (None,)). States are 1-tuples.
+    """
+    return product((dfa,), lambda f: not f[0], dead=lambda alive: False, alphabet=alphabet, budget=budget)
@@ -0,0 +1,87 @@
+"""
+Alphabet compression: symbols that every state treats the same way (same
+target, or no transition, from every state) form one equivalence class.
+Algorithms can run on one representative per class and expand the result
+afterwards; the compiled simulator maps symbols/bytes to class columns.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, cast
+
+from .dfa import DFA, State, Symbol
+
+
+@dataclass(frozen=True)
+class SymbolClasses:
+    """
+    Partition of an alphabet into classes of interchangeable symbols.
+    - `classes[c]`: the symbols of class c, in `repr` order
+    - classes are ordered by their first symbol, so taking one
+      representative per class preserves the `repr` order of symbols
+    - `class_of[a]`: class id of symbol a
+    """
+    classes: Tuple[Tuple[Symbol, ...], ...]
+    class_of: Dict[Symbol, int]
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.classes)
+
+    @property
+    def representatives(self) -> List[Symbol]:
+        return [c[0] for c in self.classes]
+
+
+def symbol_classes(dfa: DFA) -> SymbolClasses:
+    """
+    Classes of `dfa.alphabet`: a and b are equivalent iff
+    delta[(s, a)] == delta[(s, b)] for every state s, missing entries
+    included. O(n·k) lookups, no sorting of transitions.
+    """
+    symbols = sorted(dfa.alphabet, key=repr)
+    sources = list({s for s, _ in dfa.delta})
+    get = dfa.delta.get
+    return group_symbols(symbols, lambda a: tuple(map(get, zip(sources, repeat(a)))))
+
+
+def group_symbols(symbols: Iterable[Symbol], signature: Callable[[Symbol], Hashable]) -> SymbolClasses:
+    """
+    Classes of symbols with equal `signature(a)`; `symbols` must already
+    be in `repr` order (dicts keep first-insertion order, so classes come
+    out ordered by their first symbol).
+    """
+    groups: Dict[Hashable, List[Symbol]] = {}
+    for a in symbols:
+        groups.setdefault(signature(a), []).append(a)
+    classes = tuple(tuple(g) for g in groups.values())
+    class_of = {a: c for c, group in enumerate(classes) for a in group}
+    return SymbolClasses(classes=classes, class_of=class_of)
+
+
+def compress_dfa(dfa: DFA) -> Tuple[DFA, SymbolClasses]:
+    """
+    The same DFA over class ids 0..C-1 instead of symbols (a word is
+    accepted iff its sequence of class ids is), plus the classes.
+    """
+    cls = symbol_classes(dfa)
+    delta: Dict[Tuple[State, Symbol], State] = {}
+    for c, group in enumerate(cls.classes):
+        a = group[0]
+        for s in dfa.states:
+            t = dfa.delta.get((s, a))
+            if t is not None:
+                delta[(s, c)] = t
+    compressed = DFA(states=set(dfa.states), alphabet=set(range(cls.n_classes)), start=dfa.start,
+                     accept=set(dfa.accept), delta=delta)
+    return compressed, cls
+
+
+def expand_dfa(dfa: DFA, classes: SymbolClasses) -> DFA:
+    """Inverse of `compress_dfa`: a DFA over class ids back over the original symbols."""
+    delta: Dict[Tuple[State, Symbol], State] = {}
+    for (s, c), t in dfa.delta.items():
+        for a in classes.classes[cast(int, c)]:
+            delta[(s, a)] = t
+    return DFA(states=set(dfa.states), alphabet=set(classes.class_of), start=dfa.start,
+               accept=set(dfa.accept), delta=delta)
@@ -0,0 +1,164 @@
+"""
+Resource limits and cooperative cancellation for the algorithms that can
+blow up: `to_dfa`, `minimize_dfa` and the product constructions.
+
+    from langmachines.budgets import Budget, BudgetExceeded, CancellationToken
+
+    token = CancellationToken()          # token.cancel() from any thread
+    budget = Budget(max_states=100_000, timeout=2.0, max_memory=256 << 20, token=token)
+    try:
+        dfa = minimize_dfa(to_dfa(nfa, budget=budget), budget=budget)
+    except BudgetExceeded as e:
+        print(e.algorithm, e.resource, e.limit, e.stats)
+
+A budget is passed explicitly (`budget=`) or made ambient for a block
+with `with budgets.limit(budget): ...` (per thread / async context, like
+`instrument.record`), which also covers indirect calls such as
+`regex.compile(...).dfa`.
+
+- `max_states` is checked every time a state is created
+- the deadline, the memory estimate and the token are checked every
+  `check_every` units of work (subsets, product states, splitters)
+- the deadline is absolute: one Budget shared by several calls limits
+  their total time
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Union
+
+# Rough per-entry costs of the memory estimate, in bytes.
+STATE_BYTES = 160
+TRANSITION_BYTES = 72
+
+Stats = Dict[str, Union[int, float]]
+
+
+class BudgetExceeded(RuntimeError):
+    """
+    An algorithm ran out of budget.
+    - `algorithm`: "to_dfa", "minimize" or "product"
+    - `resource`: "states", "deadline", "memory" or "cancelled"
+    - `limit`: the limit that was hit: a state count, bytes, or for
+      "deadline" the time budget in seconds (None for cancellation)
+    - `stats`: partial statistics at the time, e.g. "states",
+      "transitions", "memory_estimate", "elapsed"
+    """
+
+    def __init__(self, algorithm: str, resource: str, limit: Optional[float], stats: Stats):
+        self.algorithm = algorithm
+        self.resource = resource
+        self.limit = limit
+        self.stats = stats
+        detail = "cancelled" if limit is None else f"{resource} budget of {limit} exceeded"
+        super().__init__(f"{algorithm}: {detail} ({_format(stats)})")
+
+
+class Cancelled(BudgetExceeded):
+    """The budget's CancellationToken was cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe flag: `cancel()` from any thread stops the algorithms using it."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Budget:
+    """
+    Limits for one or more algorithm runs (all optional).
+    - `max_states`: states an algorithm may create (DFA subsets, product
+      states, numbered states in minimization)
+    - `timeout`: seconds from construction; or an absolute `deadline` in
+      `time.monotonic()` seconds
+    - `max_memory`: bytes, against a rough estimate of the algorithm's
+      working set (not a measurement)
+    - `token`: CancellationToken checked cooperatively
+    - `check_every`: units of work between deadline/memory/token checks
+    """
+
+    def __init__(
+        self,
+        *,
+        max_states: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+        check_every: int = 1024,
+    ):
+        if timeout is not None and deadline is not None:
+            raise ValueError("Pass either timeout or deadline, not both.")
+        if check_every <= 0:
+            raise ValueError("check_every must be positive.")
+        self.started = time.monotonic()
+        self.max_states = max_states
+        self.deadline = self.started + timeout if timeout is not None else deadline
+        # Seconds from construction to the deadline, reported as the limit
+        self.timeout = self.deadline - self.started if self.deadline is not None else None
+        self.max_memory = max_memory
+        self.token = token
+        self.check_every = check_every
+
+    def __repr__(self) -> str:
+        return (f"Budget(max_states={self.max_states}, deadline={self.deadline}, "
+                f"max_memory={self.max_memory}, token={self.token!r})")
+
+    @property
+    def state_limit(self) -> int:
+        """`max_states`, or an int no count reaches (for a cheap inline compare)."""
+        return self.max_states if self.max_states is not None else 1 << 62
+
+    def exceeded(self, algorithm: str, resource: str, stats: Stats) -> BudgetExceeded:
+        """The exception to raise (stats get "elapsed" added)."""
+        stats = dict(stats, elapsed=time.monotonic() - self.started)
+        if resource == "cancelled":
+            return Cancelled(algorithm, resource, None, stats)
+        limit = {"states": self.max_states, "memory": self.max_memory, "deadline": self.timeout}[resource]
+        return BudgetExceeded(algorithm, resource, limit, stats)
+
+    def check(self, algorithm: str, stats: Stats, memory: int = 0) -> None:
+        """Raise BudgetExceeded if cancelled, past the deadline or over `max_memory`."""
+        if self.token is not None and self.token.cancelled:
+            raise self.exceeded(algorithm, "cancelled", stats)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise self.exceeded(algorithm, "deadline", stats)
+        if self.max_memory is not None and memory > self.max_memory:
+            raise self.exceeded(algorithm, "memory", dict(stats, memory_estimate=memory))
+
+
+def _format(stats: Stats) -> str:
+    return ", ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items())
+
+
+_current: ContextVar[Optional[Budget]] = ContextVar("langmachines_budget", default=None)
+
+
+def current() -> Optional[Budget]:
+    """The ambient Budget, or None."""
+    return _current.get()
+
+
+def resolve(budget: Optional[Budget]) -> Optional[Budget]:
+    """An explicit budget wins over the ambient one."""
+    return budget if budget is not None else _current.get()
+
+
+@contextmanager
+def limit(budget: Budget) -> Iterator[Budget]:
+    """Make `budget` ambient for the block (nested blocks shadow outer ones)."""
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
@@ -0,0 +1,491 @@
+"""
+Mutable builders for DFA / NFA.
+
+`DFA` and `NFA` are frozen: every transformation (`prune_unreachable`,
+`totalize`, ...) copies the whole automaton. A builder is edited in place
+and turned into an immutable automaton with `freeze()` in O(1): the
+automaton shares the builder's storage, and the builder copies it
+(copy-on-write) only if it is edited again afterwards.
+
+Copies are per container: an edit after `freeze()` copies only what it
+changes (`delta` for a new transition between known states, `accept` for
+an accepting-flag change, ...), once. A transition edit still copies the
+whole `delta` dict, since frozen automata hold plain dicts; NFABuilder
+additionally shares each target set until that (state, symbol) entry is
+edited. Freezing between every pair of edits is therefore O(|delta|) per
+step, not O(1).
+
+    b = DFABuilder(start="q0")
+    for s, a, t in rules:
+        b.add_transition(s, a, t)
+    b.prune()
+    b.complement()
+    dfa = b.freeze()
+"""
+from __future__ import annotations
+from collections import deque
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .dfa import DFA, State, Symbol
+from .nfa import NFA
+
+_CONTAINERS = ("_states", "_alphabet", "_accept", "_delta")
+
+
+def _own(builder: object, shared: Set[str], names: Iterable[str]) -> None:
+    """Replace each named container that is still shared by a private copy."""
+    for name in names:
+        if name in shared:
+            shared.remove(name)
+            old = getattr(builder, name)
+            setattr(builder, name, dict(old) if name == "_delta" else set(old))
+
+
+class DFABuilder:
+    """
+    Mutable (partial) DFA. States and symbols mentioned by transitions are
+    added automatically. The `states`, `alphabet`, `accept` and `delta`
+    properties are live, read-only views: change them through methods only.
+    """
+
+    def __init__(
+        self,
+        start: State = None,
+        *,
+        states: Iterable[State] = (),
+        alphabet: Iterable[Symbol] = (),
+        accept: Iterable[State] = (),
+        delta: Optional[Mapping[Tuple[State, Symbol], State]] = None,
+    ):
+        self._states: Set[State] = set(states)
+        self._alphabet: Set[Symbol] = set(alphabet)
+        self._accept: Set[State] = set(accept)
+        self._delta: Dict[Tuple[State, Symbol], State] = {}
+        self._shared: Set[str] = set()  # containers a frozen automaton still uses
+        self._start: State = None
+        if start is not None:
+            self.set_start(start)
+        self._states |= self._accept
+        if delta:
+            self.add_transitions((s, a, t) for (s, a), t in delta.items())
+
+    @classmethod
+    def from_dfa(cls, dfa: DFA) -> DFABuilder:
+        """Builder initialised with a DFA; each container is copied lazily, on its first edit."""
+        b = cls.__new__(cls)
+        b._states, b._alphabet, b._accept, b._delta = dfa.states, dfa.alphabet, dfa.accept, dfa.delta
+        b._start = dfa.start
+        b._shared = set(_CONTAINERS)
+        return b
+
+    def _own(self, *names: str) -> None:
+        _own(self, self._shared, names)
+
+    def _replace(self, name: str, value: object) -> None:
+        self._shared.discard(name)
+        setattr(self, name, value)
+
+    def _include(self, states: Iterable[State]) -> None:
+        """Add states, copying `states` only if one of them is new."""
+        new = [s for s in states if s not in self._states]
+        if new:
+            self._own("_states")
+            self._states.update(new)
+
+    # -- views --
+
+    @property
+    def start(self) -> State:
+        return self._start
+
+    @property
+    def states(self) -> AbstractSet[State]:
+        return self._states
+
+    @property
+    def alphabet(self) -> AbstractSet[Symbol]:
+        return self._alphabet
+
+    @property
+    def accept(self) -> AbstractSet[State]:
+        return self._accept
+
+    @property
+    def delta(self) -> Mapping[Tuple[State, Symbol], State]:
+        return self._delta
+
+    # -- editing --
+
+    def set_start(self, s: State) -> None:
+        self._include((s,))
+        self._start = s
+
+    def add_state(self, s: State, *, accepting: bool = False) -> None:
+        self.add_states((s,), accepting=accepting)
+
+    def add_states(self, states: Iterable[State], *, accepting: bool = False) -> None:
+        states = list(states)
+        self._include(states)
+        if accepting and not self._accept.issuperset(states):
+            self._own("_accept")
+            self._accept.update(states)
+
+    def set_accepting(self, s: State, accepting: bool = True) -> None:
+        self._include((s,))
+        if accepting != (s in self._accept):
+            self._own("_accept")
+            if accepting:
+                self._accept.add(s)
+            else:
+                self._accept.discard(s)
+
+    def add_symbols(self, symbols: Iterable[Symbol]) -> None:
+        new = [a for a in symbols if a not in self._alphabet]
+        if new:
+            self._own("_alphabet")
+            self._alphabet.update(new)
+
+    def add_transition(self, s: State, a: Symbol, t: State) -> None:
+        """Set delta(s, a) = t (replacing any previous target)."""
+        if self._shared:
+            self.add_transitions(((s, a, t),))
+            return
+        self._states.add(s)
+        self._states.add(t)
+        self._alphabet.add(a)
+        self._delta[(s, a)] = t
+
+    def add_transitions(self, transitions: Iterable[Tuple[State, Symbol, State]]) -> None:
+        """Bulk `add_transition` over (s, a, t) triples."""
+        self._own("_delta")
+        states, alphabet, delta = self._states, self._alphabet, self._delta
+        for s, a, t in transitions:
+            if s not in states or t not in states:
+                self._own("_states")
+                states = self._states
+                states.add(s)
+                states.add(t)
+            if a not in alphabet:
+                self._own("_alphabet")
+                alphabet = self._alphabet
+                alphabet.add(a)
+            delta[(s, a)] = t
+
+    def remove_transition(self, s: State, a: Symbol) -> None:
+        """Remove delta(s, a); KeyError if there is none."""
+        if (s, a) not in self._delta:
+            raise KeyError((s, a))
+        self._own("_delta")
+        del self._delta[(s, a)]
+
+    def remove_transitions(self, keys: Iterable[Tuple[State, Symbol]]) -> None:
+        """Bulk removal of (s, a) transitions; missing ones are ignored."""
+        self._own("_delta")
+        for key in keys:
+            self._delta.pop(key, None)
+
+    def remove_states(self, states: Iterable[State]) -> None:
+        """Remove states and every transition into or out of them (one pass over delta)."""
+        gone = set(states)
+        if self._start in gone:
+            raise ValueError("Cannot remove the start state.")
+        self._replace("_states", self._states - gone)
+        if not self._accept.isdisjoint(gone):
+            self._replace("_accept", self._accept - gone)
+        dead = [k for k, t in self._delta.items() if k[0] in gone or t in gone]
+        if dead:
+            self._own("_delta")
+            for k in dead:
+                del self._delta[k]
+
+    # -- in-place transformations --
+
+    def prune(self) -> int:
+        """Drop states unreachable from the start (like `prune_unreachable`); returns how many."""
+        if self._start is None:
+            raise ValueError("No start state.")
+        alphabet, delta = self._alphabet, self._delta
+        seen: Set[State] = {self._start}
+        Q = deque([self._start])
+        while Q:
+            s = Q.popleft()
+            for a in alphabet:
+                t = delta.get((s, a))
+                if t is not None and t not in seen:
+                    seen.add(t)
+                    Q.append(t)
+        removed = len(self._states) - len(seen)
+        if removed:
+            self._replace("_states", seen)
+            self._replace("_accept", self._accept & seen)
+            dead = [k for k in self._delta if k[0] not in seen]
+            if dead:
+                self._own("_delta")
+                for k in dead:
+                    del self._delta[k]
+        return removed
+
+    def totalize(self, sink: State = None) -> Optional[State]:
+        """
+        Route every missing transition to a sink state (`sink`, or a fresh
+        object), like `totalize`. Returns the sink, or None if the DFA was
+        already total.
+        """
+        missing = [(s, a) for s in self._states for a in self._alphabet if (s, a) not in self._delta]
+        if not missing:
+            return None
+        self._own("_states", "_delta")
+        if sink is None:
+            sink = object()
+        self._states.add(sink)
+        for key in missing:
+            self._delta[key] = sink
+        for a in self._alphabet:
+            self._delta.setdefault((sink, a), sink)
+        return sink
+
+    def complement(self, alphabet: Optional[Iterable[Symbol]] = None) -> None:
+        """
+        In place, accept exactly the words over the alphabet (extended by
+        `alphabet` if given) that were rejected. Totalizes first.
+        """
+        if alphabet is not None:
+            self.add_symbols(alphabet)
+        self.totalize()
+        self._replace("_accept", self._states - self._accept)
+
+    def freeze(self) -> DFA:
+        """Immutable DFA sharing this builder's storage (O(1); later edits copy what they change)."""
+        if self._start is None:
+            raise ValueError("No start state.")
+        self._shared = set(_CONTAINERS)
+        return DFA(
+            states=self._states,
+            alphabet=self._alphabet,
+            start=self._start,
+            accept=self._accept,
+            delta=self._delta,
+        )
+
+
+class NFABuilder:
+    """
+    Mutable NFA (ε-moves use EPSILON). Like DFABuilder, `freeze()` is O(1)
+    and each container is copied on its next edit; target sets are copied
+    lazily, one (state, symbol) entry at a time.
+    """
+
+    def __init__(
+        self,
+        start: State = None,
+        *,
+        states: Iterable[State] = (),
+        alphabet: Iterable[Symbol] = (),
+        accept: Iterable[State] = (),
+        delta: Optional[Mapping[Tuple[State, Symbol], Iterable[State]]] = None,
+    ):
+        self._states: Set[State] = set(states)
+        self._alphabet: Set[Symbol] = set(alphabet)
+        self._accept: Set[State] = set(accept)
+        self._delta: Dict[Tuple[State, Symbol], Set[State]] = {}
+        self._shared: Set[str] = set()  # containers a frozen automaton still uses
+        self._owned_keys: Optional[Set[Tuple[State, Symbol]]] = None  # None = all sets owned
+        self._start: State = None
+        if start is not None:
+            self.set_start(start)
+        self._states |= self._accept
+        if delta:
+            self.add_transitions((s, a, t) for (s, a), ts in delta.items() for t in ts)
+
+    @classmethod
+    def from_nfa(cls, nfa: NFA) -> NFABuilder:
+        """Builder initialised with an NFA; each container is copied lazily, on its first edit."""
+        b = cls.__new__(cls)
+        b._states, b._alphabet, b._accept, b._delta = nfa.states, nfa.alphabet, nfa.accept, nfa.delta
+        b._start = nfa.start
+        b._shared = set(_CONTAINERS)
+        b._owned_keys = set()
+        return b
+
+    def _own(self, *names: str) -> None:
+        _own(self, self._shared, names)
+
+    def _replace(self, name: str, value: object) -> None:
+        self._shared.discard(name)
+        setattr(self, name, value)
+
+    def _include(self, states: Iterable[State]) -> None:
+        """Add states, copying `states` only if one of them is new."""
+        new = [s for s in states if s not in self._states]
+        if new:
+            self._own("_states")
+            self._states.update(new)
+
+    def _targets(self, key: Tuple[State, Symbol]) -> Set[State]:
+        """Writable target set of `key` (copied first if still shared)."""
+        self._own("_delta")
+        owned = self._owned_keys
+        ts = self._delta.get(key)
+        if ts is None:
+            ts = self._delta[key] = set()
+        elif owned is not None and key not in owned:
+            ts = self._delta[key] = set(ts)
+        if owned is not None:
+            owned.add(key)
+        return ts
+
+    @property
+    def start(self) -> State:
+        return self._start
+
+    @property
+    def states(self) -> AbstractSet[State]:
+        return self._states
+
+    @property
+    def alphabet(self) -> AbstractSet[Symbol]:
+        return self._alphabet
+
+    @property
+    def accept(self) -> AbstractSet[State]:
+        return self._accept
+
+    @property
+    def delta(self) -> Mapping[Tuple[State, Symbol], AbstractSet[State]]:
+        return self._delta
+
+    def set_start(self, s: State) -> None:
+        self._include((s,))
+        self._start = s
+
+    def add_state(self, s: State, *, accepting: bool = False) -> None:
+        self.add_states((s,), accepting=accepting)
+
+    def add_states(self, states: Iterable[State], *, accepting: bool = False) -> None:
+        states = list(states)
+        self._include(states)
+        if accepting and not self._accept.issuperset(states):
+            self._own("_accept")
+            self._accept.update(states)
+
+    def set_accepting(self, s: State, accepting: bool = True) -> None:
+        self._include((s,))
+        if accepting != (s in self._accept):
+            self._own("_accept")
+            if accepting:
+                self._accept.add(s)
+            else:
+                self._accept.discard(s)
+
+    def add_symbols(self, symbols: Iterable[Symbol]) -> None:
+        new = [a for a in symbols if a not in self._alphabet]
+        if new:
+            self._own("_alphabet")
+            self._alphabet.update(new)
+
+    def add_transition(self, s: State, a: Symbol, t: State) -> None:
+        if self._shared:
+            self.add_transitions(((s, a, t),))
+            return
+        self._states.add(s)
+        self._states.add(t)
+        self._alphabet.add(a)
+        self._targets((s, a)).add(t)
+
+    def add_transitions(self, transitions: Iterable[Tuple[State, Symbol, State]]) -> None:
+        """Bulk `add_transition` over (s, a, t) triples."""
+        states, alphabet = self._states, self._alphabet
+        for s, a, t in transitions:
+            if s not in states or t not in states:
+                self._own("_states")
+                states = self._states
+                states.add(s)
+                states.add(t)
+            if a not in alphabet:
+                self._own("_alphabet")
+                alphabet = self._alphabet
+                alphabet.add(a)
+            self._targets((s, a)).add(t)
+
+    def remove_transition(self, s: State, a: Symbol, t: State) -> None:
+        """Remove the move s -a-> t; KeyError if there is none."""
+        if t not in self._delta.get((s, a), ()):
+            raise KeyError((s, a, t))
+        ts = self._targets((s, a))
+        ts.remove(t)
+        if not ts:
+            del self._delta[(s, a)]
+
+    def remove_transitions(self, transitions: Iterable[Tuple[State, Symbol, State]]) -> None:
+        """Bulk removal of (s, a, t) moves; missing ones are ignored."""
+        for s, a, t in transitions:
+            if t in self._delta.get((s, a), ()):
+                ts = self._targets((s, a))
+                ts.discard(t)
+                if not ts:
+                    del self._delta[(s, a)]
+
+    def remove_states(self, states: Iterable[State]) -> None:
+        """Remove states and every move into or out of them (one pass over delta)."""
+        gone = set(states)
+        if self._start in gone:
+            raise ValueError("Cannot remove the start state.")
+        self._replace("_states", self._states - gone)
+        if not self._accept.isdisjoint(gone):
+            self._replace("_accept", self._accept - gone)
+        edits: List[Tuple[Tuple[State, Symbol], Set[State]]] = []
+        for key, ts in self._delta.items():
+            if key[0] in gone:
+                edits.append((key, set()))
+            elif not gone.isdisjoint(ts):
+                edits.append((key, ts - gone))
+        self._set_rows(edits)
+
+    def _set_rows(self, edits: List[Tuple[Tuple[State, Symbol], Set[State]]]) -> None:
+        if not edits:
+            return
+        self._own("_delta")
+        owned = self._owned_keys
+        for key, ts in edits:
+            if ts:
+                self._delta[key] = ts
+                if owned is not None:
+                    owned.add(key)
+            else:
+                del self._delta[key]
+
+    def prune(self) -> int:
+        """Drop states unreachable from the start (through any moves, ε included); returns how many."""
+        if self._start is None:
+            raise ValueError("No start state.")
+        out: Dict[State, List[State]] = {}
+        for (s, _), ts in self._delta.items():
+            out.setdefault(s, []).extend(ts)
+        seen: Set[State] = {self._start}
+        stack = [self._start]
+        while stack:
+            for t in out.get(stack.pop(), ()):
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        removed = len(self._states) - len(seen)
+        if removed:
+            self._replace("_states", seen)
+            self._replace("_accept", self._accept & seen)
+            self._set_rows([(k, set()) for k in self._delta if k[0] not in seen])
+        return removed
+
+    def freeze(self) -> NFA:
+        """Immutable NFA sharing this builder's storage (O(1); later edits copy what they change)."""
+        if self._start is None:
+            raise ValueError("No start state.")
+        self._shared = set(_CONTAINERS)
+        self._owned_keys = set()
+        return NFA(
+            states=self._states,
+            alphabet=self._alphabet,
+            start=self._start,
+            accept=self._accept,
+            delta=self._delta,
+        )
+
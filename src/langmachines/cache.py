@@ -0,0 +1,196 @@
+"""
+Persistent (on-disk) memo cache for `to_dfa` and `minimize_dfa`.
+
+    cache = AutomatonCache("~/.cache/langmachines", max_bytes=256 << 20)
+    dfa = cache.minimize(regex.compile(rule).nfa)   # computed once, then read back
+
+Entries are binary DFA files (`langmachines.io.binary`) named by a
+sha256 key of (operation, input automaton), written atomically, so
+several processes can share a directory. When the directory grows past
+`max_bytes`, the least recently used entries (by mtime, refreshed on
+every hit) are deleted.
+
+Input keys:
+- DFA: `canonical.structural_hash`, so DFAs that differ only in state
+  labels or unreachable/dead parts share an entry
+- NFA: a hash of its transitions with labels included (NFAs have no
+  cheap canonical form); states and symbols need a stable `repr`
+
+Results:
+- `minimize` returns the canonical minimal DFA (int states 0..n-1,
+  start 0, dead states dropped), whether computed or read back
+- `to_dfa` returns the subset DFA with its usual Q0, Q1, ... names
+Symbols of cached results go through the binary format, so they must be
+str or int to read back unchanged.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+from .budgets import Budget
+from .canonical import canonical_form
+from .dfa import DFA
+from .io.binary import BinaryFormatError, from_buffer, write_binary
+from .nfa import NFA
+
+_SUFFIX = ".lmdfa"
+_VERSION = b"langmachines.cache/1\x00"
+
+
+@dataclass
+class CacheStats:
+    """Counters of an AutomatonCache (this process only)."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class AutomatonCache:
+    """On-disk memo of `to_dfa` / `minimize_dfa` results; see the module docstring."""
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"], *, max_bytes: int = 256 << 20):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.directory = os.path.expanduser(os.fspath(directory))
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        os.makedirs(self.directory, exist_ok=True)
+        self._sizes: Dict[str, int] = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX) and entry.is_file():
+                self._sizes[entry.name] = entry.stat().st_size
+        self._total = sum(self._sizes.values())
+
+    @property
+    def size(self) -> int:
+        """Bytes used by the entries this process knows about."""
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def minimize(self, automaton: Union[DFA, NFA], *, budget: Optional[Budget] = None) -> DFA:
+        """Canonical minimal DFA of a DFA or NFA (determinized first)."""
+        from .algorithms.minimize import minimize_dfa
+        from .nfa import to_dfa
+
+        if isinstance(automaton, NFA):
+            key = self._key(b"minimize/nfa", _nfa_digest(automaton))
+            source: Optional[DFA] = None
+        else:
+            canon = canonical_form(automaton)
+            source = canon.to_dfa()
+            key = self._key(b"minimize/dfa", canon.digest)
+        hit = self._get(key)
+        if hit is not None:
+            return hit
+        if source is None:
+            assert isinstance(automaton, NFA)
+            source = to_dfa(automaton, budget=budget)
+        result = canonical_form(minimize_dfa(source, budget=budget)).to_dfa()
+        self._put(key, result)
+        return result
+
+    def to_dfa(self, nfa: NFA, *, budget: Optional[Budget] = None) -> DFA:
+        """`langmachines.nfa.to_dfa(nfa)`, memoized."""
+        from .nfa import to_dfa
+
+        key = self._key(b"to_dfa", _nfa_digest(nfa))
+        hit = self._get(key)
+        if hit is not None:
+            return hit
+        result = to_dfa(nfa, budget=budget)
+        self._put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for name in list(self._sizes):
+            self._remove(name)
+
+    def _key(self, op: bytes, digest: str) -> str:
+        return hashlib.sha256(_VERSION + op + b"\x00" + digest.encode("ascii")).hexdigest() + _SUFFIX
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _get(self, name: str) -> Optional[DFA]:
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            dfa = from_buffer(data).to_dfa()
+        except FileNotFoundError:
+            self._forget(name)
+            self.stats.misses += 1
+            return None
+        except (BinaryFormatError, IndexError, struct.error):
+            self._remove(name)  # corrupt or partial entry: recompute
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: a hit makes the entry the newest
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return dfa
+
+    def _put(self, name: str, dfa: DFA) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_binary(dfa, f)
+            os.replace(tmp, self._path(name))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        size = os.path.getsize(self._path(name))
+        self._total += size - self._sizes.get(name, 0)
+        self._sizes[name] = size
+        self._evict(keep=name)
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        if self._total <= self.max_bytes:
+            return
+        by_age: Dict[str, Tuple[float, str]] = {}
+        for name in self._sizes:
+            try:
+                by_age[name] = (os.path.getmtime(self._path(name)), name)
+            except FileNotFoundError:
+                by_age[name] = (0.0, name)
+        for name in sorted(by_age, key=by_age.__getitem__):
+            if self._total <= self.max_bytes:
+                break
+            if name != keep:
+                self._remove(name)
+                self.stats.evictions += 1
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            pass
+        self._forget(name)
+
+    def _forget(self, name: str) -> None:
+        self._total -= self._sizes.pop(name, 0)
+
+
+def _nfa_digest(nfa: NFA) -> str:
+    """Label-dependent but order-independent hash of an NFA."""
+    h = hashlib.sha256()
+    h.update(repr(sorted(map(repr, nfa.alphabet))).encode("utf-8"))
+    h.update(repr(nfa.start).encode("utf-8"))
+    h.update(repr(sorted(map(repr, nfa.states))).encode("utf-8"))
+    h.update(repr(sorted(map(repr, nfa.accept))).encode("utf-8"))
+    edges = sorted(f"{s!r}\x00{a!r}\x00{sorted(map(repr, ts))!r}" for (s, a), ts in nfa.delta.items())
+    for e in edges:
+        h.update(e.encode("utf-8"))
+        h.update(b"\x01")
+    return h.hexdigest()
@@ -0,0 +1,136 @@
+"""
+Canonical form and content hashes of DFAs, independent of state labels.
+
+The canonical form keeps the states that are reachable from the start
+and can still reach an accepting state (dead states and the transitions
+into them are dropped), numbered 0..n-1 in BFS order from the start with
+symbols in `repr` order. Two DFAs have the same canonical form iff their
+trimmed reachable parts are isomorphic; for minimal DFAs (total or not)
+that means iff they accept the same language over the same alphabet.
+
+- `structural_hash(dfa)`: sha256 of the canonical form
+- `language_hash(automaton)`: sha256 of the canonical minimal DFA, equal
+  for any two DFAs/NFAs with the same language and alphabet, so a rule
+  set can be deduplicated with one dict lookup per automaton
+
+Symbols are hashed through their `repr`, so hashes are only stable across
+processes for symbols with a stable repr (str, int, tuples of those).
+"""
+from __future__ import annotations
+import hashlib
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Set, Tuple, Union
+
+from .dfa import DFA, State, Symbol
+from .nfa import NFA
+
+_DOMAIN = b"langmachines.canonical/1\x00"
+
+
+@dataclass(frozen=True)
+class CanonicalDFA:
+    """
+    Canonical form of a DFA (see the module docstring).
+    - `symbols`: the alphabet in `repr` order
+    - `table[q * len(symbols) + c]`: target state, or -1 (no move / dead)
+    - `accepting[q]`: 1 iff state q accepts; state 0 is the start
+    """
+    symbols: Tuple[Symbol, ...]
+    table: Tuple[int, ...]
+    accepting: bytes
+
+    @property
+    def n_states(self) -> int:
+        return len(self.accepting)
+
+    @cached_property
+    def digest(self) -> str:
+        """Hex sha256 of the canonical form."""
+        h = hashlib.sha256(_DOMAIN)
+        h.update(struct.pack("<QQ", self.n_states, len(self.symbols)))
+        for a in self.symbols:
+            r = repr(a).encode("utf-8")
+            h.update(struct.pack("<I", len(r)))
+            h.update(r)
+        table = array("i", self.table)
+        if sys.byteorder == "big":
+            table.byteswap()
+        h.update(table.tobytes())
+        h.update(self.accepting)
+        return h.hexdigest()
+
+    def to_dfa(self) -> DFA:
+        """The canonical DFA with int states 0..n-1 (start 0), partial."""
+        k = len(self.symbols)
+        delta: Dict[Tuple[State, Symbol], State] = {}
+        for q in range(self.n_states):
+            row = q * k
+            for c, a in enumerate(self.symbols):
+                t = self.table[row + c]
+                if t >= 0:
+                    delta[(q, a)] = t
+        return DFA(
+            states=set(range(self.n_states)),
+            alphabet=set(self.symbols),
+            start=0,
+            accept={q for q in range(self.n_states) if self.accepting[q]},
+            delta=delta,
+        )
+
+
+def canonical_form(dfa: DFA) -> CanonicalDFA:
+    """Canonical form of `dfa` (minimize first for a language-level form)."""
+    if dfa.start not in dfa.states:
+        raise ValueError("Start state is not in DFA states.")
+    symbols = sorted(dfa.alphabet, key=repr)
+
+    # States that can reach an accepting state
+    preds: Dict[State, List[State]] = {}
+    for (s, a), t in dfa.delta.items():
+        if a in dfa.alphabet:
+            preds.setdefault(t, []).append(s)
+    live: Set[State] = set(dfa.accept & dfa.states)
+    stack = list(live)
+    while stack:
+        for p in preds.get(stack.pop(), ()):
+            if p not in live:
+                live.add(p)
+                stack.append(p)
+
+    index: Dict[State, int] = {dfa.start: 0}
+    order: List[State] = [dfa.start]
+    table: List[int] = []
+    head = 0
+    while head < len(order):
+        s = order[head]
+        head += 1
+        for a in symbols:
+            t = dfa.delta.get((s, a))
+            if t is None or t not in live:
+                table.append(-1)
+                continue
+            j = index.get(t)
+            if j is None:
+                j = index[t] = len(order)
+                order.append(t)
+            table.append(j)
+    accepting = bytes(1 if s in dfa.accept else 0 for s in order)
+    return CanonicalDFA(symbols=tuple(symbols), table=tuple(table), accepting=accepting)
+
+
+def structural_hash(dfa: DFA) -> str:
+    """Label-independent hash of the trimmed reachable part of `dfa`."""
+    return canonical_form(dfa).digest
+
+
+def language_hash(automaton: Union[DFA, NFA]) -> str:
+    """Hash of the language: equal iff same language over the same alphabet."""
+    from .algorithms.minimize import minimize_dfa
+    from .nfa import to_dfa
+
+    dfa = to_dfa(automaton) if isinstance(automaton, NFA) else automaton
+    return canonical_form(minimize_dfa(dfa)).digest
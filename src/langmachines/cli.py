@@ -0,0 +1,349 @@
+"""
+Command-line interface (`langmachines ...` / `python -m langmachines ...`).
+
+    langmachines convert IN OUT          JSON <-> binary, or DOT export
+    langmachines minimize IN [-o OUT]    (NFAs are determinized first)
+    langmachines determinize IN [-o OUT]
+    langmachines render IN [-o OUT] [--format svg]
+    langmachines match (-e REGEX | -a AUTOMATON) [FILE ...]
+
+Automata are read from JSON (`io.jsonio`, default or compact layout) or
+the binary format (`io.binary`, detected by its magic bytes); `-` is
+stdin. The output format follows the extension of OUT (.json, .dot,
+.lmdfa/.bin) unless `--to` is given; stdout gets JSON by default.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from .compiled import CompiledDFA, compile_dfa
+from .dfa import DFA
+from .nfa import NFA
+from .parallel import SharedDFA, accepts_all, ordered_results
+
+Automaton = Union[DFA, NFA]
+
+_FORMATS = ("json", "compact", "dot", "binary")
+_EXTENSIONS = {".json": "json", ".dot": "dot", ".gv": "dot", ".lmdfa": "binary", ".bin": "binary"}
+
+DEFAULT_BATCH_BYTES = 1 << 20
+
+
+# --- Loading / saving ----------------------------------------------------
+
+
+def load(path: str) -> Automaton:
+    """Read a DFA/NFA from a JSON or binary file (`-` = stdin)."""
+    from .io import binary, jsonio
+
+    if path == "-":
+        data = sys.stdin.buffer.read()
+        if data.startswith(binary.MAGIC):
+            return binary.from_buffer(data).to_dfa()
+        return jsonio.read_automaton(io.StringIO(data.decode("utf-8")))
+    with open(path, "rb") as f:
+        is_binary = f.read(len(binary.MAGIC)) == binary.MAGIC
+    if is_binary:
+        return binary.load_binary(path).to_dfa()
+    return jsonio.load_automaton(path)
+
+
+def output_format(path: Optional[str], to: Optional[str]) -> str:
+    if to is not None:
+        return to
+    if path is None or path == "-":
+        return "json"
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"Cannot infer the output format of {path!r}; use --to.")
+    return _EXTENSIONS[ext]
+
+
+def save(m: Automaton, path: Optional[str], fmt: str) -> None:
+    """Write `m` as `fmt` to `path` (None or `-` = stdout)."""
+    from .io import binary, jsonio
+    from .io.dot import dfa_to_dot, nfa_to_dot
+
+    to_stdout = path is None or path == "-"
+    if fmt == "binary":
+        if not isinstance(m, DFA):
+            raise ValueError("The binary format holds DFAs only; determinize first.")
+        if to_stdout:
+            binary.write_binary(m, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+        else:
+            assert path is not None
+            binary.save_binary(m, path)
+        return
+    with contextlib.ExitStack() as stack:
+        out: TextIO = sys.stdout if to_stdout else stack.enter_context(open(str(path), "w", encoding="utf-8"))
+        if fmt == "dot":
+            out.write((dfa_to_dot(m) if isinstance(m, DFA) else nfa_to_dot(m)) + "\n")
+        elif isinstance(m, DFA):
+            jsonio.write_dfa(m, out, compact=fmt == "compact")
+        else:
+            jsonio.write_nfa(m, out, compact=fmt == "compact")
+
+
+def _determinize(m: Automaton) -> DFA:
+    from .nfa import to_dfa
+
+    return to_dfa(m) if isinstance(m, NFA) else m
+
+
+# --- Subcommands ---------------------------------------------------------
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    save(load(args.input), args.output, output_format(args.output, args.to))
+    return 0
+
+
+def cmd_minimize(args: argparse.Namespace) -> int:
+    from .algorithms.minimize import minimize_dfa
+
+    m = minimize_dfa(_determinize(load(args.input)))
+    save(m, args.output, output_format(args.output, args.to))
+    return 0
+
+
+def cmd_determinize(args: argparse.Namespace) -> int:
+    m = _determinize(load(args.input))
+    save(m, args.output, output_format(args.output, args.to))
+    return 0
+
+
+def cmd_render(args: argparse.Namespace) -> int:
+    m = load(args.input)
+    if args.format == "dot":
+        save(m, args.output, "dot")
+        return 0
+    from .io.dot import render_dfa
+
+    path = render_dfa(_determinize(m), format=args.format, filename=args.output)
+    print(path)
+    return 0
+
+
+# --- match: grep-style whole-line matching --------------------------------
+#
+# The input is cut into newline-aligned blocks of ~batch_bytes. Each block is
+# matched independently (in a worker process if jobs > 1, against the table in
+# shared memory, see `parallel`) and comes back as ready-to-write output, so
+# the parent only reads, dispatches and writes. At most 4 * jobs blocks are in
+# flight; results are written in input order.
+#
+# -e patterns match UTF-8 text: the regex alphabet is ASCII, the characters
+# the pattern mentions and one stand-in for every other character (no
+# pattern can tell those apart). All-ASCII blocks run on the bytes directly;
+# other blocks are decoded line by line (invalid bytes count as one
+# character each) and folded onto that alphabet first.
+
+_Job = Tuple[bytes, int, bytes]  # (block, first line number, "name:" prefix)
+
+_ASCII = frozenset(map(chr, range(128)))
+# Unicode noncharacters: never in text, so free to stand for "anything else"
+_OTHER_CANDIDATES = "\uffff\ufffe" + "".join(map(chr, range(0xFDD0, 0xFDF0)))
+
+_matcher: Optional[CompiledDFA] = None
+_options: Tuple[bool, bool, bool] = (False, False, False)  # invert, count, line numbers
+_fold: Optional["_Fold"] = None
+
+
+class _Fold(Dict[int, int]):
+    """`str.translate` table: symbols of the matcher map to themselves, anything else to `other`."""
+
+    def __init__(self, symbols: Iterable[Any], other: str):
+        super().__init__((ord(a), ord(a)) for a in symbols if isinstance(a, str) and len(a) == 1)
+        self.other = ord(other)
+
+    def __missing__(self, cp: int) -> int:
+        self[cp] = self.other
+        return self.other
+
+
+def _build_matcher(args: argparse.Namespace) -> Tuple[CompiledDFA, Optional[str]]:
+    """The matcher, plus the stand-in character for unmentioned text (None: match raw bytes)."""
+    if args.regexp is not None:
+        from . import regex
+
+        flags = regex.IGNORECASE if args.ignore_case else 0
+        mentioned = regex.compile(args.regexp, flags).alphabet
+        other = next(c for c in _OTHER_CANDIDATES if c not in mentioned)
+        alphabet = mentioned | _ASCII | {other}
+        return regex.compile(args.regexp, flags, alphabet=alphabet).compiled, other
+    from .algorithms.minimize import minimize_dfa
+
+    return compile_dfa(minimize_dfa(_determinize(load(args.automaton)))), None
+
+
+def _init_worker(shared_name: str, options: Tuple[bool, bool, bool], other: Optional[str]) -> None:
+    from multiprocessing import util
+    from .parallel import DETACH_PRIORITY, attach
+
+    global _matcher, _options, _fold
+    _matcher = attach(shared_name)
+    _options = options
+    _fold = None if other is None else _Fold(_matcher.symbols, other)
+    util.Finalize(None, _drop_matcher, exitpriority=DETACH_PRIORITY + 1)
+
+
+def _drop_matcher() -> None:
+    # Runs before the shared block is closed, which fails while views of it are alive.
+    global _matcher, _fold
+    _matcher = _fold = None
+
+
+def _match_block(job: _Job) -> Tuple[bytes, int]:
+    """Return (output bytes, number of selected lines) for one block."""
+    block, lineno, prefix = job
+    assert _matcher is not None
+    invert, count_only, numbers = _options
+    lines = block.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    keys: Sequence[Union[bytes, str]] = lines
+    if _fold is not None and not block.isascii():
+        keys = [x.decode("utf-8", "surrogateescape").translate(_fold) for x in lines]
+    hits = accepts_all(_matcher, keys)
+    selected = [i for i, hit in enumerate(hits) if hit != invert]
+    if count_only:
+        return b"", len(selected)
+    if numbers:
+        out = [b"%s%d:%s\n" % (prefix, lineno + i, lines[i]) for i in selected]
+    else:
+        out = [prefix + lines[i] + b"\n" for i in selected]
+    return b"".join(out), len(selected)
+
+
+def iter_blocks(fp: BinaryIO, batch_bytes: int = DEFAULT_BATCH_BYTES) -> Iterator[bytes]:
+    """Yield the contents of `fp` in blocks of whole lines (the last one may lack its newline)."""
+    rest = b""
+    while True:
+        data = fp.read(batch_bytes)
+        if not data:
+            break
+        data = rest + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            rest = data
+            continue
+        rest = data[cut:]
+        yield data[:cut]
+    if rest:
+        yield rest
+
+
+def _jobs(files: List[str], batch_bytes: int, with_names: bool) -> Iterator[_Job]:
+    for path in files:
+        prefix = path.encode("utf-8", "surrogateescape") + b":" if with_names else b""
+        with contextlib.ExitStack() as stack:
+            f: BinaryIO = sys.stdin.buffer if path == "-" else stack.enter_context(open(path, "rb"))
+            lineno = 1
+            for block in iter_blocks(f, batch_bytes):
+                yield block, lineno, prefix
+                lineno += block.count(b"\n")
+
+
+def cmd_match(args: argparse.Namespace) -> int:
+    global _matcher, _options, _fold
+    matcher, other = _build_matcher(args)
+    options = (args.invert_match, args.count, args.line_number)
+    files = args.files or ["-"]
+    jobs = _jobs(files, args.batch_bytes, len(files) > 1)
+    out = sys.stdout.buffer
+    total = 0
+
+    def emit(result: Tuple[bytes, int]) -> None:
+        nonlocal total
+        out.write(result[0])
+        total += result[1]
+
+    n_jobs = args.jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        _matcher, _options = matcher, options
+        _fold = None if other is None else _Fold(matcher.symbols, other)
+        for job in jobs:
+            emit(_match_block(job))
+    else:
+        # Workers attach to one shared copy of the table instead of rebuilding it.
+        with SharedDFA(matcher) as shared, ProcessPoolExecutor(
+            n_jobs, initializer=_init_worker, initargs=(shared.name, options, other)
+        ) as pool:
+            for result in ordered_results(pool, _match_block, jobs, 4 * n_jobs):
+                emit(result)
+    if args.count:
+        out.write(b"%d\n" % total)
+    out.flush()
+    return 0 if total else 1
+
+
+# --- Entry point ----------------------------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="langmachines", description="Automata toolkit command line.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    def io_command(name: str, help: str, output_required: bool = False) -> argparse.ArgumentParser:
+        sp = sub.add_parser(name, help=help)
+        sp.add_argument("input", help="automaton file (JSON or binary; - for stdin)")
+        if output_required:
+            sp.add_argument("output", help="output file (- for stdout)")
+        else:
+            sp.add_argument("-o", "--output", help="output file (default: stdout)")
+        sp.add_argument("--to", choices=_FORMATS, help="output format (default: from the extension)")
+        return sp
+
+    io_command("convert", "convert between JSON, compact JSON, binary and DOT", True).set_defaults(
+        func=cmd_convert
+    )
+    io_command("minimize", "minimize a DFA (determinizing NFAs first)").set_defaults(func=cmd_minimize)
+    io_command("determinize", "subset construction NFA -> DFA").set_defaults(func=cmd_determinize)
+
+    sp = sub.add_parser("render", help="draw an automaton (DOT, or an image via graphviz)")
+    sp.add_argument("input")
+    sp.add_argument("-o", "--output", help="output file (DOT: default stdout; images: name without extension)")
+    sp.add_argument("--format", default="dot", help="dot (default) or any graphviz format: svg, png, ...")
+    sp.set_defaults(func=cmd_render)
+
+    sp = sub.add_parser(
+        "match",
+        help="print lines (from files or stdin) matched in full by a regex or automaton",
+        description="Print the lines accepted in full by the automaton (like grep -x). "
+        "Exit status is 0 if a line was selected, 1 otherwise.",
+    )
+    what = sp.add_mutually_exclusive_group(required=True)
+    what.add_argument("-e", "--regexp", help="regex (see langmachines.regex)")
+    what.add_argument("-a", "--automaton", help="DFA/NFA file (JSON or binary)")
+    sp.add_argument("files", nargs="*", help="input files (default: stdin)")
+    sp.add_argument("-i", "--ignore-case", action="store_true", help="with -e: case-insensitive")
+    sp.add_argument("-v", "--invert-match", action="store_true", help="select non-matching lines")
+    sp.add_argument("-c", "--count", action="store_true", help="only print the number of selected lines")
+    sp.add_argument("-n", "--line-number", action="store_true", help="prefix lines with their line number")
+    sp.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: CPU count)")
+    sp.add_argument("--batch-bytes", type=int, default=DEFAULT_BATCH_BYTES, help=argparse.SUPPRESS)
+    sp.set_defaults(func=cmd_match)
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return int(args.func(args))
+    except BrokenPipeError:  # e.g. `langmachines match ... | head`
+        sys.stderr.close()
+        return 1
+    except (OSError, ValueError, KeyError) as e:
+        print(f"langmachines: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
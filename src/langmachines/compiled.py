@@ -0,0 +1,383 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, islice, repeat
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .dfa import DFA, State, Symbol
+
+DEAD = -1  # sentinel target id for a missing transition
+
+ByteInput = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledDFA:
+    """
+    Dense-table form of a DFA for fast simulation.
+
+    States and symbols are interned to small integers:
+    - `states[q]` / `symbols[i]` map ids back to the original labels
+    - `columns[i]` is the table column of `symbols[i]`: symbols every
+      state treats alike share a column (see `langmachines.alphabet`);
+      None means one column per symbol
+    - `table[q * n_columns + c]` is the target id, or DEAD if undefined
+    - `accepting[q]` is non-zero iff state `q` is accepting
+
+    `table` and `accepting` only need to support integer indexing, so
+    they can be plain `array`s or `memoryview`s over a shared buffer.
+    """
+    states: Sequence[State]
+    symbols: Sequence[Symbol]
+    start: int
+    accepting: Union[bytes, bytearray, memoryview]
+    table: Union["array[int]", memoryview]
+    columns: Optional[Sequence[int]] = None
+
+    dead_state: ClassVar[int] = DEAD
+
+    @property
+    def n_states(self) -> int:
+        return len(self.states)
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    @cached_property
+    def n_columns(self) -> int:
+        """Width of a table row: the number of symbol classes."""
+        if self.columns is None:
+            return len(self.symbols)
+        return max(self.columns, default=-1) + 1
+
+    @cached_property
+    def state_index(self) -> Dict[State, int]:
+        """Original state label -> state id."""
+        return {s: i for i, s in enumerate(self.states)}
+
+    @cached_property
+    def symbol_index(self) -> Dict[Symbol, int]:
+        """Original symbol -> column id."""
+        if self.columns is None:
+            return {a: c for c, a in enumerate(self.symbols)}
+        return dict(zip(self.symbols, self.columns))
+
+    @cached_property
+    def byte_map(self) -> Tuple[int, ...]:
+        """Column id for every byte value (-1 if the byte is not a symbol); see `byte_symbols`."""
+        index = self.symbol_index
+        return tuple(-1 if a is None else index[a] for a in byte_symbols(self.symbols))
+
+    @cached_property
+    def _offsets(self) -> Union[List[int], "array[int]", memoryview]:
+        """
+        Transition table used by `advance`.
+        For an in-memory `array` this is a list of pre-multiplied row
+        offsets (`t * n_columns`, or DEAD), which avoids a multiply and
+        int boxing per step. Buffer-backed tables (mmap/shared memory) are
+        used as-is so their pages stay shared.
+        """
+        if not isinstance(self.table, array):
+            return self.table
+        k = self.n_columns
+        return [t * k if t >= 0 else DEAD for t in self.table]
+
+    @cached_property
+    def _byte_translation(self) -> Union[bytes, None]:
+        """`bytes.translate` table mapping byte -> column (255 = unknown)."""
+        if self.n_columns > 255:
+            return None
+        return bytes(c if c >= 0 else 255 for c in self.byte_map)
+
+    def advance(self, q: int, input_symbols: Union[ByteInput, Iterable[Symbol]]) -> int:
+        """
+        Run the table from state id `q` over the input and return the
+        final state id, or DEAD as soon as a transition is missing.
+
+        Bytes-like input is matched through `byte_map`; anything else
+        (str, sequences of ints or other symbols) through `symbol_index`.
+        Raises KeyError for a symbol outside the alphabet, unless the run
+        dies before reaching it (like `langmachines.dfa.simulate`).
+        """
+        if q < 0:
+            return DEAD
+        k = self.n_columns
+        off = self._offsets
+        if off is not self.table:
+            o = q * k
+            if isinstance(input_symbols, (bytes, bytearray)) and self._byte_translation is not None:
+                cols = input_symbols.translate(self._byte_translation)
+                bad = cols.find(255) if 255 in self._byte_translation else -1
+                for c in cols if bad < 0 else cols[:bad]:
+                    o = off[o + c]
+                    if o < 0:
+                        return DEAD
+                if bad >= 0:
+                    raise KeyError(f"Byte {input_symbols[bad]!r} not in alphabet.")
+                return o // k if k else q
+            if isinstance(input_symbols, (bytes, bytearray, memoryview)):
+                byte_map = self.byte_map
+                for b in input_symbols:
+                    c = byte_map[b]
+                    if c < 0:
+                        raise KeyError(f"Byte {b!r} not in alphabet.")
+                    o = off[o + c]
+                    if o < 0:
+                        return DEAD
+                return o // k if k else q
+            index = self.symbol_index
+            it = iter(input_symbols)
+            try:
+                for c in map(index.__getitem__, it):
+                    o = off[o + c]
+                    if o < 0:
+                        return DEAD
+            except KeyError as e:
+                raise KeyError(f"Symbol {e.args[0]!r} not in alphabet.") from None
+            return o // k if k else q
+
+        table = self.table
+        if isinstance(input_symbols, (bytes, bytearray, memoryview)):
+            byte_map = self.byte_map
+            for b in input_symbols:
+                c = byte_map[b]
+                if c < 0:
+                    raise KeyError(f"Byte {b!r} not in alphabet.")
+                q = table[q * k + c]
+                if q < 0:
+                    return DEAD
+            return q
+        index = self.symbol_index
+        for a in input_symbols:
+            c = index.get(a, -1)
+            if c < 0:
+                raise KeyError(f"Symbol {a!r} not in alphabet.")
+            q = table[q * k + c]
+            if q < 0:
+                return DEAD
+        return q
+
+    def is_accepting(self, q: int) -> bool:
+        return q >= 0 and bool(self.accepting[q])
+
+    def simulate(self, input_symbols: Union[ByteInput, Iterable[Symbol]]) -> bool:
+        """
+        Run the compiled DFA from its start state.
+        Returns True iff the final state is accepting (same result as
+        `langmachines.dfa.simulate` on the source DFA).
+        """
+        return self.is_accepting(self.advance(self.start, input_symbols))
+
+    def to_dfa(self) -> DFA:
+        """Rebuild a (partial) DFA over the original labels."""
+        k = self.n_columns
+        index = self.symbol_index
+        delta: Dict[Tuple[State, Symbol], State] = {}
+        for q, s in enumerate(self.states):
+            row = q * k
+            for a in self.symbols:
+                t = self.table[row + index[a]]
+                if t >= 0:
+                    delta[(s, a)] = self.states[t]
+        return DFA(
+            states=set(self.states),
+            alphabet=set(self.symbols),
+            start=self.states[self.start],
+            accept={s for q, s in enumerate(self.states) if self.accepting[q]},
+            delta=delta,
+        )
+
+    def symbol_table(self) -> "array[int]":
+        """The table with one column per symbol (`n_states * n_symbols`), classes expanded."""
+        if self.columns is None:
+            return array("i", self.table)
+        k, cols = self.n_columns, self.columns
+        table = array("i")
+        for q in range(self.n_states):
+            row = q * k
+            table.extend([self.table[row + c] for c in cols])
+        return table
+
+
+def byte_symbols(symbols: Iterable[Symbol]) -> Tuple[Optional[Symbol], ...]:
+    """
+    The symbol each byte value stands for when matching bytes-like input
+    (None if it is not in `symbols`).
+    Integer symbols 0..255 map to themselves; one-character `str` and
+    `bytes` symbols map to their code point / byte value. Integer symbols
+    take precedence on conflicts.
+    """
+    out: List[Optional[Symbol]] = [None] * 256
+    symbols = list(symbols)
+    for a in symbols:
+        if isinstance(a, (str, bytes)) and len(a) == 1 and ord(a) < 256:
+            if out[ord(a)] is None:
+                out[ord(a)] = a
+    for a in symbols:
+        if isinstance(a, int) and not isinstance(a, bool) and 0 <= a < 256:
+            out[a] = a
+    return tuple(out)
+
+
+def compile_dfa(dfa: DFA) -> CompiledDFA:
+    """
+    Intern states and symbols of a DFA (or MinDFA) and build the dense table.
+    - Symbols are ordered by `repr`
+    - Symbols every state treats alike share one table column, so the
+      table has one column per symbol class rather than per symbol
+    - States are numbered in BFS order from the start (start is id 0);
+      unreachable states follow, ordered by `repr`
+    - Missing transitions become DEAD
+    """
+    from .alphabet import symbol_classes
+
+    if dfa.start not in dfa.states:
+        raise ValueError("Start state is not in DFA states.")
+
+    cls = symbol_classes(dfa)
+    symbols: List[Symbol] = sorted(dfa.alphabet, key=repr)
+    reps = cls.representatives
+    k = len(reps)
+
+    index: Dict[State, int] = {dfa.start: 0}
+    order: List[State] = [dfa.start]
+    Q = deque([dfa.start])
+    while Q:
+        s = Q.popleft()
+        for a in reps:
+            t = dfa.delta.get((s, a))
+            if t is not None and t not in index:
+                index[t] = len(order)
+                order.append(t)
+                Q.append(t)
+    rest: Set[State] = set(dfa.states) - index.keys()
+    for s in sorted(rest, key=repr):
+        index[s] = len(order)
+        order.append(s)
+
+    table = array("i", [DEAD]) * (len(order) * k)
+    col = {a: c for c, a in enumerate(reps)}  # other class members carry the same targets
+    for (s, a), t in dfa.delta.items():
+        c = col.get(a)
+        if c is not None and s in index and t in index:
+            table[index[s] * k + c] = index[t]
+
+    accepting = bytes(1 if s in dfa.accept else 0 for s in order)
+    columns = None if k == len(symbols) else tuple(cls.class_of[a] for a in symbols)
+    return CompiledDFA(states=tuple(order), symbols=tuple(symbols), start=0, accepting=accepting, table=table,
+                       columns=columns)
+
+
+def simulate_many(
+    dfa: Union[DFA, CompiledDFA],
+    inputs: Iterable[Union[ByteInput, Sequence[Symbol]]],
+    *,
+    backend: str = "auto",
+    batch_size: int = 1 << 16,
+) -> Union[List[bool], Any]:
+    """
+    Simulate many inputs at once; result[i] == simulate(dfa, inputs[i]).
+    - backend="numpy": all inputs of a batch advance through the table in
+      lock-step, one vectorized gather per input position (inputs are
+      sorted by length so finished ones drop out); returns a bool ndarray
+    - backend="python": per-input loop over the compiled table; returns
+      a list of bools
+    - backend="auto": numpy if importable, else python
+    Each input must support len(). Missing transitions reject; a symbol
+    outside the alphabet raises KeyError unless that run died earlier.
+    Pass a CompiledDFA to avoid recompiling on every call.
+    """
+    if backend not in ("auto", "numpy", "python"):
+        raise ValueError(f"Unknown backend {backend!r}.")
+    c = dfa if isinstance(dfa, CompiledDFA) else compile_dfa(dfa)
+
+    np: Any = None
+    if backend != "python":
+        try:
+            import numpy as np
+        except ImportError as e:
+            if backend == "numpy":
+                raise ImportError(
+                    "simulate_many(backend='numpy') requires the 'numpy' package. "
+                    "Install extras: pip install '.[numpy]'"
+                ) from e
+    if np is None:
+        return [c.simulate(x) for x in inputs]
+
+    parts = []
+    it = iter(inputs)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        parts.append(_simulate_batch_numpy(np, c, batch))
+    if not parts:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(parts)
+
+
+def _simulate_batch_numpy(np: Any, c: CompiledDFA, batch: List[Any]) -> Any:
+    n, k = c.n_states, c.n_columns
+    # Extended table: row n is the dead state, row n + 1 an "unknown
+    # symbol" error state; column k is the unknown-symbol column.
+    dead, err, unk, w = n, n + 1, k, k + 1
+    T = np.empty((n + 2, w), dtype=np.intp)
+    if n and k:
+        body = np.frombuffer(c.table, dtype=np.int32).reshape(n, k).astype(np.intp)
+        body[body < 0] = dead
+        T[:n, :k] = body
+    T[:n, unk] = err
+    T[dead, :] = dead
+    T[err, :] = err
+    T = T.ravel()
+    acc = np.zeros(n + 2, dtype=bool)
+    acc[:n] = np.frombuffer(bytes(c.accepting), dtype=np.uint8) != 0
+
+    lengths = np.fromiter((len(x) for x in batch), dtype=np.intp, count=len(batch))
+    total = int(lengths.sum())
+    if all(isinstance(x, (bytes, bytearray, memoryview)) for x in batch):
+        lut = np.array([b if b >= 0 else unk for b in c.byte_map], dtype=np.intp)
+        flat = lut[np.frombuffer(b"".join(batch), dtype=np.uint8)]
+    elif all(isinstance(x, str) for x in batch):
+        # Code points of the whole batch in one buffer, mapped to columns
+        # by binary search over the one-character symbols.
+        cps = np.frombuffer("".join(batch).encode("utf-32-le"), dtype=np.uint32)
+        chars = sorted((ord(a), col) for a, col in c.symbol_index.items() if isinstance(a, str) and len(a) == 1)
+        keys = np.array([cp for cp, _ in chars] or [0], dtype=np.uint32)
+        vals = np.array([col for _, col in chars] or [unk], dtype=np.intp)
+        pos = np.minimum(np.searchsorted(keys, cps), len(keys) - 1)
+        flat = np.where(keys[pos] == cps, vals[pos], unk)
+    else:
+        get = c.symbol_index.get
+        byte_map = [b if b >= 0 else unk for b in c.byte_map]
+
+        def codes(x: Any) -> Iterable[int]:
+            if isinstance(x, (bytes, bytearray, memoryview)):
+                return map(byte_map.__getitem__, x)
+            return map(get, x, repeat(unk))
+
+        flat = np.fromiter(chain.from_iterable(map(codes, batch)), dtype=np.intp, count=total)
+
+    starts = np.zeros(len(batch), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    order = np.argsort(-lengths, kind="stable")
+    s_starts = starts[order]
+    s_len = lengths[order]
+    state = np.full(len(batch), c.start, dtype=np.intp)
+    maxlen = int(s_len[0]) if len(batch) else 0
+    # active[i] = number of (length-sorted) inputs longer than i
+    active = np.searchsorted(-s_len, -np.arange(maxlen), side="left")
+    for i in range(maxlen):
+        m = int(active[i])
+        st = state[:m]
+        state[:m] = T[st * w + flat[s_starts[:m] + i]]
+
+    final = np.empty_like(state)
+    final[order] = state
+    bad = np.flatnonzero(final == err)
+    if len(bad):
+        c.simulate(batch[int(bad[0])])  # raises the KeyError
+    return acc[final]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass, replace
-from typing import Dict, Set, Tuple, Hashable, Iterable
+from typing import Dict, Set, Tuple, Hashable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .compiled import CompiledDFA
 
 State = Hashable
 Symbol = Hashable
@@ -14,6 +17,15 @@ class DFA:
     accept: Set[State]
     delta: Dict[Tuple[State, Symbol], State]
 
+    def compile(self) -> CompiledDFA:
+        """
+        Intern states/symbols into a dense transition table.
+        See `langmachines.compiled.compile_dfa`.
+        """
+        from .compiled import compile_dfa
+
+        return compile_dfa(self)
+
 
 def simulate(dfa: DFA, input_symbols: Iterable[Symbol]) -> bool:
     """
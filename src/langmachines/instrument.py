@@ -0,0 +1,104 @@
+"""
+Optional instrumentation of the core algorithms (off by default).
+
+    from langmachines import instrument
+
+    with instrument.record(progress=print, progress_every=50_000) as rec:
+        minimize_dfa(to_dfa(nfa))
+    print(rec.report())
+
+While a Recorder is active (per thread / async context), `to_dfa`,
+`minimize_dfa` and `epsilon_closure` report:
+- timings of their phases, e.g. "to_dfa.closure", "minimize.refine"
+- counters, e.g. "to_dfa.subsets", "epsilon_closure.calls",
+  "minimize.splits", "minimize.splitters", "minimize.sink_insertions"
+- maxima, e.g. "minimize.worklist_peak"
+- progress callbacks `progress(algorithm, done, pending)` every
+  `progress_every` units of work (subsets, splitters)
+
+When no Recorder is active, an algorithm pays one context-variable lookup
+per call and nothing per step.
+"""
+from __future__ import annotations
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+ProgressCallback = Callable[[str, int, int], None]  # (algorithm, done, pending)
+
+
+class Recorder:
+    """Collects timings, counters and maxima; see the module docstring."""
+
+    def __init__(self, progress: Optional[ProgressCallback] = None, progress_every: int = 10_000):
+        if progress_every <= 0:
+            raise ValueError("progress_every must be positive.")
+        self.progress = progress
+        self.progress_every = progress_every
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.maxima: Dict[str, int] = {}
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def high_water(self, name: str, value: int) -> None:
+        if value > self.maxima.get(name, -1):
+            self.maxima[name] = value
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block; repeated phases accumulate."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def tick(self, algorithm: str, done: int, pending: int) -> None:
+        if self.progress is not None:
+            self.progress(algorithm, done, pending)
+
+    def next_tick(self, done: int) -> int:
+        """
+        The `done` value at which an algorithm should call `tick` next
+        (-1 if there is no progress callback, so the check never fires).
+        """
+        if self.progress is None:
+            return -1
+        return done + self.progress_every
+
+    def report(self) -> str:
+        lines = [f"{name:<32} {secs * 1e3:>10.2f} ms" for name, secs in sorted(self.timings.items())]
+        lines += [f"{name:<32} {n:>10}" for name, n in sorted(self.counters.items())]
+        lines += [f"{name:<32} {n:>10} (max)" for name, n in sorted(self.maxima.items())]
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[Recorder]] = ContextVar("langmachines_recorder", default=None)
+
+
+def current() -> Optional[Recorder]:
+    """The active Recorder, or None when instrumentation is off."""
+    return _current.get()
+
+
+@contextmanager
+def record(progress: Optional[ProgressCallback] = None, *, progress_every: int = 10_000) -> Iterator[Recorder]:
+    """Activate a new Recorder for the duration of the block (nested blocks shadow outer ones)."""
+    rec = Recorder(progress, progress_every)
+    token = _current.set(rec)
+    try:
+        yield rec
+    finally:
+        _current.reset(token)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """`rec.phase(name)` on the active Recorder, a no-op context otherwise."""
+    rec = _current.get()
+    return rec.phase(name) if rec is not None else nullcontext()
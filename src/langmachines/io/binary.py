@@ -0,0 +1,294 @@
+"""
+Binary DFA format (little-endian), designed to be mmap'ed:
+
+    header   HEADER (magic, version, crc32 of everything after the header,
+             n_states, n_symbols, start, section offsets, file length)
+    symbols  label table
+    table    n_states * n_symbols int32 transition targets (-1 = missing),
+             8-byte aligned
+    accept   n_states bytes (0/1)
+    states   label table
+
+A label table is a u32 kind and u32 padding, then a u64 count and:
+    kind 0 (str):      u64 offsets[count + 1] into a UTF-8 blob, then the blob
+    kind 1 (int):      i64 values[count]
+    kind 2 (implicit): u32 prefix length + UTF-8 prefix; label i is f"{prefix}{i}"
+Labels that are neither str nor int are stored as str (like jsonio).
+"""
+from __future__ import annotations
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, BinaryIO, Hashable, Iterable, Iterator, List, Sequence, Union, overload
+
+from ..compiled import CompiledDFA, compile_dfa
+from ..dfa import DFA
+
+MAGIC = b"LMDFA\x00\r\n"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQQQQQQ")
+
+_STR, _INT, _IMPLICIT = 0, 1, 2
+_TABLE_HEAD = struct.Struct("<IIQ")
+
+
+class BinaryFormatError(ValueError):
+    """The file is not a valid langmachines binary DFA."""
+
+
+class _StrTable(Sequence[str]):
+    """Read-only view of a kind-0 label table; decodes labels on access."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _ImplicitTable(Sequence[str]):
+    """Labels f"{prefix}{i}" for i in range(count), without storing them."""
+
+    def __init__(self, prefix: str, count: int):
+        self._prefix = prefix
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return f"{self._prefix}{i}"
+
+
+def _pad8(n: int) -> bytes:
+    return b"\x00" * (-n % 8)
+
+
+def _encode_labels(labels: Sequence[Hashable]) -> bytes:
+    if all(isinstance(x, int) and not isinstance(x, bool) for x in labels):
+        values = array("q", [x for x in labels if isinstance(x, int)])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return _TABLE_HEAD.pack(_INT, 0, len(labels)) + values.tobytes()
+    encoded = [str(x).encode("utf-8") for x in labels]
+    offsets = array("Q", [0])
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return _TABLE_HEAD.pack(_STR, 0, len(labels)) + offsets.tobytes() + b"".join(encoded)
+
+
+def encode_implicit_labels(prefix: str, count: int) -> bytes:
+    """Label table for f"{prefix}{i}" labels (e.g. the Q0, Q1, ... of `to_dfa`)."""
+    p = prefix.encode("utf-8")
+    return _TABLE_HEAD.pack(_IMPLICIT, 0, count) + struct.pack("<I", len(p)) + p
+
+
+def _decode_labels(buf: memoryview, off: int) -> Sequence[Hashable]:
+    kind, _, count = _TABLE_HEAD.unpack_from(buf, off)
+    off += _TABLE_HEAD.size
+    if kind == _INT:
+        raw = buf[off:off + 8 * count]
+        if sys.byteorder == "big":
+            values = array("q", raw.tobytes())
+            values.byteswap()
+            return tuple(values)
+        return raw.cast("q")
+    if kind == _STR:
+        raw = buf[off:off + 8 * (count + 1)]
+        if sys.byteorder == "big":
+            arr = array("Q", raw.tobytes())
+            arr.byteswap()
+            offsets = memoryview(arr)
+        else:
+            offsets = raw.cast("Q")
+        blob_off = off + 8 * (count + 1)
+        return _StrTable(offsets, buf[blob_off:blob_off + offsets[count]])
+    if kind == _IMPLICIT:
+        (n,) = struct.unpack_from("<I", buf, off)
+        return _ImplicitTable(str(buf[off + 4:off + 4 + n], "utf-8"), count)
+    raise BinaryFormatError(f"Unknown label table kind {kind}.")
+
+
+def write_binary(dfa: Union[DFA, CompiledDFA], fp: BinaryIO) -> None:
+    """Write a DFA (compiled on the fly if needed) to a binary file object."""
+    c = dfa if isinstance(dfa, CompiledDFA) else compile_dfa(dfa)
+    n, k = c.n_states, c.n_symbols
+
+    sections: List[bytes] = []
+    pos = HEADER.size
+
+    def add(data: bytes, align: bool = True) -> int:
+        nonlocal pos
+        if align and pos % 8:
+            sections.append(_pad8(pos))
+            pos += len(sections[-1])
+        start = pos
+        sections.append(data)
+        pos += len(data)
+        return start
+
+    symbols_off = add(_encode_labels(list(c.symbols)))
+    table = c.symbol_table()  # the format stores one column per symbol
+    if sys.byteorder == "big":
+        table.byteswap()
+    table_off = add(table.tobytes())
+    accept_off = add(bytes(1 if x else 0 for x in c.accepting), align=False)
+    states_off = add(_encode_labels(list(c.states)))
+
+    crc = 0
+    for s in sections:
+        crc = zlib.crc32(s, crc)
+    fp.write(HEADER.pack(MAGIC, VERSION, 0, crc, n, k, c.start, symbols_off, table_off, accept_off, states_off, pos))
+    for s in sections:
+        fp.write(s)
+
+
+def write_binary_stream(
+    fp: BinaryIO,
+    *,
+    n_states: int,
+    symbols: Sequence[Hashable],
+    start: int,
+    table: Iterable[bytes],
+    accepting: Iterable[bytes],
+    states: bytes,
+) -> None:
+    """
+    Write the binary format from sections produced incrementally, for
+    DFAs too large to hold in memory:
+    - `table`: chunks of little-endian int32 targets, n_states * len(symbols)
+      values in total, row by row
+    - `accepting`: chunks of 0/1 bytes, n_states in total
+    - `states`: an encoded label table, e.g. `encode_implicit_labels("Q", n)`
+    `fp` must be seekable: the header (with the CRC) is written last.
+    """
+    n, k = n_states, len(symbols)
+    base = fp.tell()
+    symbols_blob = _encode_labels(list(symbols))
+    symbols_off = HEADER.size
+    table_off = symbols_off + len(symbols_blob)
+    table_off += -table_off % 8
+    accept_off = table_off + 4 * n * k
+    states_off = accept_off + n
+    states_off += -states_off % 8
+    end = states_off + len(states)
+
+    fp.write(b"\x00" * HEADER.size)
+    crc = 0
+    pos = HEADER.size
+
+    def put(data: bytes) -> None:
+        nonlocal crc, pos
+        crc = zlib.crc32(data, crc)
+        pos += len(data)
+        fp.write(data)
+
+    def fill(chunks: Iterable[bytes], until: int, what: str) -> None:
+        for chunk in chunks:
+            put(chunk)
+        if pos != until:
+            raise ValueError(f"The {what} section ends at byte {pos}, expected {until}.")
+
+    put(symbols_blob)
+    put(_pad8(pos))
+    fill(table, accept_off, "table")
+    fill(accepting, accept_off + n, "accepting")
+    put(_pad8(pos))
+    put(states)
+    fp.seek(base)
+    fp.write(HEADER.pack(MAGIC, VERSION, 0, crc, n, k, start, symbols_off, table_off, accept_off, states_off, end))
+    fp.seek(base + end)
+
+
+def save_binary(dfa: Union[DFA, CompiledDFA], path: str) -> None:
+    with open(path, "wb") as f:
+        write_binary(dfa, f)
+
+
+def from_buffer(buf: Any, *, verify: bool = True) -> CompiledDFA:
+    """
+    Build a CompiledDFA directly on top of a buffer holding the binary
+    format (bytes, mmap, shared memory). The transition table, accepting
+    flags and string label tables are zero-copy views into `buf`, which
+    must stay alive (and unmodified) as long as the result is used.
+    """
+    view = memoryview(buf).cast("B")
+    if len(view) < HEADER.size:
+        raise BinaryFormatError("File too short for a binary DFA header.")
+    (magic, version, _flags, crc, n, k, start,
+     symbols_off, table_off, accept_off, states_off, end) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise BinaryFormatError("Not a langmachines binary DFA (bad magic).")
+    if version != VERSION:
+        raise BinaryFormatError(f"Unsupported binary DFA version {version}.")
+    if end > len(view):
+        raise BinaryFormatError("Truncated binary DFA.")
+    if verify and zlib.crc32(view[HEADER.size:end]) != crc:
+        raise BinaryFormatError("Checksum mismatch: binary DFA is corrupt.")
+
+    symbols = _decode_labels(view, symbols_off)
+    states = _decode_labels(view, states_off)
+    if len(symbols) != k or len(states) != n or not (0 <= start < max(n, 1)):
+        raise BinaryFormatError("Inconsistent binary DFA header.")
+    raw = view[table_off:table_off + 4 * n * k]
+    table: Union["array[int]", memoryview]
+    if sys.byteorder == "big":
+        table = array("i", raw.tobytes())
+        table.byteswap()
+    else:
+        table = raw.cast("i")
+    return CompiledDFA(
+        states=states,
+        symbols=tuple(symbols),
+        start=start,
+        accepting=view[accept_off:accept_off + n],
+        table=table,
+    )
+
+
+def load_binary(path: str, *, verify: bool = True) -> CompiledDFA:
+    """
+    mmap a binary DFA file and return a CompiledDFA backed by the mapping.
+    Pages are loaded on demand and shared between processes mapping the
+    same file. `verify=False` skips the checksum pass for instant startup.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return from_buffer(mm, verify=verify)
+
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Tuple, Hashable, Dict, Set
-from ..dfa import DFA, State
+from typing import AbstractSet, Iterable, Tuple, Hashable, Dict, Set
+from ..dfa import DFA, State, Symbol
+from ..nfa import NFA
 
 def dfa_to_dot(dfa: DFA, *, rankdir: str = "LR", name: str = "DFA") -> str:
     """
@@ -9,9 +10,28 @@ def dfa_to_dot(dfa: DFA, *, rankdir: str = "LR", name: str = "DFA") -> str:
     - No external deps required.
     - Edges with the same (src, dst) are merged with comma-joined labels.
     """
+    edges = ((s, a, t) for (s, a), t in dfa.delta.items())
+    return _to_dot(dfa.states, dfa.start, dfa.accept, edges, rankdir=rankdir, name=name)
+
+
+def nfa_to_dot(nfa: NFA, *, rankdir: str = "LR", name: str = "NFA") -> str:
+    """Like `dfa_to_dot`, with one edge per (src, symbol, dst) of the NFA (ε included)."""
+    edges = ((s, a, t) for (s, a), targets in nfa.delta.items() for t in targets)
+    return _to_dot(nfa.states, nfa.start, nfa.accept, edges, rankdir=rankdir, name=name)
+
+
+def _to_dot(
+    states: AbstractSet[State],
+    start: State,
+    accept: AbstractSet[State],
+    edges: Iterable[Tuple[State, Symbol, State]],
+    *,
+    rankdir: str,
+    name: str,
+) -> str:
     # Group labels for same (src, dst)
     edge_labels: Dict[Tuple[State, State], Set[str]] = {}
-    for (s, a), t in dfa.delta.items():
+    for s, a, t in edges:
         edge_labels.setdefault((s, t), set()).add(str(a))
 
     def q(s: Hashable) -> str:
@@ -28,18 +48,18 @@ def dfa_to_dot(dfa: DFA, *, rankdir: str = "LR", name: str = "DFA") -> str:
 
     # Invisible start arrow
     lines.append('  __start__ [shape=point, style=invis, width=0];')
-    lines.append(f'  __start__ -> {q(dfa.start)} [label="start"];')
+    lines.append(f'  __start__ -> {q(start)} [label="start"];')
 
     # Accepting states as doublecircle
-    if dfa.accept:
-        acc_nodes = " ".join(q(s) for s in dfa.accept)
+    if accept:
+        acc_nodes = " ".join(q(s) for s in accept)
         lines.append('  subgraph cluster_accept {{ label="accepting"; color=gray80; style=dashed;')
         lines.append('    node [shape=doublecircle];')
         lines.append(f'    {acc_nodes};')
         lines.append('  }')
 
     # Non-accepting nodes (ensure they exist even if no edges)
-    nonacc = dfa.states - dfa.accept
+    nonacc = states - accept
     if nonacc:
         nodes = " ".join(q(s) for s in nonacc)
         lines.append(f'  {nodes};')
@@ -1,27 +1,17 @@
 from __future__ import annotations
-from typing import Dict, Any, Hashable, Tuple, Set
+from typing import Dict, Any, Hashable, Iterator, List, Optional, TextIO, Tuple, Set, Union
 import json
 
 from ..dfa import DFA
+from ..nfa import NFA
 
 
 def dfa_from_json_obj(obj: Dict[str, Any]) -> DFA:
     if obj.get("type") != "dfa":
         raise ValueError("JSON does not describe a DFA (missing type='dfa').")
-    # Annotate as Hashable so mypy is happy even though most JSON uses str.
-    states: Set[Hashable] = set(obj["states"])
-    alphabet: Set[Hashable] = set(obj["alphabet"])
-    start: Hashable = obj["start"]
-    accept: Set[Hashable] = set(obj["accept"])
-    delta_nested: Dict[str, Dict[str, str]] = obj["delta"]
-
-    # Important: annotate delta with Hashable types to satisfy DFA signature.
-    delta: Dict[Tuple[Hashable, Hashable], Hashable] = {}
-    for s, row in delta_nested.items():
-        for a, t in row.items():
-            delta[(s, a)] = t
-
-    return DFA(states=states, alphabet=alphabet, start=start, accept=accept, delta=delta)
+    automaton = _Parts(obj).build()
+    assert isinstance(automaton, DFA)
+    return automaton
 
 
 def dfa_to_json_obj(dfa: DFA) -> Dict[str, Any]:
@@ -38,14 +28,337 @@ def dfa_to_json_obj(dfa: DFA) -> Dict[str, Any]:
     }
 
 
+def nfa_from_json_obj(obj: Dict[str, Any]) -> NFA:
+    if obj.get("type") != "nfa":
+        raise ValueError("JSON does not describe an NFA (missing type='nfa').")
+    automaton = _Parts(obj).build()
+    assert isinstance(automaton, NFA)
+    return automaton
+
+
+def nfa_to_json_obj(nfa: NFA) -> Dict[str, Any]:
+    nested: Dict[str, Dict[str, List[str]]] = {}
+    for (s, a), targets in nfa.delta.items():
+        nested.setdefault(str(s), {})[str(a)] = sorted(str(t) for t in targets)
+    return {
+        "type": "nfa",
+        "states": [str(s) for s in nfa.states],
+        "alphabet": [str(a) for a in nfa.alphabet],
+        "start": str(nfa.start),
+        "accept": [str(s) for s in nfa.accept],
+        "delta": nested,
+    }
+
+
+# --- Streaming writers ---------------------------------------------------
+#
+# Two layouts, both plain JSON:
+# - default: like dfa_to_json_obj, one `delta` row per line
+#     "delta": {"s": {"a": "t", ...}, ...}      (NFA: {"a": ["t", ...]})
+# - compact: no indentation, integer ids into "states"/"alphabet"
+#     {"type": "dfa", "format": "compact", ..., "start": 0, "accept": [ids],
+#      "delta": [[t_0, t_1, ...], ...]}        one row per state, -1 = missing
+#     (NFA rows hold a list of target ids per symbol)
+#   symbols used in `delta` but missing from the alphabet (e.g. ε) follow
+#   the alphabet's columns and are listed in "extra_symbols"
+
+
+def write_dfa(dfa: DFA, fp: TextIO, *, compact: bool = False) -> None:
+    """Stream a DFA as JSON, emitting `delta` one state row at a time."""
+    _write(dfa, fp, "dfa", compact)
+
+
+def write_nfa(nfa: NFA, fp: TextIO, *, compact: bool = False) -> None:
+    """Stream an NFA as JSON, emitting `delta` one state row at a time."""
+    _write(nfa, fp, "nfa", compact)
+
+
+def _write(m: Union[DFA, NFA], fp: TextIO, kind: str, compact: bool) -> None:
+    def dump(x: Any) -> str:
+        return json.dumps(x, ensure_ascii=False, separators=(",", ":") if compact else None)
+
+    states = list(m.states)
+    alphabet = sorted(m.alphabet, key=repr)
+    delta: Dict[Any, Any] = m.delta
+    # Transitions on symbols outside the alphabet (ε-moves above all) are kept, like in *_to_json_obj
+    extra = sorted({a for _, a in delta} - set(alphabet), key=repr)
+    symbols = alphabet + extra
+
+    if compact:
+        ids = {s: i for i, s in enumerate(states)}
+        name = kind.upper()
+
+        def id_of(t: Any, what: str) -> int:
+            i = ids.get(t)
+            if i is None:
+                raise ValueError(f"{what} {t!r} is not in {name} states.")
+            return i
+
+        start = id_of(m.start, "Start state")
+        accept = sorted(id_of(s, "Accepting state") for s in m.accept)
+        fp.write(f'{{"type":"{kind}","format":"compact"')
+        fp.write(',"states":' + dump([str(s) for s in states]))
+        fp.write(',"alphabet":' + dump([str(a) for a in alphabet]))
+        if extra:
+            fp.write(',"extra_symbols":' + dump([str(a) for a in extra]))
+        fp.write(f',"start":{start}')
+        fp.write(',"accept":' + dump(accept))
+        fp.write(',"delta":[')
+        for i, s in enumerate(states):
+            row: List[Any] = []
+            if kind == "dfa":
+                for a in symbols:
+                    t = delta.get((s, a))
+                    row.append(-1 if t is None else id_of(t, "Transition target"))
+            else:
+                row = [sorted(id_of(t, "Transition target") for t in delta.get((s, a), ())) for a in symbols]
+            fp.write(("," if i else "") + dump(row))
+        fp.write("]}\n")
+        return
+
+    fp.write("{\n")
+    fp.write(f'  "type": "{kind}",\n')
+    fp.write('  "states": ' + dump([str(s) for s in states]) + ",\n")
+    fp.write('  "alphabet": ' + dump([str(a) for a in alphabet]) + ",\n")
+    fp.write('  "start": ' + dump(str(m.start)) + ",\n")
+    fp.write('  "accept": ' + dump([str(s) for s in m.accept]) + ",\n")
+    fp.write('  "delta": {')
+    first = True
+    for s in states:
+        nested: Dict[str, Any] = {}
+        for a in symbols:
+            t = delta.get((s, a))
+            if t is None:
+                continue
+            nested[str(a)] = str(t) if kind == "dfa" else sorted(str(x) for x in t)
+        if not nested:
+            continue
+        fp.write(("\n" if first else ",\n") + "    " + dump(str(s)) + ": " + dump(nested))
+        first = False
+    fp.write("\n  }\n}\n" if not first else "}\n}\n")
+
+
+# --- Streaming readers ---------------------------------------------------
+
+
+class _JsonStream:
+    """
+    Minimal pull parser over a text stream: the caller walks the top-level
+    object/arrays with `members()` / `elements()` and decodes leaf values
+    with `value()`, so only one value is held in memory at a time.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        data = self.fp.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Malformed JSON: expected {ch!r}, got {got or 'end of input'!r}.")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2  # geometric growth keeps long values linear
+                continue
+            if end == len(self.buf) and not self.eof and self._fill(size):
+                continue  # a number may continue in the next chunk
+            self.pos = end
+            return obj
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of an object; the caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed JSON: object key is not a string.")
+            self.expect(":")
+            yield key
+            ch = self.peek()
+            self.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"Malformed JSON: expected ',' or '}}', got {ch or 'end of input'!r}.")
+
+    def elements(self) -> Iterator[None]:
+        """Iterate the elements of an array; the caller consumes each one."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield None
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError(f"Malformed JSON: expected ',' or ']', got {ch or 'end of input'!r}.")
+
+
+class _Parts:
+    """Collects the fields of a DFA/NFA JSON document and builds the automaton."""
+
+    def __init__(self, obj: Optional[Dict[str, Any]] = None):
+        self.kind: Optional[str] = None
+        self.compact = False
+        self.states: List[Hashable] = []
+        self.alphabet: List[Hashable] = []
+        self.extra_symbols: List[Hashable] = []  # compact columns past the alphabet
+        self.start: Any = None
+        self.accept: List[Any] = []
+        self.delta: Dict[Tuple[Hashable, Hashable], Any] = {}
+        self.rows: List[List[Any]] = []  # compact rows, resolved in build()
+        if obj is not None:
+            self.kind = obj.get("type")
+            self.compact = obj.get("format") == "compact"
+            self.states = obj["states"]
+            self.alphabet = obj["alphabet"]
+            self.extra_symbols = obj.get("extra_symbols", [])
+            self.start = obj["start"]
+            self.accept = obj["accept"]
+            if self.compact:
+                self.rows = obj["delta"]
+            else:
+                for s, row in obj["delta"].items():
+                    self.add_row(s, row)
+
+    def add_row(self, s: Hashable, row: Dict[str, Any]) -> None:
+        for a, t in row.items():
+            self.delta[(s, a)] = set(t) if isinstance(t, list) else t
+
+    def build(self) -> Union[DFA, NFA]:
+        if self.kind not in ("dfa", "nfa"):
+            raise ValueError("JSON does not describe a DFA or NFA (missing type).")
+        states: Set[Hashable] = set(self.states)
+        alphabet: Set[Hashable] = set(self.alphabet)
+        start: Hashable = self.start
+        accept: Set[Hashable] = set(self.accept)
+        delta = self.delta
+        if self.compact:
+            labels, symbols = self.states, self.alphabet + self.extra_symbols
+            start = labels[self.start]
+            accept = {labels[i] for i in self.accept}
+            for i, row in enumerate(self.rows):
+                s = labels[i]
+                for c, t in enumerate(row):
+                    if self.kind == "dfa":
+                        if t is not None and t >= 0:
+                            delta[(s, symbols[c])] = labels[t]
+                    elif t:
+                        delta[(s, symbols[c])] = {labels[j] for j in t}
+        if self.kind == "dfa":
+            return DFA(states=states, alphabet=alphabet, start=start, accept=accept, delta=delta)
+        return NFA(states=states, alphabet=alphabet, start=start, accept=accept, delta=delta)
+
+
+def read_automaton(fp: TextIO) -> Union[DFA, NFA]:
+    """
+    Stream-parse a DFA or NFA JSON document (default or compact layout).
+    `delta` rows are decoded and folded in one at a time, so peak memory
+    is the automaton itself plus one row.
+    """
+    js = _JsonStream(fp)
+    parts = _Parts()
+    for key in js.members():
+        if key == "delta":
+            if js.peek() == "[":
+                for _ in js.elements():
+                    parts.rows.append(js.value())
+            else:
+                for s in js.members():
+                    parts.add_row(s, js.value())
+        elif key in ("states", "alphabet", "extra_symbols", "accept"):
+            items = getattr(parts, key)
+            for _ in js.elements():
+                items.append(js.value())
+        else:
+            v = js.value()
+            if key == "type":
+                parts.kind = v
+            elif key == "format":
+                parts.compact = v == "compact"
+            elif key == "start":
+                parts.start = v
+    if js.peek():
+        raise ValueError("Malformed JSON: trailing data after the automaton.")
+    return parts.build()
+
+
+def read_dfa(fp: TextIO) -> DFA:
+    m = read_automaton(fp)
+    if not isinstance(m, DFA):
+        raise ValueError("JSON does not describe a DFA (missing type='dfa').")
+    return m
+
+
+def read_nfa(fp: TextIO) -> NFA:
+    m = read_automaton(fp)
+    if not isinstance(m, NFA):
+        raise ValueError("JSON does not describe an NFA (missing type='nfa').")
+    return m
+
+
+def load_automaton(path: str) -> Union[DFA, NFA]:
+    with open(path, "r", encoding="utf-8") as f:
+        return read_automaton(f)
+
+
 def load_dfa(path: str) -> DFA:
     with open(path, "r", encoding="utf-8") as f:
-        obj = json.load(f)
-    return dfa_from_json_obj(obj)
+        return read_dfa(f)
+
+
+def load_nfa(path: str) -> NFA:
+    with open(path, "r", encoding="utf-8") as f:
+        return read_nfa(f)
+
+
+def save_dfa(dfa: DFA, path: str, *, compact: bool = False) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        write_dfa(dfa, f, compact=compact)
 
 
-def save_dfa(dfa: DFA, path: str) -> None:
-    obj = dfa_to_json_obj(dfa)
+def save_nfa(nfa: NFA, path: str, *, compact: bool = False) -> None:
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+        write_nfa(nfa, f, compact=compact)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .compiled import byte_symbols
+from .dfa import Symbol
+from .nfa import NFA, BitsetNFA
+
+# Rough per-entry memory costs used for the `max_bytes` estimate.
+_STATE_OVERHEAD = 160
+_TRANSITION_COST = 72
+
+
+@dataclass
+class CacheStats:
+    """Counters of a LazyDFA's state cache."""
+    hits: int = 0        # transition found in the cache
+    misses: int = 0      # transition computed from the NFA
+    evictions: int = 0   # DFA states dropped by the LRU policy
+    fallbacks: int = 0   # runs that switched to direct NFA simulation
+
+
+class LazyDFA:
+    """
+    On-the-fly subset construction: DFA states (ε-closed NFA state sets,
+    as BitsetNFA masks) are only created when a run reaches them.
+
+    - Transitions are memoized per state in an LRU cache bounded by
+      `max_states` and, optionally, an estimated `max_bytes`
+    - If runs keep evicting (more than `thrash_ratio` of the steps in a
+      `thrash_window` evict a state), the current `advance()` call stops
+      caching and finishes as a direct NFA simulation; `stats.fallbacks`
+      counts those switches. The window spans calls, so streaming small
+      chunks through a DFAMatcher falls back too
+    - Run states are masks; 0 is the dead (empty) state
+
+    Implements the DFAMatcher Runner protocol, so it can be streamed:
+    `DFAMatcher(LazyDFA(nfa)).feed_file(path)`.
+    """
+
+    dead_state = 0
+
+    def __init__(
+        self,
+        nfa: NFA,
+        *,
+        max_states: int = 10_000,
+        max_bytes: Optional[int] = None,
+        thrash_window: int = 4096,
+        thrash_ratio: float = 0.5,
+    ):
+        if max_states < 1:
+            raise ValueError("max_states must be at least 1.")
+        self.nfa = BitsetNFA(nfa)
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+        self.thrash_window = thrash_window
+        self.thrash_ratio = thrash_ratio
+        self.stats = CacheStats()
+        self._cache: OrderedDict[int, Dict[Symbol, int]] = OrderedDict()
+        self._bytes = 0
+        # Thrash window, carried over between advance() calls
+        self._window_steps = 0
+        self._window_evictions = 0
+
+    @property
+    def start(self) -> int:
+        return self.nfa.start
+
+    @property
+    def cache_size(self) -> int:
+        """Number of DFA states currently cached."""
+        return len(self._cache)
+
+    @property
+    def cache_bytes(self) -> int:
+        """Estimated memory held by the cache."""
+        return self._bytes
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._bytes = 0
+        self._window_steps = self._window_evictions = 0
+
+    def is_accepting(self, q: int) -> bool:
+        return bool(q & self.nfa.accept)
+
+    def _row(self, q: int) -> Tuple[Dict[Symbol, int], int]:
+        """Cached transition row of `q` (created if missing), plus #evictions."""
+        cache = self._cache
+        row = cache.get(q)
+        if row is not None:
+            cache.move_to_end(q)
+            return row, 0
+        row = cache[q] = {}
+        self._bytes += _STATE_OVERHEAD + q.bit_length() // 8
+        return row, self._evict()
+
+    def _add(self, q: int, row: Dict[Symbol, int], symbol: Symbol) -> Tuple[int, int]:
+        """Compute and cache the move of `q` (whose row is `row`), plus #evictions."""
+        t = row[symbol] = self.nfa.step(q, symbol)
+        self._bytes += _TRANSITION_COST
+        return t, self._evict() if self.max_bytes is not None else 0
+
+    def _evict(self) -> int:
+        """Drop least recently used states (never the newest) until within bounds."""
+        cache = self._cache
+        evicted = 0
+        while len(cache) > 1 and (
+            len(cache) > self.max_states
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            old, old_row = cache.popitem(last=False)
+            self._bytes -= _STATE_OVERHEAD + old.bit_length() // 8 + _TRANSITION_COST * len(old_row)
+            evicted += 1
+        self.stats.evictions += evicted
+        return evicted
+
+    def step(self, q: int, symbol: Symbol) -> int:
+        """Successor of run state `q` under `symbol` (through the cache)."""
+        if not q:
+            return 0
+        if symbol not in self.nfa.succ:
+            raise KeyError(f"Symbol {symbol!r} not in alphabet.")
+        row, _ = self._row(q)
+        t = row.get(symbol)
+        if t is None:
+            self.stats.misses += 1
+            t, _ = self._add(q, row, symbol)
+        else:
+            self.stats.hits += 1
+        return t
+
+    @cached_property
+    def _byte_symbols(self) -> Tuple[Optional[Symbol], ...]:
+        return byte_symbols(self.nfa.symbols)
+
+    def advance(self, q: int, input_symbols: Any) -> int:
+        """
+        Run from state `q` over the input (str, bytes-like or an iterable
+        of symbols) and return the final state (0 = dead).
+        """
+        if isinstance(input_symbols, (bytes, bytearray, memoryview)):
+            table = self._byte_symbols
+            input_symbols = (table[b] if table[b] is not None else b for b in input_symbols)
+        succ = self.nfa.succ
+        stats = self.stats
+        window = self.thrash_window
+        limit = self.thrash_ratio * window
+        if not q:
+            return 0
+        steps, evictions = self._window_steps, self._window_evictions
+        it = iter(input_symbols)
+        try:
+            for a in it:
+                if a not in succ:
+                    raise KeyError(f"Symbol {a!r} not in alphabet.")
+                row, ev = self._row(q)
+                t = row.get(a)
+                if t is None:
+                    stats.misses += 1
+                    t, ev2 = self._add(q, row, a)
+                    ev += ev2
+                else:
+                    stats.hits += 1
+                if not t:
+                    return 0
+                q = t
+                evictions += ev
+                steps += 1
+                if steps >= window:
+                    thrashing = evictions > limit
+                    steps = evictions = 0
+                    if thrashing:
+                        stats.fallbacks += 1
+                        return self._simulate_nfa(q, it)
+            return q
+        finally:
+            self._window_steps, self._window_evictions = steps, evictions
+
+    def _simulate_nfa(self, q: int, it: Iterable[Symbol]) -> int:
+        """Finish a run directly on the NFA, without touching the cache."""
+        return self.nfa.run(q, it)
+
+    def simulate(self, input_symbols: Any) -> bool:
+        """Return True iff the NFA accepts the input."""
+        return self.is_accepting(self.advance(self.start, input_symbols))
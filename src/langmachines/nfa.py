@@ -1,7 +1,11 @@
 from __future__ import annotations
+import time
 from dataclasses import dataclass
-from typing import Dict, Set, Tuple, Hashable, FrozenSet, AbstractSet
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Hashable, FrozenSet, AbstractSet
 
+from . import budgets, instrument
+from .budgets import Budget
 from .dfa import DFA, State, Symbol
 
 EPSILON = "ε"  # reserved symbol for epsilon transitions
@@ -16,16 +20,22 @@ class NFA:
     delta: Dict[Tuple[State, Symbol], Set[State]]
 
 
+_EMPTY: FrozenSet[State] = frozenset()
+
+
 def epsilon_closure(nfa: NFA, states: AbstractSet[State]) -> Set[State]:
     """
     Compute the ε-closure of a set of states in the NFA.
     Accepts any set-like (set/frozenset).
     """
+    rec = instrument.current()
+    if rec is not None:
+        rec.count("epsilon_closure.calls")
     closure: Set[State] = set(states)
     stack = list(states)
     while stack:
         s = stack.pop()
-        for t in nfa.delta.get((s, EPSILON), set()):
+        for t in nfa.delta.get((s, EPSILON), _EMPTY):
             if t not in closure:
                 closure.add(t)
                 stack.append(t)
@@ -39,58 +49,321 @@ def move(nfa: NFA, states: AbstractSet[State], symbol: Symbol) -> Set[State]:
     """
     nxt: Set[State] = set()
     for s in states:
-        nxt |= nfa.delta.get((s, symbol), set())
+        nxt.update(nfa.delta.get((s, symbol), _EMPTY))
     return nxt
 
 
-def to_dfa(nfa: NFA) -> DFA:
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indices of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class _Gather:
     """
-    Subset (powerset) construction from NFA (with ε) to equivalent DFA.
-    Internally represents DFA states as FrozenSet[State].
+    OR of `rows[i]` over the set bits i of a mask, one byte of the mask at
+    a time: the result for each (byte position, byte value) is memoized,
+    so a lookup costs one dict probe per non-zero byte rather than one
+    big-int operation per state. The memo is dropped when it reaches
+    `max_entries`.
+    """
+
+    __slots__ = ("rows", "memo", "max_entries")
+
+    def __init__(self, rows: Dict[int, int], max_entries: int = 1 << 16):
+        self.rows = rows
+        self.memo: Dict[int, int] = {}
+        self.max_entries = max_entries
+
+    def __call__(self, mask: int) -> int:
+        lo = ((mask & -mask).bit_length() - 1) >> 3
+        data = (mask >> (lo << 3)).to_bytes(((mask.bit_length() + 7) >> 3) - lo, "little")
+        memo = self.memo
+        out = 0
+        key = lo << 8
+        for byte in data:
+            if byte:
+                r = memo.get(key | byte)
+                if r is None:
+                    r = self._fill(key | byte)
+                out |= r
+            key += 256
+        return out
+
+    def _fill(self, key: int) -> int:
+        rows = self.rows
+        base = (key >> 8) << 3
+        r = 0
+        for i in iter_bits(key & 255):
+            r |= rows.get(base + i, 0)
+        if len(self.memo) >= self.max_entries:
+            self.memo.clear()
+        self.memo[key] = r
+        return r
+
+
+class BitsetNFA:
+    """
+    Indexed view of an NFA for set-at-a-time algorithms.
+
+    States are numbered 0..n-1 (`labels[i]` is the original state) and
+    sets of states are int bitmasks. Everything is ε-closed up front:
+    - `closure[i]`: ε-closure of state i (computed once per state)
+    - `succ[a]`: {i: ε-closed successors of i under a}, only for states
+      with an a-transition; `has[a]` is the mask of those states
+    - `start`: ε-closure of the start state; `accept`: accepting mask
+
+    `run` advances a mask over a whole input with bit-parallel steps.
+    """
+
+    def __init__(self, nfa: NFA):
+        labels: List[State] = [nfa.start]
+        index: Dict[State, int] = {nfa.start: 0}
+        for q in nfa.states:
+            if q not in index:
+                index[q] = len(labels)
+                labels.append(q)
+
+        def idx(q: State) -> int:
+            i = index.get(q)
+            if i is None:
+                i = index[q] = len(labels)
+                labels.append(q)
+            return i
+
+        symbols = sorted((a for a in nfa.alphabet if a != EPSILON), key=repr)
+        wanted = set(symbols)
+        eps: Dict[int, int] = {}
+        raw: Dict[Symbol, Dict[int, int]] = {a: {} for a in symbols}
+        for (s, a), targets in nfa.delta.items():
+            if a != EPSILON and a not in wanted:
+                continue
+            m = 0
+            for t in targets:
+                m |= 1 << idx(t)
+            out = eps if a == EPSILON else raw[a]
+            i = idx(s)
+            out[i] = out.get(i, 0) | m
+
+        n = len(labels)
+        closure: List[int] = [0] * n
+        for i in range(n):
+            c = 1 << i
+            stack = [i]
+            while stack:
+                for j in iter_bits(eps.get(stack.pop(), 0) & ~c):
+                    if closure[j]:
+                        c |= closure[j]
+                    else:
+                        c |= 1 << j
+                        stack.append(j)
+            closure[i] = c
+
+        succ: Dict[Symbol, Dict[int, int]] = {}
+        has: Dict[Symbol, int] = {}
+        for a in symbols:
+            row: Dict[int, int] = {}
+            h = 0
+            for i, m in raw[a].items():
+                r = 0
+                for j in iter_bits(m):
+                    r |= closure[j]
+                row[i] = r
+                h |= 1 << i
+            succ[a] = row
+            has[a] = h
+
+        self.labels = labels
+        self.index = index
+        self.symbols: List[Symbol] = symbols
+        self._raw = raw
+        self.closure = closure
+        self.succ = succ
+        self.has = has
+        self.start: int = closure[0]
+        self.accept: int = 0
+        for q in nfa.accept:
+            self.accept |= 1 << idx(q)
+
+        rec = instrument.current()
+        if rec is not None:
+            rec.count("epsilon_closure.calls", n)
+
+    def step(self, mask: int, symbol: Symbol) -> int:
+        """ε-closed successor set of `mask` under `symbol` (0 if none)."""
+        row = self.succ.get(symbol)
+        if row is None:
+            return 0
+        r = 0
+        for i in iter_bits(mask & self.has[symbol]):
+            r |= row[i]
+        return r
+
+    @cached_property
+    def _steps(self) -> Dict[Symbol, Tuple[int, int, Optional[_Gather]]]:
+        """
+        Per symbol a: (shift, other, gather). Raw a-moves i -> i + 1 (the
+        Shift-And case; Thompson numbering makes most character moves
+        look like this) are done with one shift of the masked set: states
+        in `shift` move to the next bit. The remaining states (`other`)
+        are looked up through `gather`.
+        """
+        steps: Dict[Symbol, Tuple[int, int, Optional[_Gather]]] = {}
+        for a in self.symbols:
+            shift = other = 0
+            rest: Dict[int, int] = {}
+            for i, m in self._raw[a].items():
+                if m == 2 << i:
+                    shift |= 1 << i
+                else:
+                    other |= 1 << i
+                    rest[i] = m
+            steps[a] = (shift, other, _Gather(rest) if rest else None)
+        return steps
+
+    @cached_property
+    def _close(self) -> Optional[_Gather]:
+        """ε-closure of a mask, or None if the NFA has no ε-moves."""
+        closure = self.closure
+        if all(c == 1 << i for i, c in enumerate(closure)):
+            return None
+        return _Gather(dict(enumerate(closure)))
+
+    def run(self, mask: int, input_symbols: Iterable[Symbol]) -> int:
+        """
+        Advance the (ε-closed) set `mask` over the input; returns the
+        final set, or 0 as soon as it becomes empty. Each step is a
+        shift for Shift-And moves plus byte-chunked, memoized lookups
+        for the other moves and the ε-closure, so matching is linear in
+        the input with no subset construction. Raises KeyError for a
+        symbol outside the alphabet unless the run died before it.
+        """
+        steps = self._steps
+        close = self._close
+        for a in input_symbols:
+            try:
+                shift, other, gather = steps[a]
+            except KeyError:
+                raise KeyError(f"Symbol {a!r} not in alphabet.") from None
+            t = (mask & shift) << 1
+            x = mask & other
+            if x and gather is not None:
+                t |= gather(x)
+            if close is not None and t:
+                t = close(t)
+            if not t:
+                return 0
+            mask = t
+        return mask
+
+    def states_of(self, mask: int) -> Set[State]:
+        """Original labels of the states in `mask`."""
+        return {self.labels[i] for i in iter_bits(mask)}
+
+
+def simulate_nfa(nfa: NFA, input_symbols: Iterable[Symbol]) -> bool:
+    """
+    Run the NFA directly on the input, without determinizing: the set of
+    active states is one int advanced by `BitsetNFA.run`, so the cost is
+    linear in the input for any NFA (no state explosion). Bytes-like
+    input is mapped to symbols like `CompiledDFA.simulate` does.
+    Returns True iff an accepting state is active at the end.
     """
-    # Start is ε-closure of NFA start
-    start_closure: FrozenSet[State] = frozenset(epsilon_closure(nfa, {nfa.start}))
+    from .compiled import byte_symbols
 
-    unmarked: list[FrozenSet[State]] = [start_closure]
-    dfa_states: Set[FrozenSet[State]] = {start_closure}
-    dfa_delta: Dict[Tuple[FrozenSet[State], Symbol], FrozenSet[State]] = {}
-    dfa_accept: Set[FrozenSet[State]] = set()
+    b = BitsetNFA(nfa)
+    if isinstance(input_symbols, (bytes, bytearray, memoryview)):
+        table = byte_symbols(b.symbols)
+        input_symbols = (table[x] if table[x] is not None else x for x in input_symbols)
+    return bool(b.run(b.start, input_symbols) & b.accept)
 
-    while unmarked:
-        S = unmarked.pop()
-        if any(s in nfa.accept for s in S):
-            dfa_accept.add(S)
 
-        for a in nfa.alphabet:
-            if a == EPSILON:
+def to_dfa(nfa: NFA, *, budget: Optional[Budget] = None) -> DFA:
+    """
+    Subset (powerset) construction from NFA (with ε) to equivalent DFA.
+    - ε-closures and per-symbol successor masks are computed once (BitsetNFA)
+    - Subsets are int bitmasks; only symbols with a transition out of a
+      subset are expanded
+    - Symbols with identical ε-closed successor rows form one class and
+      each subset is stepped once per class (see `langmachines.alphabet`)
+    - DFA states are named Q0, Q1, ... in BFS discovery order (Q0 = start)
+    - `budget` (or the ambient one, see `langmachines.budgets`) limits
+      subsets, time and memory; BudgetExceeded carries partial counts
+    """
+    from .alphabet import group_symbols
+
+    budget = budgets.resolve(budget)
+    rec = instrument.current()
+    with instrument.phase("to_dfa.closure"):
+        b = BitsetNFA(nfa)
+    classes = group_symbols(b.symbols, lambda a: frozenset(b.succ[a].items())).classes
+    rows = [(group, b.succ[group[0]], b.has[group[0]]) for group in classes]
+    t0 = time.perf_counter()
+    tick = rec.next_tick(0) if rec is not None else -1
+    max_states = budget.state_limit if budget is not None else -1
+    check = budget.check_every if budget is not None else -1
+
+    ids: Dict[int, int] = {b.start: 0}
+    masks: List[int] = [b.start]
+    names: List[str] = ["Q0"]
+    dfa_delta: Dict[Tuple[Hashable, Hashable], Hashable] = {}
+    head = 0
+    while head < len(masks):
+        S = masks[head]
+        src = names[head]
+        head += 1
+        if head == tick:
+            assert rec is not None
+            rec.tick("to_dfa", head, len(masks) - head)
+            tick = rec.next_tick(head)
+        if head == check:
+            assert budget is not None
+            budget.check("to_dfa", _subset_stats(head, masks, dfa_delta), _subset_memory(b, masks, dfa_delta))
+            check += budget.check_every
+        for group, row, has in rows:
+            m = S & has
+            if not m:
                 continue
-            # compute move + ε-closure; freeze to be a valid DFA state key
-            T_set = epsilon_closure(nfa, move(nfa, S, a))
-            if not T_set:
+            T = 0
+            for i in iter_bits(m):
+                T |= row[i]
+            if not T:
                 continue
-            T: FrozenSet[State] = frozenset(T_set)
-            dfa_delta[(S, a)] = T
-            if T not in dfa_states:
-                dfa_states.add(T)
-                unmarked.append(T)
-
-    # Give stable string names to each DFA state
-    state_names: Dict[FrozenSet[State], str] = {}
-    for i, S in enumerate(sorted(dfa_states, key=lambda ss: tuple(sorted(map(str, ss))))):
-        state_names[S] = f"Q{i}"
-
-    # Assemble DFA with Hashable-typed containers to satisfy DFA signature
-    new_states: Set[Hashable] = set(state_names.values())
-    new_start: Hashable = state_names[start_closure]
-    new_accept: Set[Hashable] = {state_names[S] for S in dfa_accept}
-    new_delta: Dict[Tuple[Hashable, Hashable], Hashable] = {}
-    for (S, a), T in dfa_delta.items():
-        new_delta[(state_names[S], a)] = state_names[T]
+            j = ids.get(T)
+            if j is None:
+                j = len(masks)
+                if j == max_states:
+                    assert budget is not None
+                    raise budget.exceeded("to_dfa", "states", _subset_stats(head, masks, dfa_delta))
+                ids[T] = j
+                masks.append(T)
+                names.append(f"Q{j}")
+            dst = names[j]
+            for a in group:
+                dfa_delta[(src, a)] = dst
 
+    if rec is not None:
+        rec.add_time("to_dfa.subsets", time.perf_counter() - t0)
+        rec.count("to_dfa.symbol_classes", len(rows))
+        rec.count("to_dfa.subsets", len(masks))
+        rec.count("to_dfa.transitions", len(dfa_delta))
+
+    new_accept: Set[Hashable] = {names[i] for i, S in enumerate(masks) if S & b.accept}
     return DFA(
-        states=new_states,
-        alphabet={a for a in nfa.alphabet if a != EPSILON},
-        start=new_start,
+        states=set(names),
+        alphabet=set(b.symbols),
+        start=names[0],
         accept=new_accept,
-        delta=new_delta,
+        delta=dfa_delta,
     )
+
+
+def _subset_stats(expanded: int, masks: List[int], delta: Dict[Tuple[Hashable, Hashable], Hashable]) -> budgets.Stats:
+    return {"states": len(masks), "expanded": expanded, "transitions": len(delta)}
+
+
+def _subset_memory(b: BitsetNFA, masks: List[int], delta: Dict[Tuple[Hashable, Hashable], Hashable]) -> int:
+    per_state = budgets.STATE_BYTES + (len(b.labels) + 7) // 8
+    return len(masks) * per_state + len(delta) * budgets.TRANSITION_BYTES
@@ -0,0 +1,250 @@
+"""
+Out-of-core subset construction for DFAs with millions of states.
+
+    c = to_dfa_file(nfa, "big.lmdfa", memory_limit=64 << 20)
+    c.simulate("...")              # CompiledDFA over an mmap of the file
+
+`to_dfa_file` computes the same DFA as `nfa.to_dfa` (states Q0, Q1, ...
+in BFS order) but keeps almost nothing in memory:
+- subset -> id interning lives in a scratch SQLite database (ids are
+  assigned in BFS order, so the queue of unexpanded subsets is simply
+  "ids >= head"); an LRU cache of recent subsets and the SQLite page
+  cache share what `memory_limit` leaves after the input NFA
+- rows of the transition table and the accepting flags are appended to
+  scratch files as states are expanded, then streamed into the binary
+  format (`langmachines.io.binary`) with implicit "Q{i}" state labels
+
+Only the BitsetNFA view of the input NFA is held in memory; if it takes
+more than half of `memory_limit`, BudgetExceeded is raised before
+anything is written.
+"""
+from __future__ import annotations
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import budgets, instrument
+from .budgets import Budget, BudgetExceeded
+from .compiled import DEAD, CompiledDFA
+from .io.binary import encode_implicit_labels, load_binary, write_binary_stream
+from .nfa import NFA, BitsetNFA, iter_bits
+
+# Rough in-memory cost of one LRU entry / SQLite row besides the mask itself.
+_ENTRY_OVERHEAD = 120
+_ROW_OVERHEAD = 40
+_COPY_CHUNK = 1 << 20
+
+PathLike = Union[str, "os.PathLike[str]"]
+# (successors by state, mask of states with successors, table columns) per symbol class
+Rows = List[Tuple[Dict[int, int], int, List[int]]]
+
+
+class _Interner:
+    """
+    Subset (int mask) -> id, backed by SQLite with an LRU front cache.
+    Masks are stored as little-endian blobs under their (deterministic)
+    int hash, so lookups go through a small integer index.
+    """
+
+    def __init__(self, path: str, cache_bytes: int, sqlite_bytes: int):
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=OFF")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute(f"PRAGMA cache_size={-max(sqlite_bytes // 1024, 1024)}")
+        self.db.execute("CREATE TABLE subsets (id INTEGER PRIMARY KEY, h INTEGER NOT NULL, mask BLOB NOT NULL)")
+        self.db.execute("CREATE INDEX subsets_h ON subsets (h)")
+        self.db.execute("BEGIN")
+        self.cache: OrderedDict[int, int] = OrderedDict()
+        self.cache_bytes = cache_bytes
+        self.sqlite_bytes = sqlite_bytes
+        self.used = 0
+        self.stored = 0
+        self.count = 0
+        self.lookups = 0
+
+    def intern(self, mask: int) -> Tuple[int, bool]:
+        """(id, is_new) of `mask`; new masks get the next id."""
+        j = self.cache.get(mask)
+        if j is not None:
+            self.cache.move_to_end(mask)
+            return j, False
+        self.lookups += 1
+        blob = _to_blob(mask)
+        h = hash(mask)
+        for j, stored in self.db.execute("SELECT id, mask FROM subsets WHERE h = ?", (h,)):
+            if stored == blob:
+                self._remember(mask, j)
+                return j, False
+        j = self.count
+        self.count += 1
+        self.db.execute("INSERT INTO subsets (id, h, mask) VALUES (?, ?, ?)", (j, h, blob))
+        self.stored += len(blob) + _ROW_OVERHEAD
+        self._remember(mask, j)
+        return j, True
+
+    def mask(self, j: int) -> int:
+        (blob,) = self.db.execute("SELECT mask FROM subsets WHERE id = ?", (j,)).fetchone()
+        return int.from_bytes(blob, "little")
+
+    def memory(self) -> int:
+        """Bytes held by the LRU cache plus (at most) SQLite's page cache."""
+        return self.used + min(self.stored, self.sqlite_bytes)
+
+    def _remember(self, mask: int, j: int) -> None:
+        self.cache[mask] = j
+        self.used += (mask.bit_length() >> 3) + _ENTRY_OVERHEAD
+        while self.used > self.cache_bytes and len(self.cache) > 1:
+            old, _ = self.cache.popitem(last=False)
+            self.used -= (old.bit_length() >> 3) + _ENTRY_OVERHEAD
+
+    def close(self) -> None:
+        self.db.execute("COMMIT")
+        self.db.close()
+
+
+def _to_blob(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) >> 3, "little")
+
+
+def to_dfa_file(
+    nfa: NFA,
+    path: PathLike,
+    *,
+    memory_limit: int = 64 << 20,
+    work_dir: Optional[PathLike] = None,
+    budget: Optional[Budget] = None,
+) -> CompiledDFA:
+    """
+    Subset construction written straight to a binary DFA file at `path`;
+    returns it mmap'ed (see `langmachines.io.binary.load_binary`).
+    - `memory_limit`: bytes for the BitsetNFA of the input plus the
+      subset cache and SQLite's page cache, which split what is left;
+      BudgetExceeded (resource "memory") if the NFA takes more than half
+    - `work_dir`: where the scratch database and files go (default: the
+      system temp dir); they are removed afterwards
+    - `budget` (or the ambient one) limits states, time, memory and
+      cancellation like for `to_dfa`
+    """
+    if memory_limit < 1 << 20:
+        raise ValueError("memory_limit must be at least 1 MiB.")
+    budget = budgets.resolve(budget)
+    rec = instrument.current()
+    t0 = time.perf_counter()
+    with instrument.phase("to_dfa.closure"):
+        b = BitsetNFA(nfa)
+    from .alphabet import group_symbols
+
+    symbols = b.symbols
+    k = len(symbols)
+    classes = group_symbols(symbols, lambda a: frozenset(b.succ[a].items())).classes
+    column = {a: c for c, a in enumerate(symbols)}
+    rows: Rows = [(b.succ[g[0]], b.has[g[0]], [column[a] for a in g]) for g in classes]
+    fixed = _nfa_memory(b)
+    if fixed > memory_limit // 2:
+        raise BudgetExceeded("to_dfa", "memory", memory_limit,
+                             {"states": 0, "nfa_states": len(b.labels), "memory_estimate": fixed})
+    caches = memory_limit - fixed
+
+    scratch = tempfile.mkdtemp(prefix="langmachines-", dir=None if work_dir is None else os.fspath(work_dir))
+    try:
+        interner = _Interner(os.path.join(scratch, "subsets.sqlite"), caches // 2, caches // 2)
+        table_path = os.path.join(scratch, "table.bin")
+        accept_path = os.path.join(scratch, "accept.bin")
+        try:
+            with open(table_path, "wb") as table_out, open(accept_path, "wb") as accept_out:
+                n = _expand(b, rows, k, interner, table_out, accept_out, fixed, budget, rec)
+        finally:
+            interner.close()
+        if rec is not None:
+            rec.add_time("to_dfa.subsets", time.perf_counter() - t0)
+            rec.count("to_dfa.subsets", n)
+            rec.count("to_dfa.sqlite_lookups", interner.lookups)
+
+        with open(path, "wb") as out, open(table_path, "rb") as table_in, open(accept_path, "rb") as accept_in:
+            write_binary_stream(
+                out,
+                n_states=n,
+                symbols=symbols,
+                start=0,
+                table=_chunks(table_in),
+                accepting=_chunks(accept_in),
+                states=encode_implicit_labels("Q", n),
+            )
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return load_binary(os.fspath(path))
+
+
+def _expand(
+    b: BitsetNFA,
+    rows: Rows,
+    k: int,
+    interner: _Interner,
+    table_out: BinaryIO,
+    accept_out: BinaryIO,
+    fixed: int,
+    budget: Optional[Budget],
+    rec: Optional[instrument.Recorder],
+) -> int:
+    """BFS over subsets; appends one table row and one accepting flag per state. Returns n."""
+    interner.intern(b.start)
+    max_states = budget.state_limit if budget is not None else -1
+    check = budget.check_every if budget is not None else -1
+    tick = rec.next_tick(0) if rec is not None else -1
+    accept = b.accept
+    big_endian = sys.byteorder == "big"
+    empty = array("i", [DEAD]) * k
+    head = 0
+    while head < interner.count:
+        S = interner.mask(head)
+        head += 1
+        if head == tick:
+            assert rec is not None
+            rec.tick("to_dfa", head, interner.count - head)
+            tick = rec.next_tick(head)
+        if head == check:
+            assert budget is not None
+            budget.check("to_dfa", {"states": interner.count, "expanded": head}, fixed + interner.memory())
+            check += budget.check_every
+        row = array("i", empty)
+        for succ, has, cols in rows:
+            m = S & has
+            if not m:
+                continue
+            T = 0
+            for i in iter_bits(m):
+                T |= succ[i]
+            if not T:
+                continue
+            j, new = interner.intern(T)
+            if new and j == max_states:
+                assert budget is not None
+                raise budget.exceeded("to_dfa", "states", {"states": j, "expanded": head})
+            for c in cols:
+                row[c] = j
+        if big_endian:
+            row.byteswap()
+        table_out.write(row.tobytes())
+        accept_out.write(b"\x01" if S & accept else b"\x00")
+    return interner.count
+
+
+def _nfa_memory(b: BitsetNFA) -> int:
+    """Rough bytes held by `b`: labels and closures, plus one mask per successor entry."""
+    mask = (len(b.labels) + 7) // 8
+    entries = sum(len(succ) for succ in b.succ.values())
+    return len(b.labels) * (budgets.STATE_BYTES + mask) + entries * (budgets.TRANSITION_BYTES + mask)
+
+
+def _chunks(f: BinaryIO) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(_COPY_CHUNK)
+        if not chunk:
+            return
+        yield chunk
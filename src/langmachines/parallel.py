@@ -0,0 +1,254 @@
+"""
+Multi-core matching with one copy of the transition table.
+
+The DFA is written once, in the binary format of `io.binary`, into a
+`multiprocessing.shared_memory` block. Pool workers attach to it by name
+and run directly on the shared pages (`io.binary.from_buffer`), so tasks
+only carry the inputs, never the DFA.
+
+    with ParallelMatcher(dfa, processes=8) as pm:
+        for ok in pm.match(lines):                  # ordered, streamed
+            ...
+        for path, lineno, line in pm.match_lines(["a.log", "b.log"]):
+            ...
+"""
+from __future__ import annotations
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory, util
+from types import TracebackType
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union,
+    TYPE_CHECKING,
+)
+
+from .compiled import ByteInput, CompiledDFA, simulate_many
+from .dfa import DFA, Symbol
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CHUNK_BYTES = 8 << 20
+# exitpriority of the finalizer that closes attached blocks; code holding
+# its own reference to an attached DFA should drop it from a finalizer
+# with a higher priority (those run first).
+DETACH_PRIORITY = 0
+
+
+class SharedDFA:
+    """
+    A DFA in the binary format inside a SharedMemory block (owner side).
+    Attach from any process with `attach(shared.name)`; the owner calls
+    `close()` (or uses `with`) to release and unlink the block.
+    """
+
+    def __init__(self, dfa: Union[DFA, CompiledDFA]):
+        from .io.binary import write_binary
+
+        buf = io.BytesIO()
+        write_binary(dfa, buf)
+        data = buf.getbuffer()
+        self.size = len(data)
+        shm = shared_memory.SharedMemory(create=True, size=self.size)
+        view = shm.buf
+        assert view is not None
+        view[:self.size] = data
+        self.name = shm.name
+        self._shm: Optional[shared_memory.SharedMemory] = shm
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+# Blocks attached in this process, kept open for as long as it lives.
+# Pool workers skip atexit, so they are closed by a multiprocessing
+# finalizer, which also runs at interpreter exit in the main process.
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, CompiledDFA]] = {}
+_worker_dfa: Optional[CompiledDFA] = None
+
+
+def attach(name: str) -> CompiledDFA:
+    """Zero-copy CompiledDFA over the SharedDFA block `name` (cached per process)."""
+    from .io.binary import from_buffer
+
+    if name not in _attached:
+        if not _attached:
+            util.Finalize(None, _detach_all, exitpriority=DETACH_PRIORITY)
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, from_buffer(shm.buf, verify=False))
+    return _attached[name][1]
+
+
+def _detach_all() -> None:
+    # Drop every CompiledDFA before closing, or the mapping still has views.
+    global _worker_dfa
+    _worker_dfa = None
+    while _attached:
+        _, (shm, _dfa) = _attached.popitem()
+        del _dfa
+        try:
+            shm.close()
+        except BufferError:  # still used elsewhere; unmapped at exit anyway
+            pass
+
+
+def _init_worker(name: str) -> None:
+    global _worker_dfa
+    _worker_dfa = attach(name)
+
+
+def worker_dfa() -> CompiledDFA:
+    """The shared DFA of the current pool worker."""
+    if _worker_dfa is None:
+        raise RuntimeError("Not running in a ParallelMatcher worker.")
+    return _worker_dfa
+
+
+def accepts_all(c: CompiledDFA, inputs: Sequence[Any]) -> List[bool]:
+    """simulate_many over `inputs`, with symbols outside the alphabet rejecting."""
+    try:
+        return [bool(x) for x in simulate_many(c, inputs)]
+    except KeyError:
+        out = []
+        for x in inputs:
+            try:
+                out.append(c.simulate(x))
+            except KeyError:
+                out.append(False)
+        return out
+
+
+def _match_batch(batch: List[Any]) -> List[bool]:
+    return accepts_all(worker_dfa(), batch)
+
+
+_RangeJob = Tuple[int, str, int, int, bool]  # (file index, path, start, end, invert)
+
+
+def _match_range(job: _RangeJob) -> Tuple[int, List[Tuple[int, bytes]], int]:
+    """
+    Match the lines of `path` that start in bytes [start, end).
+    Returns (file index, [(line index within the range, line)], number of lines).
+    """
+    index, path, start, end, invert = job
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        lo = 0 if start == 0 else mm.find(b"\n", start - 1) + 1 or size
+        hi = size if end >= size else mm.find(b"\n", end - 1) + 1 or size
+        block = mm[lo:hi]
+    lines = block.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    hits = accepts_all(worker_dfa(), lines)
+    return index, [(i, lines[i]) for i, hit in enumerate(hits) if hit != invert], len(lines)
+
+
+def ordered_results(
+    pool: ProcessPoolExecutor,
+    fn: Callable[[T], R],
+    jobs: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """
+    Like `pool.map(fn, jobs)`, but with at most `window` jobs in flight, so
+    `jobs` is consumed lazily and results stream back in order.
+    """
+    pending: Deque[Future[R]] = deque()
+    for job in jobs:
+        pending.append(pool.submit(fn, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ParallelMatcher:
+    """
+    A process pool whose workers share one DFA through shared memory.
+    - `match(inputs)`: accept/reject for each input, in order
+    - `match_lines(paths)`: matching lines of files, in order; each file
+      is split into byte ranges that workers mmap and read themselves
+    Symbols outside the alphabet reject (no KeyError).
+    """
+
+    def __init__(self, dfa: Union[DFA, CompiledDFA], *, processes: Optional[int] = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.shared = SharedDFA(dfa)
+        try:
+            self.pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.shared.name,))
+        except BaseException:
+            self.shared.close()
+            raise
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.shared.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def imap(self, fn: Callable[[T], R], jobs: Iterable[T], window: Optional[int] = None) -> Iterator[R]:
+        """Run `fn(job)` in the workers (use `worker_dfa()` there), streaming results in order."""
+        return ordered_results(self.pool, fn, jobs, window or 4 * self.processes)
+
+    def match(
+        self,
+        inputs: Iterable[Union[ByteInput, Sequence[Symbol]]],
+        *,
+        batch_size: int = 4096,
+    ) -> Iterator[bool]:
+        """Yield whether each input is accepted; inputs go to the workers in batches."""
+        it = iter(inputs)
+        batches = iter(lambda: list(islice(it, batch_size)), [])
+        for result in self.imap(_match_batch, batches):
+            yield from result
+
+    def match_lines(
+        self,
+        paths: Iterable[str],
+        *,
+        invert: bool = False,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> Iterator[Tuple[str, int, bytes]]:
+        """Yield (path, line number from 1, line without newline) for each matching line."""
+        paths = list(paths)
+        jobs = (
+            (index, path, start, start + chunk_bytes, invert)
+            for index, path in enumerate(paths)
+            for start in range(0, os.path.getsize(path), chunk_bytes)
+        )
+        lineno = [1] * len(paths)
+        for index, hits, n_lines in self.imap(_match_range, jobs):
+            base = lineno[index]
+            for i, line in hits:
+                yield paths[index], base + i, line
+            lineno[index] = base + n_lines
@@ -0,0 +1,353 @@
+from __future__ import annotations
+import string
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .algorithms.minimize import MinDFA, minimize_dfa
+from .compiled import CompiledDFA, compile_dfa
+from .dfa import State, Symbol
+from .nfa import EPSILON, NFA, to_dfa
+
+IGNORECASE = 1
+
+# Alphabet used for `.`, negated classes and \D \W \S when none is given.
+DEFAULT_ALPHABET: FrozenSet[str] = frozenset(string.printable)
+
+_DIGITS = frozenset(string.digits)
+_WORD = frozenset(string.ascii_letters + string.digits + "_")
+_SPACE = frozenset(" \t\n\r\f\v")
+_CLASS_ESCAPES = {"d": _DIGITS, "w": _WORD, "s": _SPACE}
+_CHAR_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class _Set(NamedTuple):
+    """One symbol from `chars` (or, if negated, from the alphabet minus `chars`)."""
+    chars: FrozenSet[str]
+    negated: bool
+
+
+class _Eps(NamedTuple):
+    """The empty word."""
+
+
+class _Cat(NamedTuple):
+    parts: List["Node"]
+
+
+class _Alt(NamedTuple):
+    parts: List["Node"]
+
+
+class _Repeat(NamedTuple):
+    """`node` followed by `op`, one of "*", "+", "?"."""
+    op: str
+    node: "Node"
+
+
+Node = Union[_Set, _Eps, _Cat, _Alt, _Repeat]
+
+
+class RegexError(ValueError):
+    """Invalid regular expression syntax; `pos` is the offending index."""
+
+    def __init__(self, msg: str, pattern: str, pos: int):
+        super().__init__(f"{msg} at position {pos} in {pattern!r}")
+        self.pattern = pattern
+        self.pos = pos
+
+
+class _Parser:
+    """
+    Recursive-descent parser:
+        alt    := concat ('|' concat)*
+        concat := repeat*
+        repeat := atom ('*' | '+' | '?')*
+        atom   := '(' alt ')' | '[' class ']' | '.' | '\\' escape | literal
+    """
+
+    def __init__(self, pattern: str):
+        self.p = pattern
+        self.i = 0
+        self.needs_alphabet = False
+        self.literals: Set[str] = set()
+
+    def error(self, msg: str, pos: Optional[int] = None) -> RegexError:
+        return RegexError(msg, self.p, self.i if pos is None else pos)
+
+    def parse(self) -> Node:
+        node = self.alt()
+        if self.i < len(self.p):
+            raise self.error("unbalanced parenthesis")
+        return node
+
+    def alt(self) -> Node:
+        parts = [self.concat()]
+        while self.i < len(self.p) and self.p[self.i] == "|":
+            self.i += 1
+            parts.append(self.concat())
+        return parts[0] if len(parts) == 1 else _Alt(parts)
+
+    def concat(self) -> Node:
+        parts: List[Node] = []
+        while self.i < len(self.p) and self.p[self.i] not in "|)":
+            parts.append(self.repeat())
+        if not parts:
+            return _Eps()
+        return parts[0] if len(parts) == 1 else _Cat(parts)
+
+    def repeat(self) -> Node:
+        node = self.atom()
+        while self.i < len(self.p) and self.p[self.i] in "*+?":
+            op = self.p[self.i]
+            self.i += 1
+            node = _Repeat(op, node)
+        return node
+
+    def atom(self) -> Node:
+        c = self.p[self.i]
+        if c == "(":
+            start = self.i
+            self.i += 1
+            node = self.alt()
+            if self.i >= len(self.p) or self.p[self.i] != ")":
+                raise self.error("missing ')'", start)
+            self.i += 1
+            return node
+        if c in "*+?":
+            raise self.error("nothing to repeat")
+        if c == "[":
+            return self.char_class()
+        if c == ".":
+            self.i += 1
+            self.needs_alphabet = True
+            return _Set(frozenset(), True)
+        if c == "\\":
+            chars, negated = self.escape()
+            return _Set(chars, negated)
+        self.reserved(c)
+        self.i += 1
+        self.literals.add(c)
+        return _Set(frozenset(c), False)
+
+    def reserved(self, c: str, pos: Optional[int] = None) -> None:
+        if c == EPSILON:
+            raise self.error(f"{EPSILON!r} is reserved for ε-moves and cannot be matched", pos)
+
+    def escape(self) -> Tuple[FrozenSet[str], bool]:
+        """Parse `\\x` at self.i; returns (chars, negated)."""
+        if self.i + 1 >= len(self.p):
+            raise self.error("bad escape (end of pattern)")
+        c = self.p[self.i + 1]
+        self.i += 2
+        if c.lower() in _CLASS_ESCAPES:
+            chars = _CLASS_ESCAPES[c.lower()]
+            if c.isupper():
+                self.needs_alphabet = True
+                return chars, True
+            self.literals |= chars
+            return chars, False
+        ch = _CHAR_ESCAPES.get(c, c)
+        if ch.isalnum():
+            raise self.error(f"bad escape \\{c}", self.i - 2)
+        self.literals.add(ch)
+        return frozenset(ch), False
+
+    def char_class(self) -> Node:
+        start = self.i
+        self.i += 1
+        negated = False
+        if self.i < len(self.p) and self.p[self.i] == "^":
+            negated = True
+            self.needs_alphabet = True
+            self.i += 1
+        chars: Set[str] = set()
+        first = True
+        while True:
+            if self.i >= len(self.p):
+                raise self.error("unterminated character set", start)
+            c = self.p[self.i]
+            if c == "]" and not first:
+                self.i += 1
+                break
+            first = False
+            if c == "\\":
+                esc, neg = self.escape()
+                if neg:
+                    raise self.error("negated class escape inside a set", self.i - 2)
+                if len(esc) > 1:
+                    chars |= esc
+                    continue
+                (lo,) = esc
+            else:
+                self.reserved(c)
+                lo = c
+                self.i += 1
+            if self.i + 1 < len(self.p) and self.p[self.i] == "-" and self.p[self.i + 1] != "]":
+                self.i += 1
+                if self.p[self.i] == "\\":
+                    esc, neg = self.escape()
+                    if neg or len(esc) != 1:
+                        raise self.error("bad character range", self.i - 2)
+                    (hi,) = esc
+                else:
+                    hi = self.p[self.i]
+                    self.i += 1
+                if ord(hi) < ord(lo):
+                    raise self.error(f"bad character range {lo}-{hi}")
+                if ord(lo) <= ord(EPSILON) <= ord(hi):
+                    raise self.error(f"character range {lo}-{hi} includes the reserved {EPSILON!r}")
+                chars.update(chr(x) for x in range(ord(lo), ord(hi) + 1))
+            else:
+                chars.add(lo)
+        if not negated:
+            self.literals |= chars
+        return _Set(frozenset(chars), negated)
+
+
+class _Thompson:
+    """Thompson construction: one (start, accept) fragment per AST node."""
+
+    def __init__(self, alphabet: FrozenSet[str], ignorecase: bool):
+        self.alphabet = alphabet
+        self.ignorecase = ignorecase
+        self.n = 0
+        self.delta: Dict[Tuple[State, Symbol], Set[State]] = {}
+
+    def new(self) -> int:
+        self.n += 1
+        return self.n - 1
+
+    def edge(self, s: int, a: Symbol, t: int) -> None:
+        self.delta.setdefault((s, a), set()).add(t)
+
+    def build(self, node: Node) -> Tuple[int, int]:
+        if isinstance(node, _Set):
+            chars = node.chars
+            if self.ignorecase:
+                chars = frozenset(chars | {c.lower() for c in chars} | {c.upper() for c in chars})
+            if node.negated:
+                chars = self.alphabet - chars
+            s, t = self.new(), self.new()
+            for c in chars & self.alphabet:
+                self.edge(s, c, t)
+            return s, t
+        if isinstance(node, _Eps):
+            s = self.new()
+            return s, s
+        if isinstance(node, _Cat):
+            s, t = self.build(node.parts[0])
+            for part in node.parts[1:]:
+                s2, t2 = self.build(part)
+                self.edge(t, EPSILON, s2)
+                t = t2
+            return s, t
+        if isinstance(node, _Alt):
+            s, t = self.new(), self.new()
+            for part in node.parts:
+                s2, t2 = self.build(part)
+                self.edge(s, EPSILON, s2)
+                self.edge(t2, EPSILON, t)
+            return s, t
+        s2, t2 = self.build(node.node)
+        s, t = self.new(), self.new()
+        self.edge(s, EPSILON, s2)
+        self.edge(t2, EPSILON, t)
+        if node.op in "*?":
+            self.edge(s, EPSILON, t)
+        if node.op in "*+":
+            self.edge(t2, EPSILON, s2)
+        return s, t
+
+
+class Pattern:
+    """
+    A compiled regular expression (always anchored: it describes a language).
+    - `nfa`: Thompson NFA over `alphabet` (states are ints)
+    - `dfa`: minimized DFA, built on first access
+    - `compiled`: dense-table CompiledDFA of `dfa`, built on first access
+    """
+
+    def __init__(self, pattern: str, flags: int, alphabet: FrozenSet[str], nfa: NFA):
+        self.pattern = pattern
+        self.flags = flags
+        self.alphabet = alphabet
+        self.nfa = nfa
+
+    def __repr__(self) -> str:
+        return f"langmachines.regex.compile({self.pattern!r}, flags={self.flags})"
+
+    @cached_property
+    def dfa(self) -> MinDFA:
+        return minimize_dfa(to_dfa(self.nfa))
+
+    @cached_property
+    def compiled(self) -> CompiledDFA:
+        return compile_dfa(self.dfa)
+
+    def fullmatch(self, text: Union[str, bytes, Iterable[Symbol]]) -> bool:
+        """True iff the whole text is in the language (symbols outside the alphabet never match)."""
+        try:
+            return self.compiled.simulate(text)
+        except KeyError:
+            return False
+
+
+_MAXCACHE = 512
+_cache: Dict[Tuple[str, int, Optional[FrozenSet[str]]], Pattern] = {}
+
+
+def compile(pattern: str, flags: int = 0, *, alphabet: Optional[Iterable[str]] = None) -> Pattern:
+    """
+    Compile a regex into a Pattern (Thompson NFA, DFA on demand).
+
+    Syntax: concatenation, `|`, `*`, `+`, `?`, `( )`, `.`, character
+    classes `[a-z]` / `[^...]`, escapes `\\d \\w \\s \\D \\W \\S \\n \\t ...`
+    and `\\` before any punctuation. Flags: IGNORECASE.
+
+    `alphabet` fixes the symbol set of the automaton. By default it is the
+    characters the pattern mentions, plus DEFAULT_ALPHABET (printable ASCII)
+    if `.`, a negated class or \\D \\W \\S is used.
+
+    Results are kept in a bounded in-process LRU cache keyed by
+    (pattern, flags, alphabet), so recompiling a rule set is free and the
+    lazily built DFA is shared. Use `purge()` to clear it.
+    """
+    key = (pattern, flags, frozenset(alphabet) if alphabet is not None else None)
+    p = _cache.pop(key, None)
+    if p is None:
+        p = _compile(pattern, flags, key[2])
+        if len(_cache) >= _MAXCACHE:
+            del _cache[next(iter(_cache))]  # least recently used
+    _cache[key] = p
+    return p
+
+
+def purge() -> None:
+    """Clear the compiled-pattern cache."""
+    _cache.clear()
+
+
+def _compile(pattern: str, flags: int, alphabet: Optional[FrozenSet[str]]) -> Pattern:
+    parser = _Parser(pattern)
+    ast = parser.parse()
+    ignorecase = bool(flags & IGNORECASE)
+    if alphabet is not None and EPSILON in alphabet:
+        raise ValueError(f"The alphabet contains {EPSILON!r}, which is reserved for ε-moves.")
+    if alphabet is None:
+        chars = set(parser.literals)
+        if parser.needs_alphabet:
+            chars |= DEFAULT_ALPHABET
+        if ignorecase:
+            chars |= {c.lower() for c in chars} | {c.upper() for c in chars}
+        alphabet = frozenset(c for c in chars if len(c) == 1 and c != EPSILON)
+
+    builder = _Thompson(alphabet, ignorecase)
+    start, accept = builder.build(ast)
+    nfa = NFA(
+        states=set(range(builder.n)),
+        alphabet=set(alphabet) | {EPSILON},
+        start=start,
+        accept={accept},
+        delta=builder.delta,
+    )
+    return Pattern(pattern, flags, alphabet, nfa)
@@ -0,0 +1,256 @@
+"""
+Multi-pattern search: every leftmost-longest, non-overlapping match of
+any of several patterns in a text.
+
+    s = Searcher([regex.compile("ab+").nfa, regex.compile("b+c").nfa])
+    s.findall("xabbbc")    # [Match(start=1, end=5, pattern_id=0)]
+
+Two automata are built once, over all patterns together:
+- a tagged forward DFA for L0 | L1 | ... (anchored): each state carries
+  the ids of the patterns whose accepting states it contains
+- a reverse DFA for Σ*·reverse(L0 | L1 | ...): run right to left over
+  the text in one pass, it accepts at i iff some match starts at i
+
+Then a forward scan tries the anchored DFA only at marked start
+positions, keeps the last accepting position (longest match) and
+resumes after it. Symbols outside every pattern's alphabet never match.
+
+A scan runs until the anchored DFA dies, which can be far past the
+match it reports (`a|a+b` over "aaaa..."). Scans from later starts that
+reach a (position, state) pair an earlier scan went through reuse its
+outcome, so the forward work is O(n·|forward states|) rather than O(n²).
+"""
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union, cast
+
+from . import budgets
+from .budgets import Budget
+from .compiled import DEAD, ByteInput, byte_symbols
+from .dfa import DFA, State, Symbol
+from .nfa import EPSILON, NFA, BitsetNFA, iter_bits
+
+Text = Union[str, ByteInput, Sequence[Symbol]]
+
+
+class Match(NamedTuple):
+    start: int
+    end: int        # exclusive
+    pattern_id: int  # lowest id among the patterns matching text[start:end]
+
+
+class _Tables:
+    """Dense subset-construction result: `table[q * width + column]`, DEAD = no move."""
+
+    def __init__(self, table: "array[int]", width: int, column: Dict[Symbol, int], masks: List[int]):
+        self.table = table
+        self.width = width
+        self.column = column
+        self.masks = masks
+
+
+class Searcher:
+    """
+    Compiled set of patterns (DFAs or NFAs; pattern_id = position).
+    - Empty matches are not reported
+    - When several patterns match the same longest span, the lowest
+      pattern id is reported
+    - `budget` (or the ambient one, see `langmachines.budgets`) limits
+      the construction of both automata
+    """
+
+    def __init__(self, patterns: Sequence[Union[DFA, NFA]], *, budget: Optional[Budget] = None):
+        if not patterns:
+            raise ValueError("Searcher needs at least one pattern.")
+        budget = budgets.resolve(budget)
+        forward, reverse = _union_nfas(patterns)
+        fb, rb = BitsetNFA(forward), BitsetNFA(reverse)
+        self._forward = _determinize(fb, unanchored=False, budget=budget)
+        self._reverse = _determinize(rb, unanchored=True, budget=budget)
+        self._reverse_accepting = bytes(1 if mask & rb.accept else 0 for mask in self._reverse.masks)
+        self.n_patterns = len(patterns)
+
+        # tag[q]: lowest pattern id accepting in forward state q (-1 if none)
+        accept_masks = [0] * len(patterns)
+        for label in forward.accept:
+            pid = cast(Tuple[int, State], label)[0]
+            accept_masks[pid] |= 1 << fb.index[label]
+        self._tag = [
+            next((pid for pid, m in enumerate(accept_masks) if mask & m), -1)
+            for mask in self._forward.masks
+        ]
+
+    @property
+    def forward_states(self) -> int:
+        return len(self._forward.masks)
+
+    @property
+    def reverse_states(self) -> int:
+        return len(self._reverse.masks)
+
+    def finditer(self, text: Text) -> Iterator[Match]:
+        """Leftmost-longest, non-overlapping matches of all patterns, in text order."""
+        symbols = _symbols_of(text, self._forward.column)
+        starts = self._starts(symbols)
+        fwd = self._forward
+        table, width, column = fwd.table, fwd.width, fwd.column
+        unknown = width - 1
+        cols = [column.get(a, unknown) for a in symbols]
+        tag = self._tag
+        nq = len(fwd.masks)
+        n = len(cols)
+        # memo[j * nq + q]: (end, pattern id) of the last accepting position
+        # at or after j of a scan in state q at j; (-1, -1) if there is none.
+        memo: Dict[int, Tuple[int, int]] = {}
+        prune_at = 1 << 12
+        i = 0
+        while i < n:
+            i = starts.find(1, i)
+            if i < 0:
+                return
+            q, j = 0, i
+            path: List[int] = []
+            best = (-1, -1)
+            while j < n:
+                q = table[q * width + cols[j]]
+                j += 1
+                if q < 0:
+                    break
+                key = j * nq + q
+                hit = memo.get(key)
+                if hit is not None:
+                    best = hit
+                    break
+                path.append(key)
+            # Fill the memo back to front: the last accepting position wins
+            for key in reversed(path):
+                if best[0] < 0:
+                    pos, state = divmod(key, nq)
+                    if tag[state] >= 0:
+                        best = (pos, tag[state])
+                memo[key] = best
+            end, pid = best
+            if end > i:
+                yield Match(i, end, pid)
+                i = end
+            else:
+                i += 1
+            if len(memo) > prune_at:
+                # Later scans start at i or after: earlier positions are never looked up again
+                memo = {key: v for key, v in memo.items() if key >= (i + 1) * nq}
+                prune_at = max(1 << 12, 2 * len(memo))
+
+    def findall(self, text: Text) -> List[Match]:
+        return list(self.finditer(text))
+
+    def _starts(self, symbols: Sequence[Symbol]) -> bytearray:
+        """starts[i] == 1 iff some (possibly empty) match starts at i: one right-to-left pass."""
+        rev = self._reverse
+        table, width, column, accepting = rev.table, rev.width, rev.column, self._reverse_accepting
+        unknown = width - 1
+        starts = bytearray(len(symbols))
+        q = 0
+        for i in range(len(symbols) - 1, -1, -1):
+            q = table[q * width + column.get(symbols[i], unknown)]
+            starts[i] = accepting[q]
+        return starts
+
+
+def search(patterns: Sequence[Union[DFA, NFA]], text: Text) -> List[Match]:
+    """One-shot `Searcher(patterns).findall(text)`."""
+    return Searcher(patterns).findall(text)
+
+
+def _as_nfa_delta(m: Union[DFA, NFA]) -> Dict[Tuple[State, Symbol], Set[State]]:
+    if isinstance(m, NFA):
+        return {k: set(v) for k, v in m.delta.items()}
+    return {k: {t} for k, t in m.delta.items()}
+
+
+def _union_nfas(patterns: Sequence[Union[DFA, NFA]]) -> Tuple[NFA, NFA]:
+    """
+    Forward union NFA (fresh start, ε to every pattern's start) and the
+    union of the reversed patterns (fresh start, ε to every accepting
+    state; accepting = the patterns' starts). States are (pid, state).
+    """
+    start = ("start",)
+    alphabet: Set[Symbol] = set()
+    states: Set[State] = {start}
+    fwd: Dict[Tuple[State, Symbol], Set[State]] = {(start, EPSILON): set()}
+    rev: Dict[Tuple[State, Symbol], Set[State]] = {(start, EPSILON): set()}
+    fwd_accept: Set[State] = set()
+    rev_accept: Set[State] = set()
+    for pid, m in enumerate(patterns):
+        alphabet |= m.alphabet - {EPSILON}
+        states.update((pid, q) for q in m.states)
+        fwd[(start, EPSILON)].add((pid, m.start))
+        rev_accept.add((pid, m.start))
+        for q in m.accept:
+            fwd_accept.add((pid, q))
+            rev[(start, EPSILON)].add((pid, q))
+        for (s, a), targets in _as_nfa_delta(m).items():
+            fwd.setdefault(((pid, s), a), set()).update((pid, t) for t in targets)
+            for t in targets:
+                rev.setdefault(((pid, t), a), set()).add((pid, s))
+    sigma = alphabet | {EPSILON}
+    return (
+        NFA(states=set(states), alphabet=sigma, start=start, accept=fwd_accept, delta=fwd),
+        NFA(states=set(states), alphabet=sigma, start=start, accept=rev_accept, delta=rev),
+    )
+
+
+def _determinize(b: BitsetNFA, *, unanchored: bool, budget: Optional[Budget]) -> _Tables:
+    """
+    Subset construction into a dense table with one column per symbol
+    class plus a last column for symbols outside the alphabet. With
+    `unanchored`, the start set is added to every successor (a Σ* prefix)
+    and unknown symbols go back to the start state.
+    """
+    from .alphabet import group_symbols
+
+    classes = group_symbols(b.symbols, lambda a: frozenset(b.succ[a].items())).classes
+    column = {a: c for c, group in enumerate(classes) for a in group}
+    rows = [(b.succ[group[0]], b.has[group[0]]) for group in classes]
+    width = len(rows) + 1
+    extra = b.start if unanchored else 0
+
+    ids: Dict[int, int] = {b.start: 0}
+    masks: List[int] = [b.start]
+    table = array("i")
+    max_states = budget.state_limit if budget is not None else -1
+    check = budget.check_every if budget is not None else -1
+    head = 0
+    while head < len(masks):
+        S = masks[head]
+        head += 1
+        if head == check:
+            assert budget is not None
+            memory = len(masks) * (budgets.STATE_BYTES + (len(b.labels) + 7) // 8) + 4 * len(table)
+            budget.check("search", {"states": len(masks), "expanded": head}, memory)
+            check += budget.check_every
+        for row, has in rows:
+            T = extra
+            for i in iter_bits(S & has):
+                T |= row[i]
+            if not T:
+                table.append(DEAD)
+                continue
+            j = ids.get(T)
+            if j is None:
+                j = len(masks)
+                if j == max_states:
+                    assert budget is not None
+                    raise budget.exceeded("search", "states", {"states": j, "expanded": head})
+                ids[T] = j
+                masks.append(T)
+            table.append(j)
+        table.append(0 if unanchored else DEAD)
+    return _Tables(table, width, column, masks)
+
+
+def _symbols_of(text: Text, column: Dict[Symbol, int]) -> Sequence[Symbol]:
+    """The text as a sequence of symbols (bytes map through `byte_symbols`)."""
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        table = byte_symbols(column)
+        return [table[x] for x in text]
+    return text if isinstance(text, (str, list, tuple)) else list(text)
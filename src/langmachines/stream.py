@@ -0,0 +1,184 @@
+from __future__ import annotations
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Iterable, Iterator, Protocol, Union
+
+from .compiled import ByteInput, compile_dfa
+from .dfa import DFA, Symbol
+
+Source = Union[str, "os.PathLike[str]", BinaryIO]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class Runner(Protocol):
+    """
+    What DFAMatcher needs from an automaton (CompiledDFA, LazyDFA):
+    integer run states, one of which (`dead_state`) is absorbing and rejecting.
+    """
+
+    @property
+    def start(self) -> int: ...
+
+    @property
+    def dead_state(self) -> int: ...
+
+    def advance(self, q: int, input_symbols: Any) -> int: ...
+
+    def is_accepting(self, q: int) -> bool: ...
+
+
+@dataclass(frozen=True)
+class MatcherSnapshot:
+    """Opaque, immutable position of a DFAMatcher run."""
+    state: int
+    consumed: int
+
+
+class DFAMatcher:
+    """
+    Incremental (streaming) DFA run over a compiled transition table
+    (or any other Runner, e.g. a LazyDFA).
+
+    Feed the input in any number of chunks, then call `finish()`:
+
+        m = DFAMatcher(dfa)
+        for chunk in chunks:
+            m.feed(chunk)
+            if m.dead:
+                break
+        accepted = m.finish()
+
+    The run can be paused with `snapshot()` and resumed later (or forked)
+    with `restore()`. Memory use is constant in the input length.
+    """
+
+    def __init__(self, dfa: Union[DFA, Runner]):
+        self.dfa: Runner = compile_dfa(dfa) if isinstance(dfa, DFA) else dfa
+        self.state = self.dfa.start
+        self.consumed = 0
+
+    @property
+    def dead(self) -> bool:
+        """True once a missing transition was taken; the run can only reject."""
+        return self.state == self.dfa.dead_state
+
+    @property
+    def accepting(self) -> bool:
+        """Whether the input fed so far is accepted."""
+        return self.dfa.is_accepting(self.state)
+
+    def feed(self, chunk: Union[ByteInput, Iterable[Symbol]]) -> None:
+        """
+        Consume one chunk (str, bytes-like or a sequence of symbols).
+        On KeyError (symbol outside the alphabet) the matcher keeps the
+        state it had before this chunk.
+        """
+        if self.state == self.dfa.dead_state:
+            return
+        if not isinstance(chunk, (str, bytes, bytearray, memoryview)):
+            chunk = list(chunk)
+        self.state = self.dfa.advance(self.state, chunk)
+        self.consumed += len(chunk)
+
+    def finish(self) -> bool:
+        """Return True iff everything fed so far is accepted."""
+        return self.accepting
+
+    def reset(self) -> None:
+        self.state = self.dfa.start
+        self.consumed = 0
+
+    def snapshot(self) -> MatcherSnapshot:
+        return MatcherSnapshot(self.state, self.consumed)
+
+    def restore(self, snap: MatcherSnapshot) -> None:
+        self.state = snap.state
+        self.consumed = snap.consumed
+
+    def feed_file(
+        self,
+        source: Source,
+        *,
+        use_mmap: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Feed a whole file (path or binary file object) chunk by chunk.
+        Stops reading as soon as the run is dead.
+        """
+        for chunk in iter_chunks(source, use_mmap=use_mmap, chunk_size=chunk_size):
+            self.feed(chunk)
+            if self.state == self.dfa.dead_state:
+                break
+
+
+def iter_chunks(
+    source: Source,
+    *,
+    use_mmap: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[memoryview]:
+    """
+    Yield a file's contents as `memoryview` chunks of at most `chunk_size`
+    bytes, without copying the file into memory.
+    - Paths are `mmap`ed (if `use_mmap`) and sliced in place; otherwise
+      read with `readinto` into one reused buffer
+    - File objects are always read with `readinto` (or `read`)
+    Each chunk is only valid until the next one is requested.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb", buffering=0) as f:
+            if use_mmap and os.fstat(f.fileno()).st_size > 0:
+                yield from _iter_mmap(f, chunk_size)
+            else:
+                yield from _iter_readinto(f, chunk_size)
+    else:
+        yield from _iter_readinto(source, chunk_size)
+
+
+def _iter_mmap(f: BinaryIO, chunk_size: int) -> Iterator[memoryview]:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            for i in range(0, len(view), chunk_size):
+                chunk = view[i:i + chunk_size]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()  # mmap can only close once all views are gone
+
+
+def _iter_readinto(f: BinaryIO, chunk_size: int) -> Iterator[memoryview]:
+    buf = bytearray(chunk_size)
+    with memoryview(buf) as view:
+        readinto = getattr(f, "readinto", None)
+        while True:
+            if readinto is not None:
+                n = readinto(view)
+            else:
+                data = f.read(chunk_size)
+                n = len(data)
+                view[:n] = data
+            if not n:
+                break
+            chunk = view[:n]
+            try:
+                yield chunk
+            finally:
+                chunk.release()
+
+
+def match_file(
+    dfa: Union[DFA, Runner],
+    source: Source,
+    *,
+    use_mmap: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bool:
+    """Return True iff the DFA accepts the whole file as one byte string."""
+    m = DFAMatcher(dfa)
+    m.feed_file(source, use_mmap=use_mmap, chunk_size=chunk_size)
+    return m.finish()
@@ -0,0 +1,412 @@
+"""
+Symbolic automata over code points: transitions carry interval sets
+(`CharSet`) instead of single symbols, so an automaton over all of Unicode
+needs one entry per interval, not per character.
+
+- `SymbolicNFA` / `SymbolicDFA`: states plus guarded moves
+  `transitions[s] = ((guard, target), ...)`; DFA guards are disjoint
+- `determinize(nfa)`: subset construction, sweeping the guard boundaries
+  of each subset (no per-character work)
+- `minimize(dfa)`: Hopcroft over minterms, the elementary intervals
+  between all guard boundaries
+- `SymbolicDFA.simulate(text)`: one binary search per character over the
+  sorted interval starts of the current state
+"""
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .algorithms.minimize import hopcroft_refine
+from .dfa import DFA, State, Symbol
+from .nfa import EPSILON, NFA
+
+MAX_CODE = 0x110000  # one past the largest code point
+
+Char = Union[str, int]
+Move = Tuple["CharSet", State]
+
+
+def _code(c: Char) -> int:
+    return c if isinstance(c, int) else ord(c)
+
+
+@dataclass(frozen=True)
+class CharSet:
+    """
+    Set of code points as sorted, disjoint, non-adjacent half-open
+    intervals [lo, hi). Build with `of`, `interval` or `any`; combine with
+    `|`, `&`, `-` and `~` (complement within [0, MAX_CODE)).
+    """
+    ranges: Tuple[Tuple[int, int], ...] = ()
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Tuple[int, int]]) -> CharSet:
+        """Normalize arbitrary [lo, hi) ranges (sorted, merged, empties dropped)."""
+        out: List[Tuple[int, int]] = []
+        for lo, hi in sorted(r for r in ranges if r[0] < r[1]):
+            if out and lo <= out[-1][1]:
+                if hi > out[-1][1]:
+                    out[-1] = (out[-1][0], hi)
+            else:
+                out.append((lo, hi))
+        return cls(tuple(out))
+
+    @classmethod
+    def of(cls, chars: Iterable[Char]) -> CharSet:
+        return cls.from_ranges((c, c + 1) for c in map(_code, chars))
+
+    @classmethod
+    def interval(cls, lo: Char, hi: Char) -> CharSet:
+        """Characters lo..hi, both included."""
+        return cls.from_ranges([(_code(lo), _code(hi) + 1)])
+
+    @classmethod
+    def any(cls) -> CharSet:
+        return cls(((0, MAX_CODE),))
+
+    @cached_property
+    def _starts(self) -> List[int]:
+        return [lo for lo, _ in self.ranges]
+
+    def __contains__(self, c: object) -> bool:
+        if not isinstance(c, (str, int)) or (isinstance(c, str) and len(c) != 1):
+            return False
+        cp = _code(c)
+        i = bisect_right(self._starts, cp) - 1
+        return i >= 0 and cp < self.ranges[i][1]
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    def __len__(self) -> int:
+        return sum(hi - lo for lo, hi in self.ranges)
+
+    def __or__(self, other: CharSet) -> CharSet:
+        return CharSet.from_ranges(self.ranges + other.ranges)
+
+    def __and__(self, other: CharSet) -> CharSet:
+        out: List[Tuple[int, int]] = []
+        a, b = self.ranges, other.ranges
+        i = j = 0
+        while i < len(a) and j < len(b):
+            lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+            if lo < hi:
+                out.append((lo, hi))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return CharSet(tuple(out))
+
+    def __invert__(self) -> CharSet:
+        out: List[Tuple[int, int]] = []
+        prev = 0
+        for lo, hi in self.ranges:
+            if prev < lo:
+                out.append((prev, lo))
+            prev = hi
+        if prev < MAX_CODE:
+            out.append((prev, MAX_CODE))
+        return CharSet(tuple(out))
+
+    def __sub__(self, other: CharSet) -> CharSet:
+        return self & ~other
+
+    def __repr__(self) -> str:
+        def show(cp: int) -> str:
+            ch = chr(cp)
+            return ch if ch.isprintable() and ch not in "-\\]" else f"\\u{cp:04x}"
+
+        parts = [show(lo) if hi == lo + 1 else f"{show(lo)}-{show(hi - 1)}" for lo, hi in self.ranges]
+        return f"CharSet('{''.join(parts)}')"
+
+
+@dataclass(frozen=True)
+class SymbolicNFA:
+    states: Set[State]
+    start: State
+    accept: Set[State]
+    transitions: Dict[State, Tuple[Move, ...]]
+    epsilon: Dict[State, Set[State]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SymbolicDFA:
+    """Partial DFA with disjoint guards per state; a character no guard covers rejects."""
+    states: Set[State]
+    start: State
+    accept: Set[State]
+    transitions: Dict[State, Tuple[Move, ...]]
+
+    @cached_property
+    def _tables(self) -> Dict[State, Tuple[List[int], List[int], List[State]]]:
+        """Per state: interval starts, ends and targets, sorted by start."""
+        tables = {}
+        for s, moves in self.transitions.items():
+            segs = sorted((lo, hi, t) for guard, t in moves for lo, hi in guard.ranges)
+            for (_, hi, _), (lo, _, _) in zip(segs, segs[1:]):
+                if lo < hi:
+                    raise ValueError(f"Overlapping guards on state {s!r}.")
+            tables[s] = ([x[0] for x in segs], [x[1] for x in segs], [x[2] for x in segs])
+        return tables
+
+    def step(self, q: State, c: Char) -> Optional[State]:
+        """Successor of q on character c (None if no guard covers it)."""
+        table = self._tables.get(q)
+        if table is None:
+            return None
+        starts, ends, targets = table
+        cp = _code(c)
+        i = bisect_right(starts, cp) - 1
+        if i >= 0 and cp < ends[i]:
+            return targets[i]
+        return None
+
+    def simulate(self, text: Iterable[Char]) -> bool:
+        tables = self._tables
+        q = self.start
+        for c in text:
+            table = tables.get(q)
+            if table is None:
+                return False
+            starts, ends, targets = table
+            cp = _code(c)
+            i = bisect_right(starts, cp) - 1
+            if i < 0 or cp >= ends[i]:
+                return False
+            q = targets[i]
+        return q in self.accept
+
+    def to_dfa(self, alphabet: Iterable[Char]) -> DFA:
+        """Plain DFA over a finite alphabet (characters as given, e.g. str)."""
+        symbols = list(alphabet)
+        delta: Dict[Tuple[State, Symbol], State] = {}
+        for s in self.states:
+            for a in symbols:
+                t = self.step(s, a)
+                if t is not None:
+                    delta[(s, a)] = t
+        return DFA(states=set(self.states), alphabet=set(symbols), start=self.start,
+                   accept=set(self.accept), delta=delta)
+
+
+def from_dfa(dfa: DFA) -> SymbolicDFA:
+    """SymbolicDFA of a DFA over characters (1-char str or int code points)."""
+    grouped: Dict[State, Dict[State, List[int]]] = {}
+    for (s, a), t in dfa.delta.items():
+        if not isinstance(a, (str, int)) or (isinstance(a, str) and len(a) != 1):
+            raise ValueError(f"Symbol {a!r} is not a character.")
+        grouped.setdefault(s, {}).setdefault(t, []).append(_code(a))
+    transitions = {
+        s: tuple((CharSet.of(cps), t) for t, cps in by_target.items())
+        for s, by_target in grouped.items()
+    }
+    return SymbolicDFA(states=set(dfa.states), start=dfa.start, accept=set(dfa.accept), transitions=transitions)
+
+
+def from_nfa(nfa: NFA) -> SymbolicNFA:
+    """SymbolicNFA of an NFA over characters (EPSILON moves become `epsilon`)."""
+    grouped: Dict[State, Dict[State, List[int]]] = {}
+    epsilon: Dict[State, Set[State]] = {}
+    for (s, a), ts in nfa.delta.items():
+        if a == EPSILON:
+            epsilon.setdefault(s, set()).update(ts)
+            continue
+        if not isinstance(a, (str, int)) or (isinstance(a, str) and len(a) != 1):
+            raise ValueError(f"Symbol {a!r} is not a character.")
+        for t in ts:
+            grouped.setdefault(s, {}).setdefault(t, []).append(_code(a))
+    transitions = {
+        s: tuple((CharSet.of(cps), t) for t, cps in by_target.items())
+        for s, by_target in grouped.items()
+    }
+    return SymbolicNFA(states=set(nfa.states), start=nfa.start, accept=set(nfa.accept),
+                       transitions=transitions, epsilon=epsilon)
+
+
+def _sweep(moves: Iterable[Tuple[CharSet, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Split guarded moves (target as a bitmask) at all their boundaries:
+    returns [(lo, hi, union of the targets enabled on [lo, hi))].
+    """
+    events: Dict[int, List[Tuple[int, int]]] = {}
+    for guard, m in moves:
+        for lo, hi in guard.ranges:
+            events.setdefault(lo, []).append((1, m))
+            events.setdefault(hi, []).append((-1, m))
+    active: Dict[int, int] = {}
+    out: List[Tuple[int, int, int]] = []
+    points = sorted(events)
+    for p, nxt in zip(points, points[1:] + [MAX_CODE]):
+        for d, m in events[p]:
+            c = active.get(m, 0) + d
+            if c:
+                active[m] = c
+            else:
+                del active[m]
+        if active and p < nxt:
+            T = 0
+            for m in active:
+                T |= m
+            if out and out[-1][1] == p and out[-1][2] == T:
+                out[-1] = (out[-1][0], nxt, T)
+            else:
+                out.append((p, nxt, T))
+    return out
+
+
+def _group(segments: Iterable[Tuple[int, int, State]]) -> Tuple[Move, ...]:
+    by_target: Dict[State, List[Tuple[int, int]]] = {}
+    for lo, hi, t in segments:
+        by_target.setdefault(t, []).append((lo, hi))
+    return tuple((CharSet.from_ranges(r), t) for t, r in by_target.items())
+
+
+def determinize(nfa: SymbolicNFA) -> SymbolicDFA:
+    """
+    Subset construction; DFA states are named Q0, Q1, ... in BFS order
+    (Q0 = start), like `to_dfa`. Each subset's moves come from one sweep
+    over the guard boundaries of its members, so the cost depends on the
+    number of intervals, not on the alphabet size.
+    """
+    labels: List[State] = [nfa.start]
+    index: Dict[State, int] = {nfa.start: 0}
+    for q in nfa.states:
+        if q not in index:
+            index[q] = len(labels)
+            labels.append(q)
+
+    def idx(q: State) -> int:
+        if q not in index:
+            index[q] = len(labels)
+            labels.append(q)
+        return index[q]
+
+    for s, ts in nfa.epsilon.items():
+        idx(s)
+        for t in ts:
+            idx(t)
+    for s, moves in nfa.transitions.items():
+        idx(s)
+        for _, t in moves:
+            idx(t)
+    n = len(labels)
+
+    closure: List[int] = []
+    for i in range(n):
+        c = 1 << i
+        stack = [labels[i]]
+        while stack:
+            for t in nfa.epsilon.get(stack.pop(), ()):
+                if not c >> index[t] & 1:
+                    c |= 1 << index[t]
+                    stack.append(t)
+        closure.append(c)
+    out: List[List[Tuple[CharSet, int]]] = [[] for _ in range(n)]
+    for s, ms in nfa.transitions.items():
+        out[index[s]] = [(g, closure[index[t]]) for g, t in ms if g]
+    accept = 0
+    for q in nfa.accept:
+        accept |= 1 << idx(q)
+
+    start = closure[0]
+    ids: Dict[int, int] = {start: 0}
+    masks: List[int] = [start]
+    transitions: Dict[State, Tuple[Move, ...]] = {}
+    head = 0
+    while head < len(masks):
+        S = masks[head]
+        members: List[Tuple[CharSet, int]] = []
+        rest = S
+        while rest:
+            low = rest & -rest
+            members.extend(out[low.bit_length() - 1])
+            rest ^= low
+        segs = []
+        for lo, hi, T in _sweep(members):
+            j = ids.get(T)
+            if j is None:
+                j = ids[T] = len(masks)
+                masks.append(T)
+            segs.append((lo, hi, f"Q{j}"))
+        if segs:
+            transitions[f"Q{head}"] = _group(segs)
+        head += 1
+
+    names = [f"Q{i}" for i in range(len(masks))]
+    return SymbolicDFA(
+        states=set(names),
+        start="Q0",
+        accept={names[i] for i, S in enumerate(masks) if S & accept},
+        transitions=transitions,
+    )
+
+
+def minimize(dfa: SymbolicDFA) -> SymbolicDFA:
+    """
+    Minimal partial SymbolicDFA for the same language. The alphabet is
+    cut into minterms (elementary intervals between all guard boundaries
+    of reachable states) and refined with the Hopcroft of `minimize_dfa`;
+    each block is represented by its first state in BFS order, and the
+    dead block (if any) is dropped.
+    """
+    tables = dfa._tables
+    index: Dict[State, int] = {dfa.start: 0}
+    labels: List[State] = [dfa.start]
+    head = 0
+    while head < len(labels):
+        for t in tables.get(labels[head], ((), (), ()))[2]:
+            if t not in index:
+                index[t] = len(labels)
+                labels.append(t)
+        head += 1
+    n_orig = len(labels)
+
+    point_set = {0, MAX_CODE}
+    for s in labels:
+        starts, ends, _ = tables.get(s, ((), (), ()))
+        point_set.update(starts)
+        point_set.update(ends)
+    points = sorted(point_set)
+    minterm = {p: i for i, p in enumerate(points)}
+    k = len(points) - 1
+
+    n = n_orig + 1  # state n_orig is the sink
+    succ = [n_orig] * (n * k)
+    for q, s in enumerate(labels):
+        starts, ends, targets = tables.get(s, ((), (), ()))
+        row = q * k
+        for lo, hi, t in zip(starts, ends, targets):
+            tq = index[t]
+            for c in range(minterm[lo], minterm[hi]):
+                succ[row + c] = tq
+    is_acc = [q < n_orig and labels[q] in dfa.accept for q in range(n)]
+    block = hopcroft_refine(n, k, succ, is_acc)
+
+    dead = block[n_orig]
+    rep: Dict[int, int] = {}
+    for q in range(n_orig):
+        rep.setdefault(block[q], q)
+    states = {labels[r] for b, r in rep.items() if b != dead}
+    transitions: Dict[State, Tuple[Move, ...]] = {}
+    for b, r in rep.items():
+        if b == dead:
+            continue
+        row = r * k
+        segs = []
+        for c in range(k):
+            tb = block[succ[row + c]]
+            if tb != dead:
+                segs.append((points[c], points[c + 1], labels[rep[tb]]))
+        if segs:
+            transitions[labels[r]] = _group(segs)
+    start = labels[rep[block[0]]]
+    states.add(start)  # kept even when the language is empty
+    return SymbolicDFA(
+        states=states,
+        start=start,
+        accept={s for s in states if s in dfa.accept},
+        transitions=transitions,
+    )
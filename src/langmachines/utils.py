@@ -0,0 +1,130 @@
+"""
+Seeded generators of automata and inputs, for tests and benchmarks.
+
+All generators take a `seed` and are deterministic for a given seed and
+Python version. States are the ints 0..n-1 (start 0); symbols are
+"a", "b", ... ("a0", "a1", ... beyond 26 symbols).
+"""
+from __future__ import annotations
+import random
+import string
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .dfa import DFA, State, Symbol
+from .nfa import EPSILON, NFA
+
+
+def symbols(k: int) -> List[str]:
+    """The first k symbols used by the generators."""
+    if k <= 26:
+        return list(string.ascii_lowercase[:k])
+    return [f"a{i}" for i in range(k)]
+
+
+def random_dfa(
+    n: int,
+    k: int,
+    *,
+    density: float = 1.0,
+    accept_ratio: float = 0.5,
+    seed: Optional[int] = 0,
+) -> DFA:
+    """
+    Random DFA with n states over k symbols.
+    - `density`: probability that a (state, symbol) pair has a transition
+      (1.0 gives a total DFA)
+    - `accept_ratio`: probability that a state is accepting
+    """
+    if n < 1:
+        raise ValueError("A DFA needs at least one state.")
+    rng = random.Random(seed)
+    alphabet = symbols(k)
+    delta: Dict[Tuple[State, Symbol], State] = {}
+    for s in range(n):
+        for a in alphabet:
+            if density >= 1.0 or rng.random() < density:
+                delta[(s, a)] = rng.randrange(n)
+    accept: Set[State] = {s for s in range(n) if rng.random() < accept_ratio}
+    return DFA(states=set(range(n)), alphabet=set(alphabet), start=0, accept=accept, delta=delta)
+
+
+def random_nfa(
+    n: int,
+    k: int,
+    *,
+    density: float = 1.0,
+    epsilon_ratio: float = 0.0,
+    accept_ratio: float = 0.5,
+    seed: Optional[int] = 0,
+) -> NFA:
+    """
+    Random NFA with n states over k symbols (plus ε).
+    - `density`: expected number of targets per (state, symbol) pair
+    - `epsilon_ratio`: probability that a generated transition is an
+      ε-move instead of a labelled one
+    - `accept_ratio`: probability that a state is accepting
+    """
+    if n < 1:
+        raise ValueError("An NFA needs at least one state.")
+    rng = random.Random(seed)
+    alphabet = symbols(k)
+    whole, frac = int(density), density - int(density)
+    delta: Dict[Tuple[State, Symbol], Set[State]] = {}
+    for s in range(n):
+        for a in alphabet:
+            for _ in range(whole + (rng.random() < frac)):
+                label = EPSILON if rng.random() < epsilon_ratio else a
+                delta.setdefault((s, label), set()).add(rng.randrange(n))
+    accept: Set[State] = {s for s in range(n) if rng.random() < accept_ratio}
+    return NFA(
+        states=set(range(n)),
+        alphabet=set(alphabet) | ({EPSILON} if epsilon_ratio > 0 else set()),
+        start=0,
+        accept=accept,
+        delta=delta,
+    )
+
+
+def nth_from_end_nfa(n: int, alphabet: Sequence[Symbol] = ("a", "b")) -> NFA:
+    """
+    NFA with n + 1 states for "the n-th symbol from the end is alphabet[0]".
+    Its minimal DFA has 2**n states: the worst case of subset construction.
+    """
+    if n < 1:
+        raise ValueError("n must be at least 1.")
+    first = alphabet[0]
+    delta: Dict[Tuple[State, Symbol], Set[State]] = {(0, a): {0} for a in alphabet}
+    delta[(0, first)].add(1)
+    for i in range(1, n):
+        for a in alphabet:
+            delta[(i, a)] = {i + 1}
+    return NFA(states=set(range(n + 1)), alphabet=set(alphabet), start=0, accept={n}, delta=delta)
+
+
+def cycle_dfa(n: int) -> DFA:
+    """
+    One n-cycle on "a" ("b" loops) with a single accepting state: minimal,
+    but needs ~log n rounds of splitting in Hopcroft's algorithm.
+    """
+    delta: Dict[Tuple[State, Symbol], State] = {}
+    for s in range(n):
+        delta[(s, "a")] = (s + 1) % n
+        delta[(s, "b")] = s
+    return DFA(states=set(range(n)), alphabet={"a", "b"}, start=0, accept={n - 1}, delta=delta)
+
+
+def random_words(
+    alphabet: Sequence[Symbol],
+    count: int,
+    *,
+    min_len: int = 0,
+    max_len: int = 16,
+    seed: Optional[int] = 0,
+) -> List[List[Symbol]]:
+    """`count` random words with lengths uniform in [min_len, max_len]."""
+    rng = random.Random(seed)
+    alphabet = list(alphabet)
+    return [
+        [rng.choice(alphabet) for _ in range(rng.randint(min_len, max_len))]
+        for _ in range(count)
+    ]
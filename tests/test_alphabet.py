@@ -0,0 +1,115 @@
+import io
+import string
+
+from langmachines import regex
+from langmachines.alphabet import compress_dfa, expand_dfa, symbol_classes
+from langmachines.algorithms.equivalence import equivalent
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.compiled import compile_dfa, simulate_many
+from langmachines.dfa import DFA, prune_unreachable, simulate, totalize
+from langmachines.io.binary import from_buffer, write_binary
+from langmachines.nfa import NFA, to_dfa
+from langmachines.utils import random_dfa, random_words
+
+
+def digits_then_letters() -> DFA:
+    """[0-9]+[a-z]* over digits and lowercase letters (partial)."""
+    delta = {}
+    for d in string.digits:
+        delta[("s", d)] = "num"
+        delta[("num", d)] = "num"
+    for c in string.ascii_lowercase:
+        delta[("num", c)] = "word"
+        delta[("word", c)] = "word"
+    return DFA(
+        states={"s", "num", "word"},
+        alphabet=set(string.digits + string.ascii_lowercase),
+        start="s",
+        accept={"num", "word"},
+        delta=delta,
+    )
+
+
+def test_symbol_classes_group_interchangeable_symbols():
+    cls = symbol_classes(digits_then_letters())
+    assert cls.classes == (tuple(string.digits), tuple(string.ascii_lowercase))
+    assert cls.representatives == ["0", "a"]
+    assert cls.class_of["7"] == 0 and cls.class_of["q"] == 1
+
+
+def test_missing_transitions_distinguish_symbols():
+    d = DFA(states={0}, alphabet={"a", "b", "c"}, start=0, accept={0},
+            delta={(0, "a"): 0, (0, "c"): 0})
+    assert symbol_classes(d).classes == (("a", "c"), ("b",))
+
+
+def test_compress_expand_round_trip():
+    d = digits_then_letters()
+    small, cls = compress_dfa(d)
+    assert small.alphabet == {0, 1}
+    assert simulate(small, [0, 0, 1]) and not simulate(small, [1])
+    assert expand_dfa(small, cls) == d
+
+
+def test_algorithms_on_class_alphabet_keep_full_alphabet():
+    d = digits_then_letters()
+    m = minimize_dfa(d)
+    assert m.alphabet == d.alphabet
+    assert len(m.states) == 4  # s, num, word, sink
+    assert all((s, a) in m.delta for s in m.states for a in m.alphabet)
+    t = totalize(d)
+    assert len(t.states) == 4
+    assert all((s, a) in t.delta for s in t.states for a in t.alphabet)
+    assert prune_unreachable(d).states == d.states
+    for w in ["", "1", "12ab", "a", "1a1", "007x"]:
+        assert simulate(m, w) is simulate(t, w) is simulate(d, w)
+
+
+def test_to_dfa_steps_per_class():
+    nfa = NFA(
+        states={0, 1},
+        alphabet={"a", "b", "c"},
+        start=0,
+        accept={1},
+        delta={(0, "a"): {0, 1}, (0, "b"): {0, 1}, (0, "c"): {0}},
+    )
+    d = to_dfa(nfa)
+    assert d.delta[("Q0", "a")] == d.delta[("Q0", "b")] != d.delta[("Q0", "c")]
+    assert simulate(d, "cab") and not simulate(d, "abc")
+
+
+def test_compiled_table_has_one_column_per_class():
+    d = digits_then_letters()
+    c = compile_dfa(d)
+    assert c.n_symbols == 36 and c.n_columns == 2
+    assert len(c.table) == c.n_states * 2
+    assert c.symbol_index["3"] == c.symbol_index["0"] != c.symbol_index["z"]
+    for w in ["", "1", "12ab", "a", "1a1", "007x"]:
+        assert c.simulate(w) is c.simulate(w.encode()) is simulate(d, w)
+    assert list(simulate_many(c, ["12ab", "a1", ""], backend="python")) == [True, False, False]
+    assert equivalent(c.to_dfa(), d)
+
+
+def test_binary_format_stores_full_table():
+    c = compile_dfa(digits_then_letters())
+    buf = io.BytesIO()
+    write_binary(c, buf)
+    back = from_buffer(buf.getvalue())
+    assert back.columns is None and back.n_columns == 36
+    for w in ["12ab", "a", "9"]:
+        assert back.simulate(w) is c.simulate(w)
+
+
+def test_random_dfas_unchanged_by_compression():
+    for seed in range(5):
+        d = random_dfa(30, 6, density=0.7, seed=seed)
+        c = compile_dfa(d)
+        m = minimize_dfa(d)
+        for w in random_words(sorted(d.alphabet), 50, max_len=10, seed=seed):
+            assert c.simulate(w) is simulate(m, w) is simulate(d, w)
+
+
+def test_regex_over_bytes_alphabet_compresses():
+    p = regex.compile(r"[0-9]+\.[0-9]+", alphabet=[chr(i) for i in range(256)])
+    assert p.compiled.n_columns == 3  # digits, '.', everything else
+    assert p.fullmatch("3.14") and not p.fullmatch("3.x")
@@ -0,0 +1,48 @@
+import pytest
+
+from langmachines.dfa import DFA, simulate
+from langmachines.io.binary import BinaryFormatError, from_buffer, load_binary, save_binary
+
+
+def partial_dfa() -> DFA:
+    return DFA(
+        states={"A", "B", "ü"},
+        alphabet={"a", "b"},
+        start="A",
+        accept={"B"},
+        delta={("A", "a"): "B", ("B", "a"): "ü", ("ü", "b"): "A"},
+    )
+
+
+def test_binary_roundtrip_is_mmap_backed(tmp_path):
+    d = partial_dfa()
+    path = str(tmp_path / "d.lmdfa")
+    save_binary(d, path)
+    c = load_binary(path)
+    assert isinstance(c.table, memoryview)
+    assert set(c.states) == d.states and set(c.symbols) == d.alphabet
+    for w in ["", "a", "aab", "aaba", "b", "aa"]:
+        assert c.simulate(w) is simulate(d, w)
+    back = c.to_dfa()
+    assert back.delta == d.delta and back.accept == d.accept and back.start == "A"
+
+
+def test_binary_int_labels(tmp_path):
+    d = DFA(states={0, 1}, alphabet={0, 1}, start=0, accept={1},
+            delta={(0, 1): 1, (1, 0): 0, (1, 1): 1})
+    path = str(tmp_path / "ints.lmdfa")
+    save_binary(d.compile(), path)
+    c = load_binary(path, verify=False)
+    assert c.simulate(bytes([1, 1])) is True
+    assert c.to_dfa().delta == d.delta
+
+
+def test_binary_detects_corruption(tmp_path):
+    path = tmp_path / "d.lmdfa"
+    save_binary(partial_dfa(), str(path))
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    with pytest.raises(BinaryFormatError, match="Checksum"):
+        from_buffer(bytes(data))
+    with pytest.raises(BinaryFormatError, match="magic"):
+        from_buffer(b"x" * 200)
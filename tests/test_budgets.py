@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from langmachines import budgets, regex
+from langmachines.algorithms.minimize import _refine_memory, minimize_dfa
+from langmachines.algorithms.product import intersection
+from langmachines.budgets import Budget, BudgetExceeded, CancellationToken, Cancelled
+from langmachines.dfa import prune_unreachable
+from langmachines.nfa import to_dfa
+from langmachines.utils import cycle_dfa, nth_from_end_nfa, random_dfa
+
+
+def test_max_states_stops_subset_construction_with_partial_stats():
+    with pytest.raises(BudgetExceeded) as info:
+        to_dfa(nth_from_end_nfa(12), budget=Budget(max_states=100))
+    e = info.value
+    assert (e.algorithm, e.resource, e.limit) == ("to_dfa", "states", 100)
+    assert e.stats["states"] == 100 and e.stats["transitions"] > 0
+    assert "elapsed" in e.stats
+
+
+def test_budget_large_enough_changes_nothing():
+    nfa = nth_from_end_nfa(4)
+    d = to_dfa(nfa, budget=Budget(max_states=16, timeout=60, max_memory=1 << 30))
+    assert d == to_dfa(nfa)
+    assert minimize_dfa(d, budget=Budget(max_states=16)) == minimize_dfa(d)
+
+
+def test_minimize_and_product_budgets():
+    with pytest.raises(BudgetExceeded) as info:
+        minimize_dfa(cycle_dfa(50), budget=Budget(max_states=49))
+    assert (info.value.algorithm, info.value.resource) == ("minimize", "states")
+
+    a, b = random_dfa(30, 2, seed=1), random_dfa(30, 2, seed=2)
+    with pytest.raises(BudgetExceeded) as info:
+        intersection(a, b, budget=Budget(max_states=10))
+    assert (info.value.algorithm, info.value.stats["states"]) == ("product", 10)
+
+
+def test_memory_estimate_and_deadline():
+    with pytest.raises(BudgetExceeded) as info:
+        to_dfa(nth_from_end_nfa(12), budget=Budget(max_memory=10_000, check_every=16))
+    assert info.value.resource == "memory"
+    assert info.value.stats["memory_estimate"] > 10_000
+
+    expired = Budget(deadline=time.monotonic() - 1, check_every=1)
+    with pytest.raises(BudgetExceeded) as info:
+        minimize_dfa(cycle_dfa(200), budget=expired)
+    assert info.value.resource == "deadline"
+    with pytest.raises(BudgetExceeded) as info:
+        minimize_dfa(cycle_dfa(200), budget=Budget(timeout=1e-9, check_every=1))
+    assert info.value.limit == pytest.approx(1e-9)  # the timeout, not the absolute deadline
+
+
+def test_minimize_memory_is_checked_while_refining():
+    d = random_dfa(400, 3, seed=5)
+    n = len(prune_unreachable(d).states)
+    before_refining = _refine_memory(n, 3, 2, 2 * 3)
+    with pytest.raises(BudgetExceeded) as info:
+        minimize_dfa(d, budget=Budget(max_memory=before_refining + 100, check_every=1))
+    assert info.value.resource == "memory" and info.value.stats["splitters"] > 0
+
+
+def test_cancellation_from_another_thread():
+    token = CancellationToken()
+    budget = Budget(token=token, check_every=64)
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    try:
+        with pytest.raises(Cancelled) as info:
+            to_dfa(nth_from_end_nfa(22), budget=budget)
+    finally:
+        timer.cancel()
+    assert info.value.resource == "cancelled" and info.value.limit is None
+    assert info.value.stats["states"] > 0
+
+
+def test_ambient_budget_covers_indirect_calls():
+    p = regex.compile("(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)", alphabet="ab")
+    with budgets.limit(Budget(max_states=20)):
+        with pytest.raises(BudgetExceeded):
+            p.dfa
+    assert len(p.dfa.states) == 128  # no ambient budget outside the block
@@ -0,0 +1,106 @@
+import pytest
+
+from langmachines.algorithms.equivalence import equivalent
+from langmachines.algorithms.product import complement
+from langmachines.builders import DFABuilder, NFABuilder
+from langmachines.dfa import DFA, prune_unreachable, simulate, totalize
+from langmachines.nfa import EPSILON, NFA, to_dfa
+from langmachines.utils import random_dfa, random_nfa
+
+
+def test_dfa_builder_freeze_is_copy_on_write():
+    b = DFABuilder(start=0, accept=[1])
+    b.add_transitions([(0, "a", 1), (1, "b", 0)])
+    d1 = b.freeze()
+    assert d1 == DFA(states={0, 1}, alphabet={"a", "b"}, start=0, accept={1}, delta={(0, "a"): 1, (1, "b"): 0})
+    assert d1.delta is b.delta  # shared, no copy
+
+    b.add_transition(1, "a", 2)
+    b.set_accepting(1, False)
+    assert (1, "a") not in d1.delta and d1.accept == {1} and 2 not in d1.states
+    d2 = b.freeze()
+    assert d2.delta[(1, "a")] == 2 and d2.accept == set()
+
+    b.remove_transition(0, "a")
+    b.remove_states([2])
+    assert d2.delta[(0, "a")] == 1 and (1, "a") not in b.delta and 2 in d2.states
+    with pytest.raises(KeyError):
+        b.remove_transition(0, "a")
+    with pytest.raises(ValueError):
+        b.remove_states([0])
+
+
+def test_dfa_builder_in_place_ops_match_functions():
+    for seed in range(5):
+        d = random_dfa(30, 3, density=0.4, seed=seed)
+        b = DFABuilder.from_dfa(d)
+        b.prune()
+        assert b.freeze() == prune_unreachable(d)
+        assert d == random_dfa(30, 3, density=0.4, seed=seed)  # input untouched
+
+        b = DFABuilder.from_dfa(d)
+        sink = b.totalize()
+        t = b.freeze()
+        assert sink in t.states and len(t.delta) == len(t.states) * len(t.alphabet)
+        assert equivalent(t, totalize(d))
+        assert b.totalize() is None
+
+        b = DFABuilder.from_dfa(d)
+        b.complement(alphabet=["z"])
+        assert equivalent(b.freeze(), complement(d, alphabet=d.alphabet | {"z"}))
+
+
+def test_nfa_builder():
+    b = NFABuilder(start="s", accept=["f"])
+    b.add_transitions([("s", EPSILON, "t"), ("t", "a", "t"), ("t", "a", "f"), ("x", "a", "f")])
+    n1 = b.freeze()
+    assert n1.delta[("t", "a")] == {"t", "f"} and "x" in n1.states
+
+    b.add_transition("t", "a", "u")
+    b.remove_transition("s", EPSILON, "t")
+    assert n1.delta[("t", "a")] == {"t", "f"} and ("s", EPSILON) in n1.delta
+    b.add_transition("s", EPSILON, "t")
+    assert b.prune() == 1 and "x" not in b.states and "x" in n1.states
+    n2 = b.freeze()
+    assert simulate(to_dfa(n2), "aa") and not simulate(to_dfa(n2), "")
+    b.remove_states(["f"])
+    assert n2.delta[("t", "a")] == {"t", "f", "u"} and b.delta[("t", "a")] == {"t", "u"}
+
+    for seed in range(3):
+        nfa = random_nfa(12, 2, density=0.8, epsilon_ratio=0.2, seed=seed)
+        b = NFABuilder.from_nfa(nfa)
+        b.prune()
+        assert equivalent(to_dfa(b.freeze()), to_dfa(nfa))
+        assert nfa == random_nfa(12, 2, density=0.8, epsilon_ratio=0.2, seed=seed)
+
+
+def test_edits_after_freeze_copy_only_what_they_change():
+    b = DFABuilder(start=0, accept=[1])
+    b.add_transitions([(0, "a", 1), (1, "b", 0)])
+    d = b.freeze()
+    b.set_accepting(0)
+    assert b.accept is not d.accept and d.accept == {1}
+    assert b.delta is d.delta and b.states is d.states and b.alphabet is d.alphabet
+    d = b.freeze()
+    b.add_transition(1, "a", 1)  # known states and symbol: only delta is copied
+    assert b.delta is not d.delta and (1, "a") not in d.delta
+    assert b.states is d.states and b.alphabet is d.alphabet and b.accept is d.accept
+
+    n = NFABuilder(start=0, accept=[2])
+    n.add_transitions([(0, "a", 1), (1, "b", 2), (2, "a", 0)])
+    frozen = n.freeze()
+    n.add_transition(0, "a", 2)
+    assert n.delta[(0, "a")] == {1, 2} and frozen.delta[(0, "a")] == {1}
+    # Untouched target sets stay the very same objects
+    assert n.delta[(1, "b")] is frozen.delta[(1, "b")] and n.delta[(2, "a")] is frozen.delta[(2, "a")]
+    assert n.states is frozen.states and n.accept is frozen.accept
+
+
+def test_incremental_growth_is_linear():
+    b = DFABuilder(start=0)
+    for i in range(20000):
+        b.add_transition(i, "a", i + 1)
+        if i % 1000 == 0:
+            d = b.freeze()  # freezing mid-stream costs one copy on the next edit only
+    assert len(d.delta) == 19001 and len(b.freeze().delta) == 20000
+    assert isinstance(NFABuilder(start=0).freeze(), NFA)
@@ -0,0 +1,83 @@
+import os
+
+from langmachines import regex
+from langmachines.algorithms.equivalence import equivalent
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.cache import AutomatonCache
+from langmachines.canonical import canonical_form, language_hash, structural_hash
+from langmachines.dfa import DFA, totalize
+from langmachines.nfa import to_dfa
+from langmachines.utils import random_dfa
+
+
+def relabel(d: DFA, f) -> DFA:
+    return DFA(
+        states={f(s) for s in d.states},
+        alphabet=set(d.alphabet),
+        start=f(d.start),
+        accept={f(s) for s in d.accept},
+        delta={(f(s), a): f(t) for (s, a), t in d.delta.items()},
+    )
+
+
+def test_hash_ignores_labels_dead_and_unreachable_states():
+    d = random_dfa(20, 3, density=0.8, seed=4)
+    r = relabel(d, lambda s: f"state-{s * 7}")
+    assert structural_hash(d) == structural_hash(r)
+    assert canonical_form(d) == canonical_form(r)
+    extra = DFA(states=d.states | {"junk"}, alphabet=d.alphabet, start=d.start, accept=d.accept,
+                delta={**d.delta, ("junk", "a"): d.start})
+    assert structural_hash(extra) == structural_hash(d)
+    m = minimize_dfa(d)
+    assert structural_hash(totalize(m)) == structural_hash(m)
+    assert equivalent(canonical_form(d).to_dfa(), d)
+
+
+def test_language_hash_identifies_languages():
+    a = regex.compile("(a|b)*abb", alphabet="ab")
+    b = regex.compile("(a*b*)*abb", alphabet="ab")
+    c = regex.compile("(a|b)*ab", alphabet="ab")
+    assert language_hash(a.nfa) == language_hash(b.dfa) == language_hash(to_dfa(b.nfa))
+    assert language_hash(a.nfa) != language_hash(c.nfa)
+    rules = [a.nfa, b.nfa, c.nfa, a.dfa]
+    unique = {language_hash(r): r for r in rules}
+    assert len(unique) == 2
+
+
+def test_cache_survives_restarts(tmp_path):
+    p = regex.compile("(a|b)*a(a|b)(a|b)", alphabet="ab")
+    cache = AutomatonCache(tmp_path)
+    first = cache.minimize(p.nfa)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+    assert equivalent(first, p.dfa)
+
+    again = AutomatonCache(tmp_path)
+    assert len(again) == 1
+    assert again.minimize(p.nfa) == first
+    assert again.minimize(p.dfa) == first  # separate entry (DFA key), same canonical result
+    assert again.to_dfa(p.nfa) == to_dfa(p.nfa)
+    assert AutomatonCache(tmp_path).to_dfa(p.nfa) == to_dfa(p.nfa)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AutomatonCache(tmp_path, max_bytes=1)
+    d1, d2 = random_dfa(5, 2, seed=1), random_dfa(5, 2, seed=2)
+    cache.minimize(d1)
+    cache.minimize(d2)
+    assert len(cache) == 1 and cache.stats.evictions == 1
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".lmdfa")]) == 1
+    cache.minimize(d2)
+    assert cache.stats.hits == 1
+
+
+def test_corrupt_entries_are_recomputed(tmp_path):
+    cache = AutomatonCache(tmp_path)
+    d = random_dfa(6, 2, seed=3)
+    good = cache.minimize(d)
+    (name,) = os.listdir(tmp_path)
+    with open(tmp_path / name, "r+b") as f:
+        f.seek(-3, os.SEEK_END)
+        f.write(b"\xff\xff")
+    reopened = AutomatonCache(tmp_path)
+    assert reopened.minimize(d) == good
+    assert reopened.stats.misses == 1
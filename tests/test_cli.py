@@ -0,0 +1,97 @@
+import json
+
+from langmachines.cli import iter_blocks, main
+from langmachines.dfa import DFA
+from langmachines.io import jsonio
+from langmachines.io.binary import load_binary
+from langmachines.nfa import NFA, EPSILON
+
+
+def even_zeros() -> DFA:
+    return DFA(
+        states={"q0", "q1", "q2"},
+        alphabet={"0", "1"},
+        start="q0",
+        accept={"q0", "q2"},
+        delta={
+            ("q0", "0"): "q1", ("q0", "1"): "q2",
+            ("q1", "0"): "q0", ("q1", "1"): "q1",
+            ("q2", "0"): "q1", ("q2", "1"): "q2",
+        },
+    )
+
+
+def test_convert_minimize_determinize(tmp_path, capsys):
+    src = tmp_path / "d.json"
+    jsonio.save_dfa(even_zeros(), str(src))
+
+    assert main(["convert", str(src), str(tmp_path / "d.lmdfa")]) == 0
+    assert load_binary(str(tmp_path / "d.lmdfa")).to_dfa() == even_zeros()
+    assert main(["convert", str(tmp_path / "d.lmdfa"), str(tmp_path / "d.dot")]) == 0
+    assert "digraph" in (tmp_path / "d.dot").read_text()
+
+    assert main(["minimize", str(tmp_path / "d.lmdfa")]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["type"] == "dfa" and len(out["states"]) == 2
+
+    nfa = NFA(
+        states={0, 1, 2}, alphabet={"a", EPSILON}, start=0, accept={2},
+        delta={(0, EPSILON): {1}, (1, "a"): {1, 2}},
+    )
+    jsonio.save_nfa(nfa, str(tmp_path / "n.json"))
+    assert main(["determinize", str(tmp_path / "n.json"), "--to", "compact"]) == 0
+    assert json.loads(capsys.readouterr().out)["format"] == "compact"
+    assert main(["render", str(tmp_path / "n.json")]) == 0
+    assert "ε" in capsys.readouterr().out
+
+    assert main(["convert", str(src), str(tmp_path / "d.txt")]) == 2
+    assert "use --to" in capsys.readouterr().err
+
+
+def test_iter_blocks_keeps_lines_whole():
+    import io
+
+    data = b"alpha\nbe\n\ngamma-long-line\nz"
+    blocks = list(iter_blocks(io.BytesIO(data), batch_bytes=4))
+    assert b"".join(blocks) == data
+    assert all(b.endswith(b"\n") for b in blocks[:-1])
+
+
+def test_match_lines_in_order(tmp_path, capsysbinary):
+    lines = [b"ab" * (i % 5) + (b"" if i % 3 else b"x") for i in range(500)]
+    a = tmp_path / "a.log"
+    a.write_bytes(b"\n".join(lines) + b"\n")
+    expected = [x for x in lines if x and set(x) <= set(b"ab") and len(x) % 2 == 0 or x == b""]
+
+    for jobs in ("1", "2"):
+        assert main(["match", "-e", "(ab)*", "-j", jobs, "--batch-bytes", "64", str(a)]) == 0
+        assert capsysbinary.readouterr().out.split(b"\n")[:-1] == expected
+
+    assert main(["match", "-e", "(AB)+", "-i", "-c", str(a)]) == 0
+    assert capsysbinary.readouterr().out == b"%d\n" % sum(1 for x in expected if x)
+
+    b = tmp_path / "b.log"
+    b.write_bytes(b"x\nab\n")
+    jsonio.save_dfa(even_zeros(), str(tmp_path / "d.json"))
+    assert main(["match", "-a", str(tmp_path / "d.json"), "-n", "-v", str(a), str(b)]) == 0
+    out = capsysbinary.readouterr().out.split(b"\n")
+    assert out[0] == b"%s:1:x" % str(a).encode()
+    assert out[-2] == b"%s:2:ab" % str(b).encode()
+
+    assert main(["match", "-e", "zzz", str(b)]) == 1
+
+
+def test_match_regex_over_utf8_text(tmp_path, capsysbinary):
+    f = tmp_path / "u.txt"
+    f.write_bytes("café\ncafe\ncafés\nnaïve\n".encode() + b"caf\xff\n")
+
+    def run(*args):
+        code = main(["match", *args, str(f)])
+        return code, capsysbinary.readouterr().out.decode("utf-8", "replace").splitlines()
+
+    for jobs in ("1", "2"):
+        assert run("-j", jobs, "-e", "café") == (0, ["café"])
+    assert run("-e", "caf.")[1] == ["café", "cafe", "caf�"]  # an invalid byte is one character
+    assert run("-e", "caf..")[1] == ["cafés"]
+    assert run("-e", "[^i]a[ïx]ve")[1] == ["naïve"]
+    assert run("-i", "-e", "CAFÉ")[1] == ["café"]
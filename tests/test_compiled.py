@@ -0,0 +1,97 @@
+import pytest
+
+from langmachines.dfa import DFA, simulate
+from langmachines.compiled import DEAD, compile_dfa, simulate_many
+from langmachines.algorithms.minimize import minimize_dfa
+
+
+def even_zeros() -> DFA:
+    q0, q1 = "q0", "q1"
+    return DFA(
+        states={q0, q1},
+        alphabet={"0", "1"},
+        start=q0,
+        accept={q0},
+        delta={
+            (q0, "0"): q1, (q0, "1"): q0,
+            (q1, "0"): q0, (q1, "1"): q1,
+        },
+    )
+
+
+def test_compiled_matches_simulate():
+    d = even_zeros()
+    c = d.compile()
+    for w in ["", "0", "1", "10", "1010", "000", "0110"]:
+        assert c.simulate(w) is simulate(d, w)
+        assert c.simulate(w.encode()) is simulate(d, w)
+        assert c.simulate(list(w)) is simulate(d, w)
+
+
+def test_compiled_partial_dfa_and_labels():
+    d = DFA(
+        states={"A", "B", "C_unreach"},
+        alphabet={"a", "b"},
+        start="A",
+        accept={"B"},
+        delta={("A", "a"): "B", ("B", "a"): "B", ("B", "b"): "A"},
+    )
+    c = compile_dfa(d)
+    assert c.states[c.start] == "A"
+    assert set(c.states) == d.states
+    assert c.advance(c.start, "b") == DEAD
+    assert c.simulate("ab") is False
+    assert c.simulate("aba") is True
+    back = c.to_dfa()
+    assert back.delta == d.delta and back.accept == d.accept
+    with pytest.raises(KeyError):
+        c.simulate("ax")
+
+
+def test_compiled_integer_symbols_and_min_dfa():
+    d = DFA(
+        states={0, 1},
+        alphabet={0, 1},
+        start=0,
+        accept={1},
+        delta={(0, 0): 0, (0, 1): 1, (1, 0): 0, (1, 1): 1},
+    )
+    c = d.compile()
+    assert c.simulate([0, 1, 1]) is True
+    assert c.simulate(bytes([1, 0])) is False
+    m = minimize_dfa(even_zeros()).compile()
+    assert m.simulate("1001") is True
+
+
+def test_compiled_dead_before_unknown_symbol_rejects():
+    d = DFA(states={"A", "B"}, alphabet={"a", "b"}, start="A", accept={"B"}, delta={("A", "a"): "B"})
+    c = d.compile()
+    # Like `simulate`, a run that dies first never looks at the bad symbol.
+    assert simulate(d, "bx") is False
+    assert c.simulate("bx") is False
+    assert c.simulate(b"bx") is False
+    with pytest.raises(KeyError):
+        c.simulate(b"ax")
+
+
+@pytest.mark.parametrize("backend", ["python", "auto"])
+def test_simulate_many_matches_simulate(backend):
+    import random
+
+    d = DFA(
+        states={"A", "B", "C"},
+        alphabet={"a", "b"},
+        start="A",
+        accept={"B"},
+        delta={("A", "a"): "B", ("B", "a"): "B", ("B", "b"): "C", ("C", "a"): "B"},
+    )
+    rng = random.Random(0)
+    words = ["".join(rng.choice("ab") for _ in range(rng.randrange(12))) for _ in range(300)]
+    got = simulate_many(d, words, backend=backend, batch_size=64)
+    assert [bool(x) for x in got] == [simulate(d, w) for w in words]
+    got_bytes = simulate_many(d.compile(), [w.encode() for w in words], backend=backend)
+    assert [bool(x) for x in got_bytes] == [simulate(d, w) for w in words]
+    # dead before the unknown symbol -> plain reject; otherwise KeyError
+    assert [bool(x) for x in simulate_many(d, ["bbx", "a"], backend=backend)] == [False, True]
+    with pytest.raises(KeyError):
+        simulate_many(d, ["a", "ax"], backend=backend)
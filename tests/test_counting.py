@@ -0,0 +1,72 @@
+import itertools
+from collections import Counter
+
+import pytest
+
+from langmachines import regex
+from langmachines.algorithms.counting import (
+    count_words,
+    count_words_up_to,
+    enumerate_words,
+    sample_words,
+)
+from langmachines.dfa import DFA, simulate
+from langmachines.utils import random_dfa
+
+
+def brute_force(dfa, length, alphabet="ab"):
+    return [w for w in itertools.product(sorted(alphabet), repeat=length) if simulate(dfa, w)]
+
+
+def test_counts_agree_with_brute_force():
+    for seed in range(15):
+        d = random_dfa(6, 2, density=0.8, accept_ratio=0.4, seed=seed)
+        total = 0
+        for n in range(8):
+            exact = len(brute_force(d, n))
+            total += exact
+            assert count_words(d, n) == exact
+            assert count_words_up_to(d, n) == total
+
+
+def test_matrix_power_matches_dp_for_large_lengths():
+    even_a = regex.compile("(b*ab*a)*b*", alphabet="ab").dfa
+    # Words with an even number of a's: half of all words, for n >= 1
+    assert count_words(even_a, 500) == 2 ** 499
+    assert count_words_up_to(even_a, 500) == 1 + sum(2 ** (n - 1) for n in range(1, 501))
+    fib = regex.compile("(b|ab)*(a|)", alphabet="ab").dfa  # no "aa": Fibonacci numbers
+    a, b = 1, 2
+    for _ in range(1000):
+        a, b = b, a + b
+    assert count_words(fib, 1000) == a
+
+
+def test_empty_language_and_bad_lengths():
+    empty = DFA(states={0}, alphabet={"a"}, start=0, accept=set(), delta={(0, "a"): 0})
+    assert count_words(empty, 10 ** 6) == 0
+    assert sample_words(empty, 3) == []
+    assert list(enumerate_words(empty)) == []
+    with pytest.raises(ValueError):
+        count_words(empty, -1)
+
+
+def test_sampling_is_uniform_over_accepted_words():
+    d = regex.compile("a(a|b)*|bb", alphabet="ab").dfa
+    words = sample_words(d, 3, 4000, seed=7)
+    assert all(simulate(d, w) and len(w) == 3 for w in words)
+    counts = Counter(words)
+    assert set(counts) == set(brute_force(d, 3))
+    assert max(counts.values()) < 1.3 * min(counts.values())
+    assert sample_words(d, 3, 5, seed=1) == sample_words(d, 3, 5, seed=1)
+
+
+def test_enumeration_is_lazy_shortlex():
+    d = regex.compile("(a|b)*b", alphabet="ab").dfa
+    first = list(itertools.islice(enumerate_words(d), 7))
+    assert first == [("b",), ("a", "b"), ("b", "b"), ("a", "a", "b"), ("a", "b", "b"), ("b", "a", "b"), ("b", "b", "b")]
+    assert len(list(enumerate_words(d, max_length=6))) == count_words_up_to(d, 6)
+
+
+def test_enumeration_of_finite_language_terminates():
+    d = regex.compile("ab|a|ba|", alphabet="ab").dfa
+    assert list(enumerate_words(d)) == [(), ("a",), ("a", "b"), ("b", "a")]
@@ -0,0 +1,51 @@
+import itertools
+import random
+
+from langmachines import regex
+from langmachines.dfa import DFA, simulate
+from langmachines.nfa import to_dfa
+from langmachines.algorithms.equivalence import counterexample, equivalent
+from langmachines.algorithms.minimize import minimize_dfa
+
+
+def random_dfa(rng: random.Random, n: int) -> DFA:
+    delta = {(s, a): rng.randrange(n) for s in range(n) for a in "ab" if rng.random() < 0.9}
+    accept = {s for s in range(n) if rng.random() < 0.4}
+    return DFA(states=set(range(n)), alphabet={"a", "b"}, start=0, accept=accept, delta=delta)
+
+
+def test_equivalent_to_own_minimization_and_nfa_route():
+    rng = random.Random(0)
+    for _ in range(50):
+        d = random_dfa(rng, rng.randint(1, 8))
+        assert equivalent(d, minimize_dfa(d))
+        assert counterexample(d, minimize_dfa(d)) is None
+    p = regex.compile("(a|b)*abb")
+    assert equivalent(p.dfa, to_dfa(p.nfa))
+    assert equivalent(p.dfa, regex.compile("(a*b*)*abb").dfa)
+
+
+def test_counterexample_is_shortest_distinguishing_word():
+    rng = random.Random(1)
+    checked = 0
+    for _ in range(100):
+        d1, d2 = random_dfa(rng, 5), random_dfa(rng, 5)
+        w = counterexample(d1, d2)
+        shortest = next(
+            (x for k in range(8) for x in itertools.product("ab", repeat=k) if simulate(d1, x) != simulate(d2, x)),
+            None,
+        )
+        if shortest is None:
+            continue
+        checked += 1
+        assert not equivalent(d1, d2)
+        assert w is not None and len(w) == len(shortest)
+        assert simulate(d1, w) != simulate(d2, w)
+    assert checked > 50
+
+
+def test_different_alphabets_and_empty_word():
+    a = regex.compile("a*").dfa
+    b = regex.compile("(a|c)*").dfa
+    assert counterexample(a, b) == ("c",)
+    assert counterexample(regex.compile("a?").dfa, regex.compile("a").dfa) == ()
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from langmachines import regex
+from langmachines.dfa import simulate
+from langmachines.nfa import NFA, EPSILON, to_dfa
+from langmachines.algorithms.product import difference
+from langmachines.algorithms.inclusion import (
+    inclusion_counterexample,
+    is_included,
+    is_universal,
+    universality_counterexample,
+)
+
+
+def random_nfa(rng: random.Random, n: int) -> NFA:
+    delta = {}
+    for s in range(n):
+        for a in ("a", "b", EPSILON):
+            targets = {t for t in range(n) if rng.random() < (0.1 if a == EPSILON else 0.3)}
+            if targets:
+                delta[(s, a)] = targets
+    accept = {s for s in range(n) if rng.random() < 0.4}
+    return NFA(states=set(range(n)), alphabet={"a", "b", EPSILON}, start=0, accept=accept, delta=delta)
+
+
+def included_via_subsets(a: NFA, b: NFA) -> bool:
+    # Reference: determinize both; the product only holds reachable pairs.
+    return not difference(to_dfa(a), to_dfa(b)).accept
+
+
+@pytest.mark.parametrize("simulation", [False, True])
+def test_inclusion_matches_subset_construction(simulation):
+    rng = random.Random(4)
+    for _ in range(150):
+        a, b = random_nfa(rng, rng.randint(1, 5)), random_nfa(rng, rng.randint(1, 5))
+        w = inclusion_counterexample(a, b, simulation=simulation)
+        assert (w is None) == included_via_subsets(a, b)
+        if w is not None:
+            assert simulate(to_dfa(a), w) and not simulate(to_dfa(b), w)
+
+
+@pytest.mark.parametrize("simulation", [False, True])
+def test_regex_inclusion_and_universality(simulation):
+    ab = regex.compile("(a|b)*abb", alphabet="ab").nfa
+    bb = regex.compile("(a|b)*bb", alphabet="ab").nfa
+    assert is_included(ab, bb, simulation=simulation)
+    assert not is_included(bb, ab, simulation=simulation)
+    assert inclusion_counterexample(bb, ab, simulation=simulation) == ("b", "b")
+    assert is_universal(regex.compile("(a|b)*", alphabet="ab").nfa, simulation=simulation)
+    by_second_last = regex.compile("(a|b)*a(a|b)|(a|b)*b(a|b)|a|b|", alphabet="ab").nfa
+    assert is_universal(by_second_last, simulation=simulation)
+    assert universality_counterexample(regex.compile("a*").nfa, "ab", simulation=simulation) == ("b",)
@@ -0,0 +1,45 @@
+from langmachines import instrument
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.nfa import epsilon_closure, to_dfa
+from langmachines.utils import cycle_dfa, nth_from_end_nfa, random_dfa
+
+
+def test_off_by_default():
+    assert instrument.current() is None
+    to_dfa(nth_from_end_nfa(3))  # nothing to record into
+
+
+def test_to_dfa_and_minimize_counters():
+    nfa = nth_from_end_nfa(6)
+    ticks = []
+    with instrument.record(progress=lambda *a: ticks.append(a), progress_every=10) as rec:
+        d = to_dfa(nfa)
+        m = minimize_dfa(d)
+        epsilon_closure(nfa, {0})
+    assert instrument.current() is None
+
+    assert rec.counters["to_dfa.subsets"] == len(d.states) == 64
+    assert rec.counters["to_dfa.transitions"] == len(d.delta)
+    assert rec.counters["epsilon_closure.calls"] == len(nfa.states) + 1
+    assert rec.counters["minimize.states_in"] == 64 == rec.counters["minimize.states_out"] == len(m.states)
+    assert rec.counters["minimize.sink_insertions"] == 0
+    assert rec.counters["minimize.splits"] == 62  # 2 initial blocks -> 64
+    assert rec.maxima["minimize.worklist_peak"] >= 2
+    assert {"to_dfa.closure", "to_dfa.subsets", "minimize.refine"} <= set(rec.timings)
+
+    to_dfa_ticks = [t for t in ticks if t[0] == "to_dfa"]
+    assert [t[1] for t in to_dfa_ticks] == [10, 20, 30, 40, 50, 60]
+    assert any(t[0] == "minimize" for t in ticks)
+    assert "to_dfa.subsets" in rec.report()
+
+
+def test_sink_and_nested_recorders():
+    partial = random_dfa(30, 2, density=0.5, seed=4)
+    with instrument.record() as outer:
+        with instrument.record() as inner:
+            minimize_dfa(partial)
+        minimize_dfa(cycle_dfa(8))
+        minimize_dfa(cycle_dfa(8))
+    assert inner.counters["minimize.sink_insertions"] == 1
+    assert outer.counters["minimize.sink_insertions"] == 0
+    assert outer.counters["minimize.states_out"] == 16
@@ -0,0 +1,110 @@
+import io
+import json
+
+import pytest
+
+from langmachines.dfa import DFA
+from langmachines.nfa import NFA, EPSILON, simulate_nfa
+from langmachines.io import jsonio
+from langmachines.io.jsonio import _JsonStream
+
+
+def sample_dfa() -> DFA:
+    return DFA(
+        states={"q0", "q1", "dead end"},
+        alphabet={"0", "1"},
+        start="q0",
+        accept={"q0"},
+        delta={("q0", "0"): "q1", ("q0", "1"): "q0", ("q1", "0"): "q0"},
+    )
+
+
+def sample_nfa() -> NFA:
+    return NFA(
+        states={"s", "t", "f"},
+        alphabet={"a", EPSILON},
+        start="s",
+        accept={"f"},
+        delta={("s", EPSILON): {"t", "f"}, ("t", "a"): {"t", "f"}},
+    )
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_dfa_and_nfa_roundtrip(compact):
+    for m, write, read in (
+        (sample_dfa(), jsonio.write_dfa, jsonio.read_dfa),
+        (sample_nfa(), jsonio.write_nfa, jsonio.read_nfa),
+    ):
+        buf = io.StringIO()
+        write(m, buf, compact=compact)
+        text = buf.getvalue()
+        json.loads(text)  # always valid JSON
+        assert (" " not in text.replace("dead end", "")) is compact
+        assert read(io.StringIO(text)) == m
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_roundtrip_keeps_moves_on_symbols_outside_the_alphabet(compact):
+    nfa = NFA(
+        states={"s", "t", "f"},
+        alphabet={"a"},
+        start="s",
+        accept={"f"},
+        delta={("s", EPSILON): {"t"}, ("t", "a"): {"f"}},
+    )
+    buf = io.StringIO()
+    jsonio.write_nfa(nfa, buf, compact=compact)
+    back = jsonio.read_nfa(io.StringIO(buf.getvalue()))
+    assert back == nfa == jsonio.nfa_from_json_obj(jsonio.nfa_to_json_obj(nfa))
+    assert simulate_nfa(back, "a")
+
+
+def test_streaming_reader_with_tiny_chunks():
+    # Large ids force numbers to be split across refills.
+    states = {f"s{i}" for i in range(300)}
+    delta = {(f"s{i}", a): f"s{(i * 7 + j) % 300}" for i in range(300) for j, a in enumerate("ab")}
+    d = DFA(states=states, alphabet={"a", "b"}, start="s0", accept={"s5"}, delta=delta)
+    for compact in (False, True):
+        buf = io.StringIO()
+        jsonio.write_dfa(d, buf, compact=compact)
+        js = _JsonStream(io.StringIO(buf.getvalue()), chunk_size=3)
+        parts = jsonio._Parts()
+        for key in js.members():
+            if key == "delta" and compact:
+                for _ in js.elements():
+                    parts.rows.append(js.value())
+            elif key == "delta":
+                for s in js.members():
+                    parts.add_row(s, js.value())
+            elif key in ("states", "alphabet", "accept"):
+                getattr(parts, key).extend(js.value())
+            else:
+                setattr(parts, {"type": "kind"}.get(key, key), js.value())
+        parts.compact = compact
+        assert parts.build() == d
+
+
+def test_json_obj_api_and_file_helpers(tmp_path):
+    d = sample_dfa()
+    assert jsonio.dfa_from_json_obj(jsonio.dfa_to_json_obj(d)) == d
+    assert jsonio.nfa_from_json_obj(jsonio.nfa_to_json_obj(sample_nfa())) == sample_nfa()
+    path = str(tmp_path / "d.json")
+    jsonio.save_dfa(d, path, compact=True)
+    assert jsonio.load_dfa(path) == d
+    assert jsonio.load_automaton(path) == d
+    with pytest.raises(ValueError):
+        jsonio.load_nfa(path)
+    # keys in any order, delta first
+    text = '{"delta": {"q0": {"1": "q0"}}, "accept": [], "start": "q0", "alphabet": ["1"], "states": ["q0"], "type": "dfa"}'
+    assert jsonio.read_dfa(io.StringIO(text)).delta == {("q0", "1"): "q0"}
+    with pytest.raises(ValueError):
+        jsonio.read_dfa(io.StringIO(text[:-1]))
+
+
+def test_compact_writer_rejects_targets_outside_states():
+    nfa = NFA(states={"s"}, alphabet={"a"}, start="s", accept=set(), delta={("s", "a"): {"s", "ghost"}})
+    with pytest.raises(ValueError, match="'ghost' is not in NFA states"):
+        jsonio.write_nfa(nfa, io.StringIO(), compact=True)
+    dfa = DFA(states={"s"}, alphabet={"a"}, start="s", accept=set(), delta={("s", "a"): "ghost"})
+    with pytest.raises(ValueError, match="'ghost' is not in DFA states"):
+        jsonio.write_dfa(dfa, io.StringIO(), compact=True)
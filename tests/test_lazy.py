@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from langmachines.dfa import simulate
+from langmachines.lazy import LazyDFA
+from langmachines.nfa import NFA, EPSILON, to_dfa
+from langmachines.stream import DFAMatcher
+
+
+def nth_from_end(n: int) -> NFA:
+    # (a|b)* a (a|b)^(n-1): the minimal DFA has 2^n states
+    delta = {(0, "a"): {0, 1}, (0, "b"): {0}}
+    for i in range(1, n):
+        delta[(i, "a")] = {i + 1}
+        delta[(i, "b")] = {i + 1}
+    return NFA(states=set(range(n + 1)), alphabet={"a", "b"}, start=0, accept={n}, delta=delta)
+
+
+def test_lazy_agrees_with_subset_construction():
+    nfa = nth_from_end(4)
+    dfa = to_dfa(nfa)
+    lazy = LazyDFA(nfa)
+    rng = random.Random(0)
+    for _ in range(200):
+        w = "".join(rng.choice("ab") for _ in range(rng.randrange(10)))
+        assert lazy.simulate(w) is simulate(dfa, w)
+    assert lazy.cache_size <= len(dfa.states)
+    assert lazy.stats.hits > lazy.stats.misses > 0
+
+
+def test_lazy_cache_is_bounded_and_evicts():
+    lazy = LazyDFA(nth_from_end(10), max_states=8, thrash_window=10**9)
+    rng = random.Random(1)
+    w = "".join(rng.choice("ab") for _ in range(2000))
+    expected = w[-10] == "a"
+    assert lazy.simulate(w) is expected
+    assert lazy.cache_size <= 8
+    assert lazy.stats.evictions > 0
+    assert lazy.stats.fallbacks == 0
+
+
+def test_lazy_thrashing_falls_back_to_nfa_simulation():
+    lazy = LazyDFA(nth_from_end(10), max_states=2, thrash_window=64, thrash_ratio=0.25)
+    rng = random.Random(2)
+    w = "".join(rng.choice("ab") for _ in range(5000))
+    assert lazy.simulate(w) is (w[-10] == "a")
+    assert lazy.stats.fallbacks == 1
+
+
+def test_lazy_streaming_dead_and_unknown_symbols():
+    nfa = NFA(
+        states={"s", "t", "f"},
+        alphabet={"x", "y", EPSILON},
+        start="s",
+        accept={"f"},
+        delta={("s", EPSILON): {"t"}, ("t", "x"): {"f"}},
+    )
+    lazy = LazyDFA(nfa)
+    m = DFAMatcher(lazy)
+    m.feed(b"x")
+    assert m.finish() is True
+    m.feed("y")
+    assert m.dead and m.finish() is False
+    assert lazy.simulate("yz") is False  # dead before the unknown symbol
+    with pytest.raises(KeyError):
+        lazy.simulate("xz")
+
+
+def test_lazy_thrash_window_spans_small_stream_chunks():
+    lazy = LazyDFA(nth_from_end(10), max_states=2, thrash_window=64, thrash_ratio=0.25)
+    rng = random.Random(3)
+    w = "".join(rng.choice("ab") for _ in range(5000))
+    m = DFAMatcher(lazy)
+    for i in range(0, len(w), 16):
+        m.feed(w[i:i + 16])
+    assert m.finish() is (w[-10] == "a")
+    assert lazy.stats.fallbacks > 0
+
+
+def test_lazy_max_bytes_holds_as_rows_grow():
+    # Two DFA states and many symbols: the budget is exceeded by new
+    # transitions on rows already cached, not by new states
+    symbols = [f"s{i}" for i in range(200)]
+    delta = {}
+    for a in symbols:
+        delta[(0, a)] = {1}
+        delta[(1, a)] = {0}
+    nfa = NFA(states={0, 1}, alphabet=set(symbols), start=0, accept={0}, delta=delta)
+    lazy = LazyDFA(nfa, max_bytes=2000, thrash_window=10**9)
+    assert lazy.simulate(symbols) is True
+    assert lazy.cache_bytes <= 2000
+    assert lazy.stats.evictions > 0
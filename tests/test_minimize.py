@@ -37,3 +37,33 @@ def test_minimize_with_unreachable_and_sink():
     assert 2 <= len(m2.states) <= 3
     # Start maps somewhere valid
     assert m2.start in m2.states
+
+
+def test_minimize_keeps_states_distinguished_by_later_symbols():
+    # 3 and 5 differ on "ba"; every splitter symbol must be re-queued.
+    delta = {
+        (0, "a"): 7, (0, "b"): 4, (1, "b"): 8, (2, "a"): 9, (2, "b"): 6,
+        (3, "a"): 7, (3, "b"): 6, (4, "a"): 1, (4, "b"): 8, (5, "b"): 1,
+        (6, "a"): 3, (6, "b"): 5, (7, "a"): 7, (8, "a"): 2, (8, "b"): 10,
+        (9, "a"): 10, (9, "b"): 0, (10, "b"): 1, (11, "a"): 5, (11, "b"): 1,
+    }
+    d = DFA(states=set(range(12)), alphabet={"a", "b"}, start=0, accept={3, 5, 8}, delta=delta)
+    m = minimize_dfa(d)
+    assert m.block_of[3] != m.block_of[5]
+    # 7 is a non-accepting trap: it merges with the synthetic sink
+    assert len(m.states) == 11
+    assert m.block_of[7] == 7 and 11 not in m.block_of
+
+
+def test_block_of_representatives():
+    # Two equivalent accepting states collapse onto the one seen first from start.
+    d = DFA(
+        states={"s", "x", "y"},
+        alphabet={"a"},
+        start="s",
+        accept={"x", "y"},
+        delta={("s", "a"): "x", ("x", "a"): "y", ("y", "a"): "x"},
+    )
+    m = minimize_dfa(d)
+    assert m.block_of == {"s": "s", "x": "x", "y": "x"}
+    assert m.delta == {("s", "a"): "x", ("x", "a"): "x"}
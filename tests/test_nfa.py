@@ -1,4 +1,6 @@
-from langmachines.nfa import NFA, EPSILON, epsilon_closure, to_dfa
+import pytest
+
+from langmachines.nfa import NFA, EPSILON, BitsetNFA, epsilon_closure, simulate_nfa, to_dfa
 from langmachines.dfa import simulate
 
 
@@ -71,3 +73,70 @@ def test_nfa_with_epsilon_accepts_empty_string():
     assert simulate(dfa, "") is True
     assert simulate(dfa, "0") is True
     assert simulate(dfa, "000") is True
+
+
+def test_bitset_nfa_closures_and_step():
+    nfa = NFA(
+        states={"A", "B", "C"},
+        alphabet={"x", EPSILON},
+        start="A",
+        accept={"C"},
+        delta={
+            ("A", EPSILON): {"B"},
+            ("B", "x"): {"C"},
+            ("C", EPSILON): {"A"},
+        },
+    )
+    b = BitsetNFA(nfa)
+    assert b.states_of(b.start) == {"A", "B"}
+    nxt = b.step(b.start, "x")
+    assert b.states_of(nxt) == {"A", "B", "C"}
+    assert nxt & b.accept
+    assert b.step(b.start, "missing") == 0
+
+
+def test_to_dfa_names_states_in_discovery_order():
+    # (a|b)* a (a|b): the classic 2nd-symbol-from-the-end NFA -> 4 DFA states
+    nfa = NFA(
+        states={0, 1, 2},
+        alphabet={"a", "b"},
+        start=0,
+        accept={2},
+        delta={(0, "a"): {0, 1}, (0, "b"): {0}, (1, "a"): {2}, (1, "b"): {2}},
+    )
+    dfa = to_dfa(nfa)
+    assert dfa.start == "Q0"
+    assert dfa.states == {"Q0", "Q1", "Q2", "Q3"}
+    assert dfa.delta[("Q0", "a")] == "Q1" and dfa.delta[("Q0", "b")] == "Q0"
+    for w, expected in [("ab", True), ("aa", True), ("ba", False), ("bab", True), ("abb", False)]:
+        assert simulate(dfa, w) is expected
+
+
+def test_simulate_nfa_agrees_with_subset_construction():
+    from langmachines.dfa import simulate
+    from langmachines.utils import random_nfa, random_words
+
+    for seed in range(20):
+        nfa = random_nfa(12, 3, density=0.7, epsilon_ratio=0.2, seed=seed)
+        d = to_dfa(nfa)
+        for w in random_words("abc", 40, max_len=12, seed=seed):
+            assert simulate_nfa(nfa, w) is simulate(d, w)
+
+
+def test_simulate_nfa_large_shift_and_nfa():
+    from langmachines.utils import nth_from_end_nfa
+
+    # 2**40 DFA states; the direct simulation only shifts one int per symbol
+    nfa = nth_from_end_nfa(40)
+    text = "ab" * 500
+    assert simulate_nfa(nfa, text[:-40] + "b" * 40) is False
+    assert simulate_nfa(nfa, text[:-40] + "a" + "b" * 39) is True
+    assert simulate_nfa(nfa, (text[:-40] + "a" + "b" * 39).encode()) is True
+
+
+def test_simulate_nfa_unknown_symbol_and_dead_runs():
+    nfa = NFA(states={0, 1}, alphabet={"a", "b"}, start=0, accept={1}, delta={(0, "a"): {1}})
+    assert simulate_nfa(nfa, "a") is True
+    assert simulate_nfa(nfa, "bz") is False  # dies on "b" before reaching "z"
+    with pytest.raises(KeyError):
+        simulate_nfa(nfa, "az")
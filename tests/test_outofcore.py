@@ -0,0 +1,77 @@
+import io
+import os
+import struct
+
+import pytest
+
+from langmachines import instrument
+from langmachines.budgets import Budget, BudgetExceeded
+from langmachines.dfa import simulate
+from langmachines.io.binary import encode_implicit_labels, from_buffer, write_binary_stream
+from langmachines.nfa import to_dfa
+from langmachines.outofcore import to_dfa_file
+from langmachines.utils import nth_from_end_nfa, random_nfa
+
+
+def test_matches_in_memory_subset_construction(tmp_path):
+    for seed in range(8):
+        nfa = random_nfa(7, 3, density=1.2, epsilon_ratio=0.2, seed=seed)
+        c = to_dfa_file(nfa, tmp_path / f"r{seed}.lmdfa")
+        expected = to_dfa(nfa)
+        assert isinstance(c.table, memoryview)
+        assert c.to_dfa() == expected
+        for w in ["", "a", "ab", "cba", "abcabc"]:
+            assert c.simulate(w) is simulate(expected, w)
+
+
+def test_small_memory_limit_spills_to_sqlite(tmp_path):
+    nfa = nth_from_end_nfa(13)
+    with instrument.record() as rec:
+        c = to_dfa_file(nfa, tmp_path / "big.lmdfa", memory_limit=1 << 20, work_dir=tmp_path)
+    assert c.n_states == 2 ** 13
+    # The subset cache holds fewer than 2**13 entries: old subsets are found in SQLite
+    assert rec.counters["to_dfa.sqlite_lookups"] > 2 ** 13
+    assert c.to_dfa() == to_dfa(nfa)
+    # Scratch files are gone, only the result is left
+    assert os.listdir(tmp_path) == ["big.lmdfa"]
+    with pytest.raises(ValueError):
+        to_dfa_file(nfa, tmp_path / "x.lmdfa", memory_limit=1000)
+
+
+def test_budget_stops_construction(tmp_path):
+    with pytest.raises(BudgetExceeded) as info:
+        to_dfa_file(nth_from_end_nfa(12), tmp_path / "x.lmdfa", budget=Budget(max_states=100), work_dir=tmp_path)
+    assert info.value.resource == "states"
+    assert [p for p in os.listdir(tmp_path) if p.startswith("langmachines-")] == []
+
+
+def test_write_binary_stream_round_trip():
+    table = struct.pack("<4i", 1, -1, 1, 0)
+    out = io.BytesIO()
+    write_binary_stream(out, n_states=2, symbols=["a", "b"], start=0,
+                        table=[table[:8], table[8:]],
+                        accepting=[b"\x00", b"\x01"], states=encode_implicit_labels("Q", 2))
+    c = from_buffer(out.getvalue())
+    assert c.simulate("a") and c.simulate("aba") and not c.simulate("b")
+    assert list(c.states) == ["Q0", "Q1"]
+    with pytest.raises(ValueError, match="table section"):
+        write_binary_stream(io.BytesIO(), n_states=2, symbols=["a", "b"], start=0,
+                            table=[table[:-4]], accepting=[b"\x00\x01"],
+                            states=encode_implicit_labels("Q", 2))
+
+
+def test_memory_limit_covers_the_input_nfa(tmp_path):
+    nfa = random_nfa(3000, 3, density=1.0, epsilon_ratio=0.0, seed=1)
+    with pytest.raises(BudgetExceeded) as info:
+        to_dfa_file(nfa, tmp_path / "x.lmdfa", memory_limit=8 << 20, work_dir=tmp_path)
+    assert info.value.resource == "memory" and info.value.limit == 8 << 20
+    assert info.value.stats["memory_estimate"] > 4 << 20
+    assert os.listdir(tmp_path) == []
+
+
+def test_budget_memory_counts_the_caches(tmp_path):
+    with pytest.raises(BudgetExceeded) as info:
+        to_dfa_file(nth_from_end_nfa(14), tmp_path / "x.lmdfa",
+                    budget=Budget(max_memory=256 << 10, check_every=64), work_dir=tmp_path)
+    assert info.value.resource == "memory"
+    assert info.value.stats["memory_estimate"] > 256 << 10
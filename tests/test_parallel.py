@@ -0,0 +1,59 @@
+import random
+import subprocess
+import sys
+import textwrap
+
+from langmachines import regex
+from langmachines.parallel import ParallelMatcher, SharedDFA, attach
+
+
+def test_shared_dfa_attach_roundtrip():
+    p = regex.compile("(ab|c)*d")
+    with SharedDFA(p.dfa) as shared:
+        c = attach(shared.name)
+        assert c.n_states == p.compiled.n_states
+        for w in ["d", "abcd", "abc", "cabd", "ad"]:
+            assert c.simulate(w) == p.fullmatch(w)
+
+
+def test_parallel_match_streams_in_order(tmp_path):
+    p = regex.compile("(ab|c)*d")
+    rng = random.Random(3)
+    words = ["".join(rng.choice("abcdx") for _ in range(rng.randrange(6))) for _ in range(3000)]
+    expected = [all(ch in "abcd" for ch in w) and p.fullmatch(w) for w in words]
+
+    path = tmp_path / "corpus.txt"
+    path.write_text("\n".join(words) + "\n")
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    with ParallelMatcher(p.dfa, processes=2) as pm:
+        assert list(pm.match(words, batch_size=100)) == expected
+        assert list(pm.match(w.encode() for w in words)) == expected
+        # chunk boundaries fall inside lines; each line is matched exactly once
+        got = list(pm.match_lines([str(path), str(empty), str(path)], chunk_bytes=37))
+    want = [(i + 1, w.encode()) for i, w in enumerate(words) if expected[i]]
+    assert got == [(str(path), n, w) for n, w in want] * 2
+
+
+def test_spawned_workers_detach_cleanly(tmp_path):
+    # Pool workers never run atexit; leftover views of the block made
+    # SharedMemory.__del__ print BufferError in every spawned worker.
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("ab\nabab\nba\n")
+    script = textwrap.dedent(f"""
+        import multiprocessing
+        from langmachines import regex
+        from langmachines.cli import main
+        from langmachines.parallel import ParallelMatcher
+
+        if __name__ == "__main__":
+            multiprocessing.set_start_method("spawn")
+            with ParallelMatcher(regex.compile("(ab)*", alphabet="ab").dfa, processes=2) as pm:
+                print(list(pm.match(["ab", "abab", "ba"])))
+            main(["match", "-e", "(ab)*", "-j", "2", {str(corpus)!r}])
+    """)
+    (tmp_path / "run.py").write_text(script)
+    done = subprocess.run([sys.executable, "run.py"], cwd=tmp_path, capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0
+    assert done.stdout == "[True, True, False]\nab\nabab\n"
+    assert done.stderr == ""
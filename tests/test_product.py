@@ -0,0 +1,54 @@
+import itertools
+
+from langmachines.dfa import DFA, simulate
+from langmachines.algorithms.product import complement, difference, intersection, product, union
+
+
+def mod_counter(symbol: str, m: int, r: int) -> DFA:
+    """Words over {a, b} whose number of `symbol`s is r mod m."""
+    delta = {}
+    for i in range(m):
+        for a in "ab":
+            delta[(i, a)] = (i + 1) % m if a == symbol else i
+    return DFA(states=set(range(m)), alphabet={"a", "b"}, start=0, accept={r}, delta=delta)
+
+
+def starts_with_a() -> DFA:
+    # partial: no transition on 'b' from the start
+    return DFA(states={0, 1}, alphabet={"a", "b"}, start=0, accept={1},
+               delta={(0, "a"): 1, (1, "a"): 1, (1, "b"): 1})
+
+
+def words(n: int):
+    for k in range(n + 1):
+        yield from map("".join, itertools.product("ab", repeat=k))
+
+
+def test_binary_operations_match_definitions():
+    x, y, z = mod_counter("a", 2, 0), mod_counter("b", 3, 1), starts_with_a()
+    ops = {
+        "and": (intersection(x, y, z), lambda w: all(simulate(d, w) for d in (x, y, z))),
+        "or": (union(x, y, z), lambda w: any(simulate(d, w) for d in (x, y, z))),
+        "diff": (difference(x, z), lambda w: simulate(x, w) and not simulate(z, w)),
+        "not": (complement(z), lambda w: not simulate(z, w)),
+    }
+    for name, (d, expected) in ops.items():
+        for w in words(6):
+            assert simulate(d, w) is expected(w), (name, w)
+
+
+def test_only_reachable_states_are_built():
+    x, y = mod_counter("a", 6, 0), mod_counter("a", 6, 3)
+    # Both count the same symbol in lock-step: 6 of the 36 pairs are reachable.
+    d = union(x, y)
+    assert len(d.states) == 6
+    assert simulate(d, "aaa") and simulate(d, "aaaaaa") and not simulate(d, "a")
+
+
+def test_intersection_drops_dead_components_and_custom_accept():
+    d = intersection(starts_with_a(), mod_counter("b", 2, 0))
+    assert (None, 0) not in d.states
+    assert ((0, 0), "b") not in d.delta
+    assert simulate(d, "b") is False  # partial result: missing transition rejects
+    xor = product([starts_with_a(), mod_counter("b", 2, 0)], lambda f: f[0] != f[1])
+    assert simulate(xor, "") and not simulate(xor, "a") and simulate(xor, "ab")
@@ -0,0 +1,59 @@
+import itertools
+import re
+
+import pytest
+
+from langmachines import regex
+from langmachines.dfa import simulate
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "a", "ab|c", "(ab)*", "a+b?", "(a|b)*abb", "[a-c]+x", "[^ab]c", "a.c",
+        "\\d+", "x\\.y", "(|a)b", "[-a]*", "(a*)*", "()",
+    ],
+)
+def test_fullmatch_agrees_with_re(pattern):
+    p = regex.compile(pattern, alphabet="abcx.y1-")
+    for n in range(4):
+        for w in map("".join, itertools.product("abcx.1-", repeat=n)):
+            assert p.fullmatch(w) == bool(re.fullmatch(pattern, w)), (pattern, w)
+
+
+def test_dfa_is_minimized_and_cached():
+    p = regex.compile("(a|b)*abb")
+    assert len(p.dfa.states) == 4
+    assert p.dfa is p.dfa
+    assert simulate(p.dfa, "babb") is True
+    assert regex.compile("(a|b)*abb") is p
+    assert regex.compile("(a|b)*abb", regex.IGNORECASE) is not p
+    regex.purge()
+    assert regex.compile("(a|b)*abb") is not p
+
+
+def test_ignorecase_and_default_alphabet():
+    p = regex.compile("ab[c-d]", regex.IGNORECASE)
+    assert p.fullmatch("AbD") and p.fullmatch("abc")
+    assert not p.fullmatch("abe")
+    dot = regex.compile("a.")
+    assert dot.fullmatch("a~") and not dot.fullmatch("aé")
+
+
+@pytest.mark.parametrize("bad", ["(a", "a)", "*a", "[ab", "a\\", "[z-a]", "\\q"])
+def test_syntax_errors(bad):
+    with pytest.raises(regex.RegexError):
+        regex.compile(bad)
+
+
+@pytest.mark.parametrize("bad", ["ε", "a|ε", "[εa]", "[α-ω]"])
+def test_reserved_epsilon_is_rejected(bad):
+    with pytest.raises(regex.RegexError, match="reserved"):
+        regex.compile(bad)
+
+
+def test_reserved_epsilon_in_alphabet_or_case_folding():
+    with pytest.raises(ValueError, match="reserved"):
+        regex.compile("a", alphabet="aε")
+    p = regex.compile("Ε", regex.IGNORECASE)  # Greek capital epsilon folds to ε
+    assert p.fullmatch("Ε") and not p.fullmatch("") and not p.fullmatch("ε")
@@ -0,0 +1,86 @@
+import pytest
+
+from langmachines import regex
+from langmachines.budgets import Budget, BudgetExceeded
+from langmachines.dfa import simulate
+from langmachines.nfa import NFA, simulate_nfa
+from langmachines.search import Match, Searcher, search
+from langmachines.utils import random_dfa, random_nfa, random_words
+
+
+def accepts(m, word):
+    return simulate_nfa(m, word) if isinstance(m, NFA) else simulate(m, word)
+
+
+def brute_force(patterns, text):
+    out, i = [], 0
+    while i < len(text):
+        best = None
+        for j in range(len(text), i, -1):
+            ids = [p for p, m in enumerate(patterns) if accepts(m, text[i:j])]
+            if ids:
+                best = Match(i, j, ids[0])
+                break
+        if best is None:
+            i += 1
+        else:
+            out.append(best)
+            i = best.end
+    return out
+
+
+def test_leftmost_longest_across_patterns():
+    words = regex.compile("[a-z]+").nfa
+    number = regex.compile("[0-9]+(\\.[0-9]+)?").nfa
+    kw = regex.compile("if|in").nfa
+    s = Searcher([kw, words, number])
+    text = "if x in 3.25 inside, 7."
+    spans = [(m.start, m.end, m.pattern_id) for m in s.finditer(text)]
+    assert spans == [(0, 2, 0), (3, 4, 1), (5, 7, 0), (8, 12, 2), (13, 19, 1), (21, 22, 2)]
+    assert [text[m.start:m.end] for m in s.findall(text)] == ["if", "x", "in", "3.25", "inside", "7"]
+
+
+def test_dfa_patterns_bytes_and_unknown_symbols():
+    ab = regex.compile("ab*").dfa
+    s = Searcher([ab, regex.compile("b+").nfa])
+    assert s.findall(b"\xffabbb\x00bb") == [Match(1, 5, 0), Match(6, 8, 1)]
+    assert s.findall(["a", "b", None, "b"]) == [Match(0, 2, 0), Match(3, 4, 1)]
+    assert search([ab], "") == []
+
+
+def test_empty_matches_are_skipped():
+    s = Searcher([regex.compile("a*").nfa])
+    assert s.findall("baab") == [Match(1, 3, 0)]
+
+
+def test_agrees_with_brute_force_on_random_patterns():
+    for seed in range(12):
+        patterns = [
+            random_nfa(5, 2, density=0.5, epsilon_ratio=0.2, seed=seed),
+            random_nfa(4, 2, density=0.6, seed=seed + 100),
+        ]
+        dfa = random_dfa(4, 2, density=0.8, seed=seed)
+        s = Searcher(patterns + [dfa])
+        for w in random_words("ab", 10, max_len=14, seed=seed):
+            text = "".join(w)
+            assert s.findall(text) == brute_force(patterns + [dfa], text), (seed, text)
+
+
+def test_construction_respects_budget():
+    blowup = regex.compile("(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)", alphabet="ab").nfa
+    with pytest.raises(BudgetExceeded) as info:
+        Searcher([blowup], budget=Budget(max_states=50))
+    assert info.value.algorithm == "search"
+    with pytest.raises(ValueError):
+        Searcher([])
+
+
+def test_rescans_past_the_match_are_memoized():
+    # Every scan runs to the end of the text ("a+" never dies) but reports one "a"
+    nfa = regex.compile("a|a+b", alphabet="ab").nfa
+    n = 20000  # enough to prune the memo several times
+    assert Searcher([nfa]).findall("a" * n) == [Match(i, i + 1, 0) for i in range(n)]
+    assert Searcher([nfa]).findall("a" * n + "b") == [Match(0, n + 1, 0)]
+    patterns = [nfa, regex.compile("aa(a|b)", alphabet="ab").nfa]
+    text = ("a" * 30 + "b" + "aaab") * 5
+    assert Searcher(patterns).findall(text) == brute_force(patterns, text)
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+
+from langmachines.dfa import DFA, simulate
+from langmachines.stream import DFAMatcher, iter_chunks, match_file
+
+
+def even_zeros() -> DFA:
+    q0, q1 = "q0", "q1"
+    return DFA(
+        states={q0, q1},
+        alphabet={"0", "1"},
+        start=q0,
+        accept={q0},
+        delta={
+            (q0, "0"): q1, (q0, "1"): q0,
+            (q1, "0"): q0, (q1, "1"): q1,
+        },
+    )
+
+
+def test_feed_in_chunks_equals_simulate():
+    d = even_zeros()
+    w = "0110100111"
+    m = DFAMatcher(d)
+    for i in range(0, len(w), 3):
+        m.feed(w[i:i + 3])
+    assert m.finish() is simulate(d, w)
+    assert m.consumed == len(w)
+
+
+def test_snapshot_restore():
+    m = DFAMatcher(even_zeros())
+    m.feed("0")
+    snap = m.snapshot()
+    m.feed("0")
+    assert m.finish() is True
+    m.restore(snap)
+    assert m.finish() is False
+    m.feed(b"1")
+    assert m.finish() is False
+
+
+def test_dead_run_and_unknown_symbol():
+    d = DFA(states={"A", "B"}, alphabet={"a"}, start="A", accept={"B"}, delta={("A", "a"): "B"})
+    m = DFAMatcher(d)
+    m.feed("a")
+    with pytest.raises(KeyError):
+        m.feed("x")
+    assert m.finish() is True  # state unchanged by the failed chunk
+    m.feed("a")
+    assert m.dead and m.finish() is False
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_match_file(tmp_path, use_mmap):
+    d = even_zeros()
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"0110" * 1000 + b"0")
+    assert match_file(d, path, use_mmap=use_mmap, chunk_size=97) is False
+    path.write_bytes(b"")
+    assert match_file(d, path, use_mmap=use_mmap) is True
+    chunks = [bytes(c) for c in iter_chunks(io.BytesIO(b"abcdef"), chunk_size=4)]
+    assert chunks == [b"abcd", b"ef"]
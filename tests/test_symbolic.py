@@ -0,0 +1,58 @@
+import time
+
+from langmachines.algorithms.equivalence import equivalent
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.nfa import to_dfa
+from langmachines.symbolic import (
+    CharSet, SymbolicNFA, determinize, from_dfa, from_nfa, minimize, MAX_CODE,
+)
+from langmachines.utils import random_nfa
+
+
+def test_charset_algebra():
+    lower = CharSet.interval("a", "z")
+    vowels = CharSet.of("aeiou")
+    assert "q" in lower and "Q" not in lower and "é" not in lower
+    assert len(lower - vowels) == 21 and "e" not in lower - vowels
+    assert (lower | CharSet.of("{")).ranges == ((ord("a"), ord("{") + 1),)
+    assert (lower & CharSet.interval("x", "~")).ranges == ((ord("x"), ord("z") + 1),)
+    assert len(~lower) == MAX_CODE - 26 and ~~lower == lower
+    assert not CharSet() and CharSet.any()
+    assert repr(CharSet.of("abcx")) == "CharSet('a-cx')"
+
+
+def test_determinize_and_minimize_agree_with_plain_algorithms():
+    for seed in range(8):
+        nfa = random_nfa(7, 3, density=0.8, epsilon_ratio=0.2, seed=seed)
+        plain = minimize_dfa(to_dfa(nfa))
+        sd = determinize(from_nfa(nfa))
+        sm = minimize(sd)
+        alphabet = sorted(a for a in plain.alphabet)
+        assert equivalent(sd.to_dfa(alphabet), plain)
+        assert equivalent(sm.to_dfa(alphabet), plain)
+        # minimal partial DFA = minimal total DFA without its dead state (if any)
+        dead = [s for s in plain.states
+                if s not in plain.accept and all(plain.delta[(s, a)] == s for a in alphabet)]
+        assert len(sm.states) == len(plain.states) - len(dead) or not plain.accept
+
+
+def test_unicode_scale():
+    # .* (non-letter | [α-ω]) [^\n]*   over all of Unicode
+    anyc, greek = CharSet.any(), CharSet.interval("α", "ω")
+    nfa = SymbolicNFA(
+        states={0, 1, 2},
+        start=0,
+        accept={2},
+        transitions={
+            0: ((anyc, 0), (greek, 1), (~CharSet.interval("a", "z"), 1)),
+            1: ((~CharSet.of("\n"), 1),),
+        },
+        epsilon={1: {2}},
+    )
+    t0 = time.perf_counter()
+    m = minimize(determinize(nfa))
+    assert time.perf_counter() - t0 < 1.0
+    assert len(m.states) == 2
+    assert m.simulate("abcλ") and m.simulate("a😀b") and m.simulate("x\nyβ")
+    assert not m.simulate("abc") and not m.simulate("")
+    assert from_dfa(m.to_dfa("ab")).simulate("") is False
@@ -0,0 +1,36 @@
+from langmachines.algorithms.minimize import minimize_dfa
+from langmachines.dfa import simulate
+from langmachines.nfa import EPSILON, to_dfa
+from langmachines.utils import cycle_dfa, nth_from_end_nfa, random_dfa, random_nfa, random_words, symbols
+
+
+def test_random_generators_are_seeded_and_shaped():
+    assert random_dfa(50, 3, seed=7) == random_dfa(50, 3, seed=7)
+    assert random_dfa(50, 3, seed=7) != random_dfa(50, 3, seed=8)
+
+    total = random_dfa(40, 3)
+    assert len(total.delta) == 40 * 3 and total.alphabet == {"a", "b", "c"}
+    partial = random_dfa(200, 2, density=0.25, seed=1)
+    assert 0.15 < len(partial.delta) / 400 < 0.35
+
+    nfa = random_nfa(200, 2, density=1.5, epsilon_ratio=0.2, seed=2)
+    assert EPSILON in nfa.alphabet
+    edges = {k: len(v) for k, v in nfa.delta.items()}
+    eps = sum(n for (s, a), n in edges.items() if a == EPSILON)
+    assert 0 < eps < sum(edges.values())
+    assert len(symbols(30)) == 30 and symbols(30)[0] == "a0"
+
+
+def test_worst_case_families():
+    for n in range(1, 7):
+        nfa = nth_from_end_nfa(n)
+        m = minimize_dfa(to_dfa(nfa))
+        assert len(m.states) == 2 ** n
+        assert simulate(m, "a" + "b" * (n - 1)) and not simulate(m, "b" * n)
+    assert len(minimize_dfa(cycle_dfa(9)).states) == 9
+
+
+def test_random_words():
+    words = random_words("ab", 20, min_len=2, max_len=4, seed=3)
+    assert len(words) == 20 and all(2 <= len(w) <= 4 and set(w) <= {"a", "b"} for w in words)
+    assert words == random_words("ab", 20, min_len=2, max_len=4, seed=3)